@@ -0,0 +1,28 @@
+"""Synthetic boards shared by the benchmarks."""
+
+from src.models.session import Card, Participant, Session
+
+PARTICIPANTS = 10
+
+
+def busy_session(session_id: str, cards: int) -> Session:
+    """A board in the discussion phase: every card voted on and reacted to."""
+    names = [f"person-{i}" for i in range(PARTICIPANTS)]
+    session = Session(
+        id=session_id,
+        name="Benchmark retro",
+        participants=[Participant(name=name) for name in names],
+    )
+    session.cards = [
+        Card(
+            column=session.columns[i % len(session.columns)],
+            text=f"Card {i} " + "lorem ipsum " * 5,
+            author_name=names[i % PARTICIPANTS],
+            published=True,
+            votes=dict.fromkeys(names[(i + j) % PARTICIPANTS] for j in range(i % 4)),
+            reactions={"🎉": {names[(i + 1) % PARTICIPANTS]: None}},
+        )
+        for i in range(cards)
+    ]
+    session.recount_votes()
+    return session
@@ -0,0 +1,169 @@
+"""Domain model benchmark — decode cost and memory of one large session.
+
+Compares the slotted dataclasses in ``src.models.session`` with the pydantic
+models they replaced (reproduced below as the baseline), and the trusted
+``Session.from_dict`` load with the opt-in validated one
+(``VALIDATE_SESSION_DOCUMENTS``). Default board: 300 cards and ~2,000 votes,
+decoded from a MongoDB-shaped document — the compact layout sessions are stored
+in now, and the legacy one (votes and reactions as lists of objects) the pydantic
+model read — and the compact layout with interned participant names
+(``INTERN_PARTICIPANT_NAMES``). ``document_kb`` is the BSON size of each layout.
+
+Usage (from backend/):
+    uv run python -m benchmarks.domain_model --cards 300 --votes-per-card 7
+"""
+
+import argparse
+import copy
+import json
+import platform
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from datetime import UTC, datetime
+from functools import partial
+from typing import Any
+from uuid import uuid4
+
+import bson
+from pydantic import BaseModel, Field
+
+from benchmarks.boards import PARTICIPANTS, busy_session
+from src.models.session import Session
+from src.repositories.session_repo import _validated
+
+# ── Baseline: the previous pydantic domain model ─────────────────────────────
+
+
+class _Vote(BaseModel):
+    participant_name: str
+
+
+class _Reaction(BaseModel):
+    emoji: str
+    participant_name: str
+
+
+class _Card(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid4()))
+    column: str
+    text: str
+    author_name: str
+    published: bool = False
+    votes: list[_Vote] = []
+    reactions: list[_Reaction] = []
+    assignee: str | None = None
+    group_id: str | None = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+
+class _Participant(BaseModel):
+    name: str
+    joined_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+
+class _Session(BaseModel):
+    id: str
+    name: str
+    columns: list[str] = ["Went Well", "To Improve", "Action Items"]
+    phase: str = "collecting"
+    facilitator_token: str = ""
+    participants: list[_Participant] = []
+    cards: list[_Card] = []
+    notes: list[dict] = []
+    timer: dict | None = None
+    column_sorts: dict[str, bool] = {}
+    reactions_enabled: bool = True
+    open_facilitator: bool = False
+    max_votes_per_participant: int | None = None
+    created_at: datetime
+    updated_at: datetime
+    version: int = 0
+    last_accessed_at: datetime
+
+
+# ── Measurements ─────────────────────────────────────────────────────────────
+
+
+def _documents(cards: int, votes_per_card: int) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]]:
+    """The same board as stored now (compact), with interned names, and in the legacy layout."""
+    session = busy_session("bench", cards)
+    for i, card in enumerate(session.cards):
+        card.votes = dict.fromkeys(f"person-{(i + j) % PARTICIPANTS}" for j in range(votes_per_card))
+    session.recount_votes()
+    return session.to_doc(), session.to_doc(intern_names=True), session.to_dict()
+
+
+def _best_us(fn: Callable[[], Any], number: int, repeat: int) -> float:
+    return round(min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e6, 1)
+
+
+def _retained_bytes(decode: Callable[[dict], Any], doc: dict) -> int:
+    """Bytes still allocated after decoding — the cost of keeping the session in memory."""
+    source = copy.deepcopy(doc)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    decoded = decode(source)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del decoded
+    return after - before
+
+
+def _validated_load(doc: dict[str, Any]) -> Session:
+    # The validated load converts the cards in place, like a fresh document from the driver
+    return _validated({**doc, "cards": [dict(card) for card in doc["cards"]]})
+
+
+def run(cards: int, votes_per_card: int, number: int, repeat: int) -> dict[str, Any]:
+    compact, interned, legacy = _documents(cards, votes_per_card)
+    # name → (decoder, the document layout it reads)
+    decoders: dict[str, tuple[Callable[[dict], Any], dict[str, Any]]] = {
+        "pydantic": (lambda d: _Session(**d), legacy),
+        "dataclass": (Session.from_dict, compact),
+        "dataclass_interned": (Session.from_dict, interned),
+        "dataclass_legacy_layout": (Session.from_dict, legacy),
+        "dataclass_validated": (_validated_load, compact),
+    }
+    decode_us = {
+        name: _best_us(partial(decode, doc), number, repeat) for name, (decode, doc) in decoders.items()
+    }
+    encode_us = {
+        "pydantic": _best_us(_Session(**legacy).model_dump, number, repeat),
+        "dataclass": _best_us(Session.from_dict(compact).to_doc, number, repeat),
+    }
+    retained = {name: _retained_bytes(decode, doc) for name, (decode, doc) in decoders.items()}
+    return {
+        "cards": cards,
+        "votes": sum(len(c["votes"]) for c in compact["cards"]),
+        "document_kb": {
+            "legacy": round(len(bson.encode(legacy)) / 1024, 1),
+            "compact": round(len(bson.encode(compact)) / 1024, 1),
+            "interned": round(len(bson.encode(interned)) / 1024, 1),
+        },
+        "decode_us": decode_us,
+        "to_doc_us": encode_us,
+        "retained_kb": {name: round(size / 1024, 1) for name, size in retained.items()},
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--cards", type=int, default=300)
+    parser.add_argument("--votes-per-card", type=int, default=7)
+    parser.add_argument("--number", type=int, default=20, help="runs per timing sample")
+    parser.add_argument("--repeat", type=int, default=5, help="timing samples (best is kept)")
+    args = parser.parse_args(argv)
+    report = {
+        "benchmark": "domain_model",
+        "python": platform.python_version(),
+        "config": vars(args),
+        "results": run(args.cards, args.votes_per_card, args.number, args.repeat),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""JSON encoding benchmark — cost of serializing one large board.
+
+Compares the encoders a session snapshot used to pass through with the orjson
+path in ``src.encoding``:
+
+- ``http_jsonable_encoder``: FastAPI's ``jsonable_encoder`` + ``json.dumps``
+- ``http_pydantic``: FastAPI's response-model serialization + ``json.dumps``
+- ``sse_json_dumps``: ``json.dumps(default=str)``, the old SSE payload encoding
+- ``orjson``: ``src.encoding.dumps``, now used by both
+
+Usage (from backend/):
+    uv run python -m benchmarks.json_encoding --cards 500
+"""
+
+import argparse
+import json
+import platform
+import timeit
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from benchmarks.boards import busy_session
+from src.encoding import dumps
+from src.snapshots import public_snapshot
+
+_DICT = TypeAdapter(dict)
+
+
+def _starlette_json(content: Any) -> bytes:
+    """What starlette's JSONResponse.render does with the encoded value."""
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def encoders() -> dict[str, Callable[[dict], bytes | str]]:
+    return {
+        "http_jsonable_encoder": lambda data: _starlette_json(jsonable_encoder(data)),
+        "http_pydantic": lambda data: _starlette_json(_DICT.dump_python(data, mode="json")),
+        "sse_json_dumps": lambda data: json.dumps(data, default=str),
+        "orjson": dumps,
+    }
+
+
+def run(cards: int, number: int, repeat: int) -> dict[str, Any]:
+    board = dict(public_snapshot(busy_session("bench", cards)))  # plain dict — bypass the snapshot cache
+    timings: dict[str, float] = {}
+    for name, encode in encoders().items():
+        best = min(timeit.repeat(partial(encode, board), number=number, repeat=repeat))
+        timings[name] = round(best / number * 1e6, 1)
+    baseline = timings["orjson"]
+    return {
+        "payload_bytes": len(dumps(board)),
+        "us_per_encode": timings,
+        "relative_to_orjson": {name: round(us / baseline, 1) for name, us in timings.items()},
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--cards", type=int, default=500)
+    parser.add_argument("--number", type=int, default=50, help="encodes per timing sample")
+    parser.add_argument("--repeat", type=int, default=5, help="timing samples (best is kept)")
+    args = parser.parse_args(argv)
+    report = {
+        "benchmark": "json_encoding",
+        "python": platform.python_version(),
+        "config": vars(args),
+        "results": run(args.cards, args.number, args.repeat),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
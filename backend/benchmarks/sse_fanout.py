@@ -0,0 +1,227 @@
+"""SSE fan-out benchmark — capacity and publish-to-deliver latency of SSEManager.
+
+Simulates a deployment in one process: every "pod" is its own SSEManager with its
+own Redis connection, all sharing one Redis server, exactly like replicas behind the
+ingress. Clients attach to ``SSEManager.stream()`` — the generator the ``/stream``
+route returns — spread round-robin over pods and sessions. Mutations are published
+at a fixed rate from random pods, and every delivered event is timed.
+
+Usage (from backend/):
+    uv run python -m benchmarks.sse_fanout --clients 2000 --sessions 50 --pods 3
+    uv run python -m benchmarks.sse_fanout --fake-redis --clients 200   # no Redis needed
+    uv run python -m benchmarks.sse_fanout --output results/sse-$(git rev-parse --short HEAD).json
+
+Prints one JSON document (config + results) to stdout or ``--output``; progress
+goes to stderr. Compare runs by diffing the ``results`` objects.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+
+import redis.asyncio as aioredis
+
+from benchmarks.boards import busy_session
+from src.config import settings
+from src.encoding import dumps
+from src.services.sse_manager import SSEManager
+from src.snapshots import public_snapshot
+
+# Every payload starts with this key so clients can read the sequence number
+# without parsing the whole board
+_SEQ_PREFIX = 'data: {"bench_seq":'
+
+
+@dataclass
+class Config:
+    pods: int = 2
+    clients: int = 500
+    sessions: int = 20
+    rate: float = 50.0  # mutations per second, across all sessions
+    duration: float = 10.0
+    cards: int = 30  # board size of every published snapshot
+    redis_url: str = settings.redis_url
+    fake_redis: bool = False
+    label: str = ""
+
+
+@dataclass
+class Results:
+    mutations: int
+    expected_deliveries: int
+    delivered: int
+    latency_ms_p50: float
+    latency_ms_p90: float
+    latency_ms_p99: float
+    latency_ms_max: float
+    cpu_ms_per_event: float
+    rss_kb_per_connection: float | None
+    payload_bytes: int
+    connect_seconds: float
+
+
+def _rss_bytes() -> int | None:
+    """Resident set size of this process, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def _redis_factory(config: Config) -> Callable[[], aioredis.Redis]:  # type: ignore[type-arg]
+    if config.fake_redis:
+        import fakeredis  # dev dependency — only needed without a real Redis
+
+        server = fakeredis.FakeServer()
+        return lambda: fakeredis.aioredis.FakeRedis(server=server)
+    return lambda: aioredis.from_url(config.redis_url, decode_responses=False)
+
+
+async def _wait_for_subscribers(client: aioredis.Redis, channels: list[str], expected: int) -> None:  # type: ignore[type-arg]
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        counts = await client.pubsub_numsub(*channels)
+        if sum(count for _, count in counts) >= expected:
+            return
+        await asyncio.sleep(0.05)
+    raise RuntimeError("Timed out waiting for SSE clients to subscribe")
+
+
+async def run(config: Config, log: Callable[[str], None] = lambda _: None) -> Results:
+    make_redis = _redis_factory(config)
+    pods = [SSEManager() for _ in range(config.pods)]
+    clients = [make_redis() for _ in pods]
+    for pod, client in zip(pods, clients, strict=True):
+        pod.set_client(client)
+    session_ids = [f"bench-{i}" for i in range(config.sessions)]
+    boards = {sid: public_snapshot(busy_session(sid, config.cards)) for sid in session_ids}
+    subscribers = {sid: 0 for sid in session_ids}
+
+    sent_at: dict[int, float] = {}
+    latencies: list[float] = []
+
+    async def viewer(pod: SSEManager, session_id: str) -> None:
+        async for chunk in pod.stream(session_id):
+            if chunk.startswith(_SEQ_PREFIX):
+                seq = int(chunk[len(_SEQ_PREFIX) : chunk.index(",", len(_SEQ_PREFIX))])
+                latencies.append(time.perf_counter() - sent_at[seq])
+
+    rss_before = _rss_bytes()
+    connect_started = time.perf_counter()
+    viewers = []
+    for i in range(config.clients):
+        session_id = session_ids[i % config.sessions]
+        subscribers[session_id] += 1
+        viewers.append(asyncio.create_task(viewer(pods[i % config.pods], session_id)))
+    await _wait_for_subscribers(clients[0], [f"session:{sid}" for sid in session_ids], config.clients)
+    connect_seconds = time.perf_counter() - connect_started
+    rss_after = _rss_bytes()
+    log(f"{config.clients} clients connected in {connect_seconds:.2f}s")
+
+    expected = 0
+    payload_bytes = len(dumps({"bench_seq": 0, **boards[session_ids[0]]}))
+    interval = 1 / config.rate
+    mutations = int(config.duration * config.rate)
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    for seq in range(mutations):
+        # Fixed schedule, not fixed sleeps — publishing time does not slow the rate down
+        delay = started + seq * interval - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        session_id = session_ids[seq % config.sessions]
+        payload = {"bench_seq": seq, **boards[session_id]}
+        expected += subscribers[session_id]
+        sent_at[seq] = time.perf_counter()
+        await random.choice(pods).publish(session_id, payload)
+
+    deadline = time.monotonic() + max(5.0, config.duration)
+    while len(latencies) < expected and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    cpu_seconds = time.process_time() - cpu_started
+    log(f"{len(latencies)}/{expected} events delivered")
+
+    for task in viewers:
+        task.cancel()
+    await asyncio.gather(*viewers, return_exceptions=True)
+    for client in clients:
+        await client.aclose()
+
+    ordered = sorted(latencies)
+    delivered = len(ordered)
+    return Results(
+        mutations=mutations,
+        expected_deliveries=expected,
+        delivered=delivered,
+        latency_ms_p50=round(_percentile(ordered, 50) * 1000, 3),
+        latency_ms_p90=round(_percentile(ordered, 90) * 1000, 3),
+        latency_ms_p99=round(_percentile(ordered, 99) * 1000, 3),
+        latency_ms_max=round(max(ordered, default=0.0) * 1000, 3),
+        cpu_ms_per_event=round(cpu_seconds * 1000 / delivered, 4) if delivered else 0.0,
+        rss_kb_per_connection=(
+            round((rss_after - rss_before) / 1024 / config.clients, 2)
+            if rss_before is not None and rss_after is not None and config.clients
+            else None
+        ),
+        payload_bytes=payload_bytes,
+        connect_seconds=round(connect_seconds, 3),
+    )
+
+
+def _parse_args(argv: list[str] | None) -> tuple[Config, str | None]:
+    defaults = Config()
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--pods", type=int, default=defaults.pods)
+    parser.add_argument("--clients", type=int, default=defaults.clients)
+    parser.add_argument("--sessions", type=int, default=defaults.sessions)
+    parser.add_argument("--rate", type=float, default=defaults.rate, help="mutations per second")
+    parser.add_argument("--duration", type=float, default=defaults.duration, help="seconds of load")
+    parser.add_argument("--cards", type=int, default=defaults.cards, help="cards per board")
+    parser.add_argument("--redis-url", default=defaults.redis_url)
+    parser.add_argument("--fake-redis", action="store_true", help="in-process fakeredis instead of Redis")
+    parser.add_argument("--label", default="", help="free-form tag stored with the results")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+    output = args.output
+    del args.output
+    return Config(**vars(args)), output
+
+
+def main(argv: list[str] | None = None) -> None:
+    config, output = _parse_args(argv)
+    results = asyncio.run(run(config, log=lambda msg: print(msg, file=sys.stderr)))
+    report = {
+        "benchmark": "sse_fanout",
+        "timestamp": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "config": asdict(config),
+        "results": asdict(results),
+    }
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Response compression — brotli or gzip, negotiated from Accept-Encoding.
+
+Only JSON is compressed: complete bodies of at least ``minimum_size`` bytes in one
+go, streamed JSON (very large boards) chunk by chunk, each chunk flushed so it is
+sent right away. Everything else — the SSE stream, small payloads — passes through
+untouched. Bodies and chunks of ``offload_size`` bytes or more are compressed in a
+worker thread, so a big board or admin stats payload does not stall the event loop.
+Byte counts per encoding are kept in ``stats`` and served by ``GET /metrics/compression``.
+"""
+
+import asyncio
+import gzip
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Fast settings: brotli quality 11 (its default) is far too slow for per-request use
+_COMPRESSORS: dict[str, Callable[[bytes], bytes]] = {
+    "br": partial(brotli.compress, quality=4),
+    "gzip": partial(gzip.compress, compresslevel=6, mtime=0),
+}
+
+
+@dataclass
+class EncodingStats:
+    responses: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "responses": self.responses,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "ratio": round(self.bytes_in / self.bytes_out, 2) if self.bytes_out else None,
+        }
+
+
+stats: dict[str, EncodingStats] = {coding: EncodingStats() for coding in _COMPRESSORS}
+
+
+class _StreamCompressor:
+    """Incremental compressor for streamed bodies; every chunk is flushed through."""
+
+    def __init__(self, coding: str) -> None:
+        self._brotli = brotli.Compressor(quality=4) if coding == "br" else None
+        self._gzip = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)  # gzip framing
+
+    def compress(self, chunk: bytes) -> bytes:
+        if self._brotli is not None:
+            return bytes(self._brotli.process(chunk) + self._brotli.flush())
+        return self._gzip.compress(chunk) + self._gzip.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self._brotli is not None:
+            return bytes(self._brotli.finish())
+        return self._gzip.flush()
+
+
+def _refused(params: str) -> bool:
+    """Whether Accept-Encoding parameters carry q=0."""
+    for param in params.split(";"):
+        name, _, value = param.strip().partition("=")
+        if name == "q":
+            try:
+                return float(value) == 0
+            except ValueError:
+                return False
+    return False
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """The encoding to use for a request: brotli if accepted, else gzip, else None.
+    ``*`` only stands for the codings the header does not name."""
+    accepted, named = set(), set()
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip()
+        named.add(coding)
+        if not _refused(params):
+            accepted.add(coding)
+    for coding in _COMPRESSORS:
+        if coding in accepted or ("*" in accepted and coding not in named):
+            return coding
+    return None
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, offload_size: int = 64 * 1024) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        # The start message is held until the first body message shows whether the
+        # response is complete or streamed
+        held: Message | None = None
+        streaming: _StreamCompressor | None = None
+        counted = stats[coding]
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal held, streaming
+            if message["type"] != "http.response.body":
+                if message["type"] == "http.response.start":
+                    held = message
+                else:
+                    await send(message)
+                return
+            if held is None:
+                if streaming is None:
+                    await send(message)
+                    return
+                # Later chunks of a compressed stream
+                body = message.get("body", b"")
+                more_body = message.get("more_body", False)
+                chunk = await self._run(streaming.compress, body) if body else b""
+                if not more_body:
+                    chunk += streaming.finish()
+                counted.bytes_in += len(body)
+                counted.bytes_out += len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+                return
+
+            start, held = held, None
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            headers = MutableHeaders(scope=start)
+            if (
+                "content-encoding" in headers
+                or not headers.get("content-type", "").startswith("application/json")
+                or (not more_body and len(body) < self.minimum_size)
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            if more_body:
+                streaming = _StreamCompressor(coding)
+                compressed = await self._run(streaming.compress, body) if body else b""
+                del headers["Content-Length"]
+            else:
+                compressed = await self._run(_COMPRESSORS[coding], body)
+                headers["Content-Length"] = str(len(compressed))
+            headers["Content-Encoding"] = coding
+            headers.add_vary_header("Accept-Encoding")
+            # A strong ETag names exact bytes; the compressed body is a different
+            # representation, so it is weakened (as nginx does) — If-None-Match still matches
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            counted.responses += 1
+            counted.bytes_in += len(body)
+            counted.bytes_out += len(compressed)
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+    async def _run(self, compress: Callable[[bytes], bytes], body: bytes) -> bytes:
+        if len(body) >= self.offload_size:
+            return await asyncio.to_thread(compress, body)
+        return compress(body)
@@ -14,6 +14,48 @@ class Settings(BaseSettings):
     sentry_org_slug: str = ""
     sentry_project_slug: str = ""
     sentry_frontend_project_slug: str = ""
+    # Broadcast from a MongoDB change stream instead of per-handler publishes (requires a replica set)
+    sse_change_stream: bool = False
+    # Graceful shutdown: after SIGTERM, open SSE streams close gradually over the drain
+    # window and clients are told to reconnect after a random delay in the retry range
+    sse_drain_seconds: float = 20.0
+    sse_retry_min_ms: int = 1000
+    sse_retry_max_ms: int = 15000
+    # JSON responses of at least this many bytes are gzip/brotli compressed; bodies of
+    # the offload size or more are compressed in a worker thread
+    compression_min_bytes: int = 1024
+    compression_offload_bytes: int = 64 * 1024
+    # Boards with at least this many cards are streamed by GET /sessions/{id} in chunks
+    # instead of being encoded (and cached) whole
+    stream_session_min_cards: int = 2000
+    # Public session snapshots are cached per process up to this much encoded JSON
+    snapshot_cache_bytes: int = 64 * 1024 * 1024
+    # Store participant names once per session document and refer to them by index
+    # from cards, votes and reactions (smaller documents; either layout is always readable)
+    intern_participant_names: bool = False
+    # GET /api/v1/stats is served from a per-process cache: fresh for this many seconds,
+    # then served stale for up to the stale window while one background refresh runs
+    stats_cache_seconds: float = 30.0
+    stats_stale_seconds: float = 300.0
+    # Each admin stats facet is its own query, cut off after this many milliseconds
+    # (the dashboard shows the rest) and cached per process for this many seconds
+    admin_facet_timeout_ms: int = 5000
+    admin_facet_cache_seconds: float = 60.0
+    # Longest from–to window GET /api/v1/stats/sessions serves, in days
+    stats_max_window_days: int = 731
+    # Sessions read per cursor round trip (and encoded per chunk) by the stats export
+    stats_export_batch_size: int = 1000
+    # Stats reads prefer secondaries lagging the primary by at most this many seconds
+    # (MongoDB's minimum is 90; -1: no bound)
+    analytics_max_staleness_seconds: int = 120
+    # Directory the hourly analytics snapshot (columns for the all-time admin history)
+    # is written to — empty: no snapshot
+    analytics_snapshot_dir: str = ""
+    # The directory is a volume every pod mounts: one pod (claimed in Redis) refreshes
+    # it per interval instead of each pod its own copy
+    analytics_snapshot_shared: bool = False
+    # Debug: validate every session document read from MongoDB (slow — loads are trusted by default)
+    validate_session_documents: bool = False
 
     @property
     def sentry_api_configured(self) -> bool:
@@ -1,24 +1,45 @@
 import logging
+from datetime import UTC
+from typing import Any
 
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo.read_preferences import ReadPreference, SecondaryPreferred
 
 from .config import settings
 
 logger = logging.getLogger(__name__)
 
+# Decode BSON dates as aware UTC datetimes — loaded documents need no datetime fix-ups
+CLIENT_OPTIONS: dict[str, Any] = {"tz_aware": True, "tzinfo": UTC}
+
 _client: AsyncIOMotorClient | None = None
+_analytics_client: AsyncIOMotorClient | None = None
+# Sessions, feedback and every write: the primary, whatever the URL's readPreference,
+# so a participant reads their own writes (a causally consistent session would only
+# matter for reads sent to secondaries)
 db: AsyncIOMotorDatabase | None = None
+# Stats aggregations and exports: secondaries when there are any, lagging the primary
+# by at most ANALYTICS_MAX_STALENESS_SECONDS — on their own client and connection
+# pool, so a heavy admin page does not compete with live votes
+analytics_db: AsyncIOMotorDatabase | None = None
 
 
 async def connect_db() -> None:
-    global _client, db
-    _client = AsyncIOMotorClient(settings.mongodb_url)
-    db = _client[settings.mongodb_database]
+    global _client, _analytics_client, db, analytics_db
+    _client = AsyncIOMotorClient(settings.mongodb_url, **CLIENT_OPTIONS)
+    db = _client.get_database(settings.mongodb_database, read_preference=ReadPreference.PRIMARY)
+    _analytics_client = AsyncIOMotorClient(settings.mongodb_url, **CLIENT_OPTIONS)
+    analytics_db = _analytics_client.get_database(
+        settings.mongodb_database,
+        read_preference=SecondaryPreferred(max_staleness=settings.analytics_max_staleness_seconds),
+    )
     logger.info("Connected to MongoDB: %s", settings.mongodb_database)
 
 
 async def disconnect_db() -> None:
-    global _client
+    global _client, _analytics_client
     if _client:
         _client.close()
         logger.info("Disconnected from MongoDB")
+    if _analytics_client:
+        _analytics_client.close()
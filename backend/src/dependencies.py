@@ -1,11 +1,15 @@
 """Shared FastAPI dependencies — injected via Depends(), overridable in tests."""
 
 import redis.asyncio as aioredis
-from fastapi import Request
+from fastapi import Depends, Request
+from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from . import database as _database
+from .repositories.analytics_snapshot import AnalyticsSnapshot
 from .repositories.feedback_repo import FeedbackRepository
 from .repositories.session_repo import SessionRepository
+from .repositories.stats_repo import UniqueParticipants
+from .services.stats_cache import ClosedWindowCache, StatsCache
 
 
 def get_repo() -> SessionRepository:
@@ -13,6 +17,11 @@ def get_repo() -> SessionRepository:
     return SessionRepository(_database.db)
 
 
+def get_analytics_db() -> AsyncIOMotorDatabase:
+    assert _database.analytics_db is not None, "Database not connected"
+    return _database.analytics_db
+
+
 def get_feedback_repo() -> FeedbackRepository:
     assert _database.db is not None, "Database not connected"
     return FeedbackRepository(_database.db)
@@ -20,3 +29,23 @@ def get_feedback_repo() -> FeedbackRepository:
 
 def get_redis(request: Request) -> aioredis.Redis:
     return request.app.state.redis  # type: ignore[no-any-return]
+
+
+def get_uniques(redis: aioredis.Redis = Depends(get_redis)) -> UniqueParticipants:
+    return UniqueParticipants(redis)
+
+
+def get_analytics_snapshot(request: Request) -> AnalyticsSnapshot | None:
+    return request.app.state.analytics_snapshot  # type: ignore[no-any-return]
+
+
+def get_stats_cache(request: Request) -> StatsCache:
+    return request.app.state.public_stats_cache  # type: ignore[no-any-return]
+
+
+def get_series_cache(request: Request) -> ClosedWindowCache:
+    return request.app.state.stats_series_cache  # type: ignore[no-any-return]
+
+
+def get_admin_stats_caches(request: Request) -> dict[str, StatsCache]:
+    return request.app.state.admin_stats_caches  # type: ignore[no-any-return]
@@ -0,0 +1,92 @@
+"""Fast JSON encoding (orjson) shared by HTTP responses and SSE payloads.
+
+Output matches what FastAPI's pydantic-based serialization produced before:
+datetimes as ISO 8601 with ``Z`` for UTC, enums as their values, models as
+their ``model_dump()``. Only the whitespace differs — orjson writes compact JSON.
+"""
+
+import functools
+import inspect
+from collections.abc import Callable
+from typing import Any
+
+import orjson
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.responses import JSONResponse, Response
+
+_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class EncodedDict(dict):
+    """A dict that carries its own encoding — dumps() returns it without re-encoding.
+
+    Read-only by convention: the encoding is not refreshed if the dict changes.
+    """
+
+    __slots__ = ("encoded",)
+
+    def __init__(self, data: dict) -> None:
+        super().__init__(data)
+        self.encoded = orjson.dumps(data, default=_default, option=_OPTIONS)
+
+
+def dumps(data: Any) -> bytes:
+    if type(data) is EncodedDict:
+        return data.encoded
+    return orjson.dumps(data, default=_default, option=_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class ORJSONRoute(APIRoute):
+    """APIRoute whose return values are encoded straight to bytes with orjson.
+
+    FastAPI would otherwise validate the value against the return annotation and
+    walk it with its own encoder before serializing — on a large board that walk
+    costs more than the request itself. Handlers here already return model dumps
+    or validated models, so the endpoint is wrapped to hand back a finished
+    response; the annotation still drives the OpenAPI schema.
+
+    Only for the routes that return boards (sessions, cards, groups, notes): the
+    others use ``default_response_class=ORJSONResponse`` and keep FastAPI's
+    response_model validation.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = _encoded(endpoint, kwargs.get("status_code") or 200)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _encoded(endpoint: Callable[..., Any], status_code: int) -> Callable[..., Any]:
+    # A Response parameter is FastAPI's sub-response: its status and headers go on the
+    # response handed back, as FastAPI would apply them
+    parameters = inspect.signature(endpoint, eval_str=True).parameters.values()
+    sub_response = next((p.name for p in parameters if p.annotation is Response), None)
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        result = await endpoint(*args, **kwargs)
+        if result is None or isinstance(result, Response):
+            return result
+        response = ORJSONResponse(result, status_code=status_code)
+        if sub_response is not None:
+            injected: Response = kwargs[sub_response]
+            if injected.status_code:
+                response.status_code = injected.status_code
+            response.headers.raw.extend(
+                (name, value) for name, value in injected.headers.raw if name != b"content-length"
+            )
+        return response
+
+    return wrapper
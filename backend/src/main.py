@@ -2,9 +2,12 @@
 
 import asyncio
 import logging
+import signal
+from collections import defaultdict
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from datetime import UTC, datetime, timedelta
+from types import FrameType
 
 import redis.asyncio as aioredis
 import sentry_sdk
@@ -14,15 +17,40 @@ from sentry_sdk.integrations.fastapi import FastApiIntegration
 from sentry_sdk.integrations.starlette import StarletteIntegration
 
 from . import database as _database
+from .compression import CompressionMiddleware
 from .config import settings
 from .database import connect_db, disconnect_db
+from .repositories.activity_repo import ActivityRepository
+from .repositories.analytics_snapshot import AnalyticsSnapshot
 from .repositories.session_repo import SessionRepository
+from .repositories.stats_repo import StatsRepository
 from .routers import cards, feedback, groups, health, notes, sessions, stats
+from .services.change_stream import ChangeStreamWatcher
 from .services.sse_manager import sse_manager
+from .services.stats_cache import ClosedWindowCache, StatsCache
 
 logger = logging.getLogger(__name__)
 
 CLEANUP_INTERVAL_SECONDS = 3600  # 1 hour
+STATS_RECONCILE_INTERVAL_SECONDS = 6 * 3600
+ANALYTICS_SNAPSHOT_INTERVAL_SECONDS = 3600
+
+
+async def _build_indexes(repo: SessionRepository) -> None:
+    """Index builds run while the app already serves — a slow one must not delay readiness."""
+    try:
+        await repo.ensure_indexes()
+        logger.info("Indexes ready")
+    except Exception:
+        logger.exception("Indexes: build failed")
+
+
+async def _backfill_activity(activity: ActivityRepository) -> None:
+    """Like the index builds: the backfill takes as long as there are sessions."""
+    try:
+        await activity.backfill()
+    except Exception:
+        logger.exception("Activity: backfill failed")
 
 
 async def _cleanup_loop(repo: SessionRepository) -> None:
@@ -38,24 +66,94 @@ async def _cleanup_loop(repo: SessionRepository) -> None:
             logger.exception("Cleanup: error during stale session deletion")
 
 
+async def _reconcile_stats_loop(stats: StatsRepository) -> None:
+    """Rebuild the public stats counters now and then, correcting any drift."""
+    while True:
+        await asyncio.sleep(STATS_RECONCILE_INTERVAL_SECONDS)
+        try:
+            await stats.reconcile_counters()
+        except Exception:
+            logger.exception("Stats: error while reconciling counters")
+
+
+async def _snapshot_loop(snapshot: AnalyticsSnapshot, redis: aioredis.Redis) -> None:
+    """Refresh the analytics snapshot at startup, then every interval (a shared one on
+    one pod only)."""
+    while True:
+        assert _database.analytics_db is not None
+        try:
+            if await snapshot.claim_refresh(redis, ANALYTICS_SNAPSHOT_INTERVAL_SECONDS):
+                count = await snapshot.refresh(_database.analytics_db["sessions"])
+                logger.info("Analytics snapshot: refreshed %d session(s)", count)
+        except Exception:
+            logger.exception("Analytics snapshot: error while refreshing")
+        await asyncio.sleep(ANALYTICS_SNAPSHOT_INTERVAL_SECONDS)
+
+
+def _install_drain_on_sigterm() -> None:
+    """Drain SSE streams on SIGTERM before the server's own shutdown begins.
+
+    uvicorn waits for open responses to finish before it runs lifespan shutdown, so
+    long-lived streams have to be closed first. The previously installed handler
+    (uvicorn's) is invoked once the drain window has passed.
+    """
+    loop = asyncio.get_running_loop()
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def _forward(signum: int, frame: FrameType | None) -> None:
+        if callable(previous):
+            previous(signum, frame)
+
+    def _start_drain(signum: int, frame: FrameType | None) -> None:
+        drain = loop.create_task(
+            sse_manager.drain(
+                settings.sse_drain_seconds, settings.sse_retry_min_ms, settings.sse_retry_max_ms
+            )
+        )
+        drain.add_done_callback(lambda _: _forward(signum, frame))
+
+    def _on_sigterm(signum: int, frame: FrameType | None) -> None:
+        if sse_manager.draining:  # second SIGTERM — stop waiting
+            _forward(signum, frame)
+            return
+        loop.call_soon_threadsafe(_start_drain, signum, frame)
+
+    signal.signal(signal.SIGTERM, _on_sigterm)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:  # type: ignore[type-arg]
     await connect_db()
     assert _database.db is not None
     repo = SessionRepository(_database.db)
-    await repo.ensure_indexes()
+    activity = ActivityRepository(_database.db)
+    await activity.ensure_collection()
     redis_client = aioredis.from_url(settings.redis_url, decode_responses=False)
     sse_manager.set_client(redis_client)
     app.state.redis = redis_client
-    task = asyncio.create_task(_cleanup_loop(repo))
+    _install_drain_on_sigterm()
+    tasks = [
+        asyncio.create_task(_build_indexes(repo)),
+        asyncio.create_task(_backfill_activity(activity)),
+        asyncio.create_task(_cleanup_loop(repo)),
+        asyncio.create_task(_reconcile_stats_loop(StatsRepository(_database.db))),
+    ]
+    if settings.sse_change_stream:
+        sse_manager.change_stream_mode = True
+        watcher = ChangeStreamWatcher(repo.collection, redis_client)
+        tasks.append(asyncio.create_task(watcher.run()))
+    if app.state.analytics_snapshot is not None:
+        tasks.append(asyncio.create_task(_snapshot_loop(app.state.analytics_snapshot, redis_client)))
     try:
         yield
     finally:
-        task.cancel()
-        try:
-            await task
-        except asyncio.CancelledError:
-            pass
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
         await redis_client.aclose()
         await disconnect_db()
 
@@ -74,6 +172,15 @@ def create_app() -> FastAPI:
         version="0.1.0",
         lifespan=lifespan,
     )
+    app.state.public_stats_cache = StatsCache()
+    app.state.stats_series_cache = ClosedWindowCache()
+    # One per admin stats facet, by name
+    app.state.admin_stats_caches = defaultdict(StatsCache)
+    app.state.analytics_snapshot = (
+        AnalyticsSnapshot(settings.analytics_snapshot_dir, shared=settings.analytics_snapshot_shared)
+        if settings.analytics_snapshot_dir
+        else None
+    )
 
     app.add_middleware(
         CORSMiddleware,
@@ -81,6 +188,11 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_min_bytes,
+        offload_size=settings.compression_offload_bytes,
+    )
 
     app.include_router(health.router)
     app.include_router(sessions.router)
@@ -3,7 +3,7 @@
 from datetime import UTC, datetime
 from uuid import uuid4
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field
 
 
 class Feedback(BaseModel):
@@ -14,10 +14,3 @@ class Feedback(BaseModel):
     participant_name: str | None = None
     app_version: str = ""
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
-
-    @field_validator("created_at", mode="before")
-    @classmethod
-    def ensure_utc(cls, v: datetime) -> datetime:
-        if isinstance(v, datetime) and v.tzinfo is None:
-            return v.replace(tzinfo=UTC)
-        return v
@@ -1,11 +1,41 @@
+"""Session domain model.
+
+Plain slotted dataclasses: the repository decodes documents into them and the
+routers mutate them, so they stay cheap to build and small in memory. Request
+bodies are validated by the pydantic models in ``requests.py``; these classes
+trust their input. ``to_dict()`` / ``from_dict()`` convert to and from the
+MongoDB document / API shape (same field order as the JSON clients receive).
+The Motor client decodes dates as aware UTC (``database.CLIENT_OPTIONS``), so
+``from_dict()`` copies values as-is.
+
+Votes and reactions are kept as ordered participant-name sets (dicts with None
+values), so they come out in the order they were cast. ``to_dict()`` expands them
+to the ``{"participant_name": ...}`` objects clients receive; ``to_doc()`` stores
+them compactly (voter names per card, emoji → names) together with the session's
+per-participant vote tally. ``from_dict()`` reads both layouts, so documents
+written before the compact one are migrated by their next write.
+
+``to_doc(intern_names=True)`` also stores every participant name a card refers
+to (author, assignee, voters, reactors) once, in the session's ``name_table``,
+and the cards hold indexes into it. ``from_dict()`` expands them back, so the
+domain objects — and the API — only ever see names.
+
+``Session.card()``, ``note()`` and ``group()`` look up by id through indexes built
+on first use. Once one is built, add and remove cards and notes and change card
+groups through the ``Session`` methods, which keep the indexes current.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from enum import StrEnum
+from typing import Any, NamedTuple
 from uuid import uuid4
 
-from pydantic import BaseModel, Field, field_validator
-
 REACTION_EMOJI = frozenset(["❤️", "😂", "😮", "🎉", "🤔", "👀", "🥓"])
 
+DEFAULT_COLUMNS = ("Went Well", "To Improve", "Action Items")
+
 
 class SessionPhase(StrEnum):
     COLLECTING = "collecting"
@@ -13,73 +43,474 @@ class SessionPhase(StrEnum):
     CLOSED = "closed"
 
 
-class Vote(BaseModel):
-    participant_name: str
+# from_dict() fills the slots directly: documents we wrote are trusted, and skipping
+# the keyword __init__ (with its default-factory checks) is the bulk of the load cost
+_new = object.__new__
+
 
+def _new_id() -> str:
+    return str(uuid4())
 
-class Reaction(BaseModel):
-    emoji: str
-    participant_name: str
 
+def _now() -> datetime:
+    return datetime.now(UTC)
 
-class Card(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid4()))
+
+def _voters(stored: Any) -> dict[str, None]:
+    """Voter names from a stored card — compact names or legacy ``{"participant_name"}`` objects."""
+    return dict.fromkeys(v if type(v) is str else v["participant_name"] for v in stored)
+
+
+def _expand_names(card: dict[str, Any], names: list[str]) -> None:
+    """Replace the name-table indexes of a stored card with the names, in place."""
+    card["author_name"] = names[card["author_name"]]
+    card["votes"] = [names[i] for i in card.get("votes", ())]
+    card["reactions"] = {emoji: [names[i] for i in ids] for emoji, ids in card.get("reactions", {}).items()}
+    if card.get("assignee") is not None:
+        card["assignee"] = names[card["assignee"]]
+
+
+def _reactors(stored: Any) -> dict[str, dict[str, None]]:
+    """emoji → participant names from a stored card — compact mapping or legacy list of objects."""
+    if type(stored) is dict:
+        return {emoji: dict.fromkeys(names) for emoji, names in stored.items()}
+    reactions: dict[str, dict[str, None]] = {}
+    for r in stored:
+        reactions.setdefault(r["emoji"], {})[r["participant_name"]] = None
+    return reactions
+
+
+@dataclass(slots=True, kw_only=True)
+class Card:
+    id: str = field(default_factory=_new_id)
     column: str
     text: str
     author_name: str
     published: bool = False
-    votes: list[Vote] = []
-    reactions: list[Reaction] = []
+    votes: dict[str, None] = field(default_factory=dict)  # participant names, in voting order
+    reactions: dict[str, dict[str, None]] = field(default_factory=dict)  # emoji → participant names
     assignee: str | None = None
     group_id: str | None = None
-    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    created_at: datetime = field(default_factory=_now)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "column": self.column,
+            "text": self.text,
+            "author_name": self.author_name,
+            "published": self.published,
+            "votes": [{"participant_name": name} for name in self.votes],
+            "reactions": [
+                {"emoji": emoji, "participant_name": name}
+                for emoji, names in self.reactions.items()
+                for name in names
+            ],
+            "assignee": self.assignee,
+            "group_id": self.group_id,
+            "created_at": self.created_at,
+        }
 
+    def to_doc(self, name_table: dict[str, int] | None = None) -> dict[str, Any]:
+        """Stored shape. With *name_table* (name → index, extended as names come up)
+        participant names are stored as indexes into it."""
+        if name_table is None:
+            return {
+                "id": self.id,
+                "column": self.column,
+                "text": self.text,
+                "author_name": self.author_name,
+                "published": self.published,
+                "votes": list(self.votes),
+                "reactions": {emoji: list(names) for emoji, names in self.reactions.items()},
+                "assignee": self.assignee,
+                "group_id": self.group_id,
+                "created_at": self.created_at,
+            }
 
-class Note(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid4()))
+        def ref(name: str) -> int:
+            return name_table.setdefault(name, len(name_table))
+
+        return {
+            "id": self.id,
+            "column": self.column,
+            "text": self.text,
+            "author_name": ref(self.author_name),
+            "published": self.published,
+            "votes": list(map(ref, self.votes)),
+            "reactions": {emoji: list(map(ref, names)) for emoji, names in self.reactions.items()},
+            "assignee": None if self.assignee is None else ref(self.assignee),
+            "group_id": self.group_id,
+            "created_at": self.created_at,
+        }
+
+    def add_reaction(self, emoji: str, name: str) -> bool:
+        """Record *name*'s *emoji* reaction; False if it was already there."""
+        names = self.reactions.setdefault(emoji, {})
+        if name in names:
+            return False
+        names[name] = None
+        return True
+
+    def remove_reaction(self, emoji: str, name: str) -> None:
+        names = self.reactions.get(emoji)
+        if names is not None:
+            names.pop(name, None)
+            if not names:
+                del self.reactions[emoji]
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any], name_table: list[str] | None = None) -> "Card":
+        """Build from a stored card; *name_table* is its session's, if names were interned."""
+        card = _new(cls)
+        card.id = d["id"]
+        card.column = d["column"]
+        card.text = d["text"]
+        card.published = d.get("published", False)
+        if name_table is None:
+            card.author_name = d["author_name"]
+            card.votes = _voters(d.get("votes", ()))
+            card.reactions = _reactors(d.get("reactions", ()))
+            card.assignee = d.get("assignee")
+        else:
+            card.author_name = name_table[d["author_name"]]
+            card.votes = dict.fromkeys(name_table[i] for i in d.get("votes", ()))
+            reactions = d.get("reactions", {})
+            card.reactions = {
+                emoji: dict.fromkeys(name_table[i] for i in ids) for emoji, ids in reactions.items()
+            }
+            assignee = d.get("assignee")
+            card.assignee = None if assignee is None else name_table[assignee]
+        card.group_id = d.get("group_id")
+        card.created_at = d.get("created_at") or _now()
+        return card
+
+
+@dataclass(slots=True, kw_only=True)
+class Note:
+    id: str = field(default_factory=_new_id)
     text: str
     author_name: str
-    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    created_at: datetime = field(default_factory=_now)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "text": self.text,
+            "author_name": self.author_name,
+            "created_at": self.created_at,
+        }
 
-    @field_validator("created_at")
     @classmethod
-    def ensure_utc(cls, v: datetime) -> datetime:
-        return v if v.tzinfo else v.replace(tzinfo=UTC)
+    def from_dict(cls, d: dict[str, Any]) -> "Note":
+        note = _new(cls)
+        note.id = d["id"]
+        note.text = d["text"]
+        note.author_name = d["author_name"]
+        note.created_at = d.get("created_at") or _now()
+        return note
 
 
-class TimerState(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class TimerState:
     duration_seconds: int
     started_at: datetime | None = None
     paused_remaining: int | None = None
 
-    @field_validator("started_at", mode="before")
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "duration_seconds": self.duration_seconds,
+            "started_at": self.started_at,
+            "paused_remaining": self.paused_remaining,
+        }
+
     @classmethod
-    def ensure_utc(cls, v: datetime | None) -> datetime | None:
-        """MongoDB returns naive UTC datetimes — normalize to timezone-aware."""
-        if v is not None and isinstance(v, datetime) and v.tzinfo is None:
-            return v.replace(tzinfo=UTC)
-        return v
+    def from_dict(cls, d: dict[str, Any]) -> "TimerState":
+        timer = _new(cls)
+        timer.duration_seconds = d["duration_seconds"]
+        timer.started_at = d.get("started_at")
+        timer.paused_remaining = d.get("paused_remaining")
+        return timer
 
 
-class Participant(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class Participant:
     name: str
-    joined_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    joined_at: datetime = field(default_factory=_now)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"name": self.name, "joined_at": self.joined_at}
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> "Participant":
+        participant = _new(cls)
+        participant.name = d["name"]
+        participant.joined_at = d.get("joined_at") or _now()
+        return participant
+
+
+def _distinct_targets(cards: Iterable[Card]) -> dict[str, int]:
+    """Voter name → the cards and groups (a group counts once) they vote on among *cards*."""
+    voted: dict[str, set[str]] = {}
+    for card in cards:
+        for name in card.votes:
+            voted.setdefault(name, set()).add(card.group_id or card.id)
+    return {name: len(targets) for name, targets in voted.items()}
+
 
+class SessionCounts(NamedTuple):
+    """A session's share of the public stats totals."""
 
-class Session(BaseModel):
+    phase: str
+    cards: int
+    votes: int
+    reactions: int
+
+
+@dataclass(slots=True, kw_only=True)
+class Session:
     id: str
     name: str
-    columns: list[str] = ["Went Well", "To Improve", "Action Items"]
+    columns: list[str] = field(default_factory=lambda: list(DEFAULT_COLUMNS))
     phase: SessionPhase = SessionPhase.COLLECTING
-    facilitator_token: str = Field(default_factory=lambda: str(uuid4()))
-    participants: list[Participant] = []
-    cards: list[Card] = []
-    notes: list[Note] = []
+    facilitator_token: str = field(default_factory=_new_id)
+    participants: list[Participant] = field(default_factory=list)
+    cards: list[Card] = field(default_factory=list)
+    notes: list[Note] = field(default_factory=list)
     timer: TimerState | None = None
-    column_sorts: dict[str, bool] = Field(default_factory=dict)
+    column_sorts: dict[str, bool] = field(default_factory=dict)
     reactions_enabled: bool = True
     open_facilitator: bool = False
     max_votes_per_participant: int | None = None
-    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
-    last_accessed_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    created_at: datetime = field(default_factory=_now)
+    updated_at: datetime = field(default_factory=_now)
+    version: int = 0  # bumped by every repository write; internal
+    last_accessed_at: datetime = field(default_factory=_now)
+    # participant name → cards and groups voted on (a group counts once); stored, internal
+    vote_tally: dict[str, int] = field(default_factory=dict)
+    # Lookup indexes, built on first use; never stored or sent
+    _cards_by_id: dict[str, Card] | None = field(default=None, init=False, repr=False, compare=False)
+    _notes_by_id: dict[str, Note] | None = field(default=None, init=False, repr=False, compare=False)
+    # group id → {card id → card}
+    _groups: dict[str, dict[str, Card]] | None = field(default=None, init=False, repr=False, compare=False)
+    # counts() as last read or written by the repository, which moves the stats
+    # counters by the difference on the next write; never stored or sent
+    stored_counts: SessionCounts | None = field(default=None, init=False, repr=False, compare=False)
+
+    # ── Lookups ──────────────────────────────────────────────────────────────
+
+    def card(self, card_id: str) -> Card | None:
+        if self._cards_by_id is None:
+            self._cards_by_id = {c.id: c for c in self.cards}
+        return self._cards_by_id.get(card_id)
+
+    def note(self, note_id: str) -> Note | None:
+        if self._notes_by_id is None:
+            self._notes_by_id = {n.id: n for n in self.notes}
+        return self._notes_by_id.get(note_id)
+
+    def group(self, group_id: str) -> list[Card]:
+        """Cards in the group, in board order."""
+        members = self._group_index().get(group_id)
+        return list(members.values()) if members else []
+
+    def _group_index(self) -> dict[str, dict[str, Card]]:
+        if self._groups is None:
+            self._groups = {}
+            for c in self.cards:
+                if c.group_id is not None:
+                    self._groups.setdefault(c.group_id, {})[c.id] = c
+        return self._groups
+
+    # ── Cards, notes and groups ──────────────────────────────────────────────
+
+    def add_card(self, card: Card) -> None:
+        self.cards.append(card)
+        if self._cards_by_id is not None:
+            self._cards_by_id[card.id] = card
+        if self._groups is not None and card.group_id is not None:
+            self._groups.setdefault(card.group_id, {})[card.id] = card
+
+    def remove_cards(self, cards: Iterable[Card]) -> None:
+        """Remove the cards and the votes on them; groups they leave behind are kept."""
+        removed = {c.id: c for c in cards}
+        if not removed:
+            return
+        # Only the voters on these cards, or on the groups they leave, count differently
+        affected = self._with_group_members(removed.values())
+        before = _distinct_targets(affected)
+        self.cards = [c for c in self.cards if c.id not in removed]
+        for card in removed.values():
+            if self._cards_by_id is not None:
+                self._cards_by_id.pop(card.id, None)
+            if self._groups is not None and card.group_id is not None:
+                members = self._groups.get(card.group_id, {})
+                members.pop(card.id, None)
+                if not members:
+                    self._groups.pop(card.group_id, None)
+        self._adjust_tally(before, _distinct_targets(c for c in affected if c.id not in removed))
+
+    def set_group(self, card: Card, group_id: str | None) -> None:
+        """Move *card* into *group_id* (None: out of any group). A group left with
+        a single card is dissolved."""
+        old_group_id = card.group_id
+        if old_group_id == group_id:
+            return
+        groups = self._group_index()
+        # Only the voters on the card and on the two groups' members count differently
+        affected = self._with_group_members([card, *groups.get(group_id or "", {}).values()])
+        before = _distinct_targets(affected)
+        card.group_id = group_id
+        if group_id is not None:
+            groups.setdefault(group_id, {})[card.id] = card
+        if old_group_id is not None:
+            remaining = groups.get(old_group_id, {})
+            remaining.pop(card.id, None)
+            if len(remaining) <= 1:
+                groups.pop(old_group_id, None)
+                for member in remaining.values():
+                    member.group_id = None
+        self._adjust_tally(before, _distinct_targets(affected))
+
+    def add_note(self, note: Note) -> None:
+        self.notes.append(note)
+        if self._notes_by_id is not None:
+            self._notes_by_id[note.id] = note
+
+    def remove_note(self, note: Note) -> None:
+        self.notes = [n for n in self.notes if n.id != note.id]
+        if self._notes_by_id is not None:
+            self._notes_by_id.pop(note.id, None)
+
+    # ── Votes ────────────────────────────────────────────────────────────────
+
+    def votes_used(self, name: str) -> int:
+        return self.vote_tally.get(name, 0)
+
+    def add_vote(self, card: Card, name: str) -> bool:
+        """Record *name*'s vote on *card*; False if it was already there."""
+        if name in card.votes:
+            return False
+        if not self._voted_in_group(card, name):
+            self.vote_tally[name] = self.vote_tally.get(name, 0) + 1
+        card.votes[name] = None
+        return True
+
+    def remove_vote(self, card: Card, name: str) -> None:
+        if name not in card.votes:
+            return
+        del card.votes[name]
+        if not self._voted_in_group(card, name):
+            remaining = self.vote_tally.get(name, 0) - 1
+            if remaining > 0:
+                self.vote_tally[name] = remaining
+            else:
+                self.vote_tally.pop(name, None)
+
+    def _voted_in_group(self, card: Card, name: str) -> bool:
+        """Whether *name* votes on another card of *card*'s group."""
+        if card.group_id is None:
+            return False
+        members = self._group_index().get(card.group_id, {})
+        return any(c is not card and name in c.votes for c in members.values())
+
+    def recount_votes(self) -> None:
+        """Rebuild the tally from all the cards — for documents stored without one."""
+        self.vote_tally = _distinct_targets(self.cards)
+
+    def _with_group_members(self, cards: Iterable[Card]) -> list[Card]:
+        """*cards* and every other member of their groups."""
+        groups = self._group_index()
+        affected = {c.id: c for c in cards}
+        for card in list(affected.values()):
+            if card.group_id is not None:
+                affected.update(groups.get(card.group_id, {}))
+        return list(affected.values())
+
+    def _adjust_tally(self, before: dict[str, int], after: dict[str, int]) -> None:
+        """Move the tally by the change in distinct targets counted over the same cards."""
+        for name in before.keys() | after.keys():
+            count = self.vote_tally.get(name, 0) - before.get(name, 0) + after.get(name, 0)
+            if count > 0:
+                self.vote_tally[name] = count
+            else:
+                self.vote_tally.pop(name, None)
+
+    # ── Stats ────────────────────────────────────────────────────────────────
+
+    def counts(self) -> SessionCounts:
+        return SessionCounts(
+            self.phase,
+            len(self.cards),
+            sum(len(c.votes) for c in self.cards),
+            sum(len(names) for c in self.cards for names in c.reactions.values()),
+        )
+
+    # ── Serialization ────────────────────────────────────────────────────────
+
+    def to_dict(self) -> dict[str, Any]:
+        return self._as_dict([c.to_dict() for c in self.cards], [n.to_dict() for n in self.notes])
+
+    def to_dict_without_items(self) -> dict[str, Any]:
+        """to_dict() with empty cards and notes — the rest of the board, for streaming
+        those two in chunks (same key order)."""
+        return self._as_dict([], [])
+
+    def to_doc(self, intern_names: bool = False) -> dict[str, Any]:
+        name_table: dict[str, int] | None = {} if intern_names else None
+        doc = self._as_dict([c.to_doc(name_table) for c in self.cards], [n.to_dict() for n in self.notes])
+        doc["vote_tally"] = dict(self.vote_tally)
+        if name_table is not None:
+            doc["name_table"] = list(name_table)
+        return doc
+
+    def _as_dict(self, cards: list[dict[str, Any]], notes: list[dict[str, Any]]) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "columns": list(self.columns),
+            "phase": self.phase,
+            "facilitator_token": self.facilitator_token,
+            "participants": [p.to_dict() for p in self.participants],
+            "cards": cards,
+            "notes": notes,
+            "timer": self.timer.to_dict() if self.timer else None,
+            "column_sorts": dict(self.column_sorts),
+            "reactions_enabled": self.reactions_enabled,
+            "open_facilitator": self.open_facilitator,
+            "max_votes_per_participant": self.max_votes_per_participant,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "version": self.version,
+            "last_accessed_at": self.last_accessed_at,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> "Session":
+        """Build from a stored document; fields added after it was written take their defaults."""
+        timer = d.get("timer")
+        name_table = d.get("name_table")
+        now = _now()
+        session = cls(
+            id=d["id"],
+            name=d["name"],
+            columns=d.get("columns", list(DEFAULT_COLUMNS)),
+            phase=SessionPhase(d.get("phase", SessionPhase.COLLECTING)),
+            facilitator_token=d.get("facilitator_token") or _new_id(),
+            participants=[Participant.from_dict(p) for p in d.get("participants", ())],
+            cards=[Card.from_dict(c, name_table) for c in d.get("cards", ())],
+            notes=[Note.from_dict(n) for n in d.get("notes", ())],
+            timer=TimerState.from_dict(timer) if timer else None,
+            column_sorts=d.get("column_sorts") or {},
+            reactions_enabled=d.get("reactions_enabled", True),
+            open_facilitator=d.get("open_facilitator", False),
+            max_votes_per_participant=d.get("max_votes_per_participant"),
+            created_at=d.get("created_at", now),
+            updated_at=d.get("updated_at", now),
+            version=d.get("version", 0),
+            last_accessed_at=d.get("last_accessed_at", now),
+            vote_tally=d.get("vote_tally") or {},
+        )
+        if "vote_tally" not in d:
+            session.recount_votes()
+        return session
@@ -0,0 +1,167 @@
+"""Activity repository — session lifecycle events in a MongoDB time-series collection.
+
+The session repository records an event when a session is created, gets its
+first card or first vote, or is closed; the admin charts and the public per-day
+counts are read from these events rather than from the sessions, so their history
+survives the cleanup of stale sessions. "First" means the count went up from zero
+— a session whose only card was deleted records first_card again for the next one,
+so readers count distinct sessions.
+
+Sessions that predate the collection get their events from a one-off backfill,
+run in the background (``backfill()``) under a marker document in ``migrations``:
+the marker is written before the collection is created, claimed with a lease by
+one pod at a time, and set done at the end — a pod that dies mid-way leaves it
+to be claimed again, and the next attempt starts over.
+"""
+
+import logging
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+from enum import StrEnum
+from typing import Any
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import CollectionInvalid, OperationFailure
+
+from ..models.session import SessionCounts, SessionPhase
+
+logger = logging.getLogger(__name__)
+
+ACTIVITY_COLLECTION = "activity"
+# Sessions are charted per hour at the finest; MongoDB buckets events to match
+ACTIVITY_TIMESERIES = {"timeField": "at", "metaField": "meta", "granularity": "hours"}
+
+MIGRATIONS_COLLECTION = "migrations"
+BACKFILL_ID = "activity_backfill"
+BACKFILL_BATCH_SIZE = 1000  # events per insert_many
+# A claim not renewed (once per batch) for this long is taken to be from a dead pod
+BACKFILL_LEASE = timedelta(minutes=10)
+_NAMESPACE_EXISTS = 48
+
+
+class ActivityEvent(StrEnum):
+    CREATED = "created"
+    FIRST_CARD = "first_card"
+    FIRST_VOTE = "first_vote"
+    CLOSED = "closed"
+
+
+def lifecycle_events(before: SessionCounts, after: SessionCounts) -> list[ActivityEvent]:
+    """The events a write that moved a session from *before* to *after* records."""
+    events = []
+    if before.cards == 0 < after.cards:
+        events.append(ActivityEvent.FIRST_CARD)
+    if before.votes == 0 < after.votes:
+        events.append(ActivityEvent.FIRST_VOTE)
+    if after.phase == SessionPhase.CLOSED != before.phase:
+        events.append(ActivityEvent.CLOSED)
+    return events
+
+
+class ActivityRepository:
+    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+        self.collection = db[ACTIVITY_COLLECTION]
+
+    async def ensure_collection(self) -> None:
+        """Create the time-series collection (quick — the backfill runs separately).
+
+        Safe when several pods start at once: the losers of the creation race find
+        the collection there. A collection that exists without a backfill marker
+        was filled before markers existed and is left alone.
+        """
+        db = self.collection.database
+        if ACTIVITY_COLLECTION in await db.list_collection_names():
+            return
+        # Before the collection: a pod that dies in between still leaves the backfill to do
+        await db[MIGRATIONS_COLLECTION].update_one(
+            {"_id": BACKFILL_ID},
+            {"$setOnInsert": {"cutoff": datetime.now(UTC), "done": False}},
+            upsert=True,
+        )
+        try:
+            await db.create_collection(ACTIVITY_COLLECTION, timeseries=ACTIVITY_TIMESERIES)
+        except CollectionInvalid:
+            pass
+        except OperationFailure as exc:
+            if exc.code != _NAMESPACE_EXISTS:
+                raise
+
+    async def backfill(self) -> int:
+        """Record events for the sessions created before the collection: created and
+        closed at their times, first card and first vote (whose times were not kept)
+        at creation. Returns the number of events written — 0 when done already, or
+        while another pod holds the claim."""
+        db = self.collection.database
+        markers = db[MIGRATIONS_COLLECTION]
+        now = datetime.now(UTC)
+        claim = await markers.find_one_and_update(
+            {
+                "_id": BACKFILL_ID,
+                "done": False,
+                "$or": [{"claimed_at": None}, {"claimed_at": {"$lt": now - BACKFILL_LEASE}}],
+            },
+            {"$set": {"claimed_at": now}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if claim is None:
+            return 0
+        # Events of an attempt that did not finish
+        await self.collection.delete_many({"meta.event": {"$in": list(ActivityEvent)}, "meta.backfill": True})
+
+        written = 0
+        batch: list[dict] = []
+        async for doc in db["sessions"].find(
+            {"created_at": {"$lt": claim["cutoff"]}},
+            {"created_at": True, "updated_at": True, "phase": True, "cards.votes": True},
+            batch_size=BACKFILL_BATCH_SIZE,
+        ):
+            batch.extend(_backfilled_events(doc))
+            if len(batch) >= BACKFILL_BATCH_SIZE:
+                written += await self._insert_batch(batch)
+                batch = []
+        if batch:
+            written += await self._insert_batch(batch)
+        await markers.update_one({"_id": BACKFILL_ID}, {"$set": {"done": True, "claimed_at": None}})
+        logger.info("Activity: backfilled %d event(s)", written)
+        return written
+
+    async def backfill_done(self) -> bool:
+        """Whether every session's events are in: the backfill has finished, or there
+        was none to do (the collection predates the markers)."""
+        marker = await self.collection.database[MIGRATIONS_COLLECTION].find_one(
+            {"_id": BACKFILL_ID}, {"done": True}
+        )
+        return marker is None or bool(marker["done"])
+
+    async def _insert_batch(self, events: list[dict]) -> int:
+        await self.collection.insert_many(events, ordered=False)
+        await self.collection.database[MIGRATIONS_COLLECTION].update_one(
+            {"_id": BACKFILL_ID}, {"$set": {"claimed_at": datetime.now(UTC)}}
+        )
+        return len(events)
+
+    async def record(self, session_id: str, events: Iterable[ActivityEvent], at: datetime) -> None:
+        docs = [_event(event, session_id, at) for event in events]
+        if docs:
+            await self.collection.insert_many(docs)
+
+
+def _event(event: ActivityEvent, session_id: str, at: datetime) -> dict:
+    return {"at": at, "meta": {"event": str(event), "session_id": session_id}}
+
+
+def _backfilled_events(doc: dict[str, Any]) -> list[dict]:
+    created_at = doc["created_at"]
+    cards = doc.get("cards") or []
+    events = [ActivityEvent.CREATED]
+    if cards:
+        events.append(ActivityEvent.FIRST_CARD)
+    if any(card.get("votes") for card in cards):
+        events.append(ActivityEvent.FIRST_VOTE)
+    docs = [_event(event, doc["_id"], created_at) for event in events]
+    if doc.get("phase") == SessionPhase.CLOSED:
+        docs.append(_event(ActivityEvent.CLOSED, doc["_id"], doc.get("updated_at", created_at)))
+    for event in docs:
+        event["meta"]["backfill"] = True
+    return docs
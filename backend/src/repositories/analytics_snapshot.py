@@ -0,0 +1,305 @@
+"""Analytics snapshot — sessions and cards flattened into columns on local disk.
+
+A periodic job (``refresh()``) writes one file per column of fixed-width values
+(the ``array`` module's layout): one value per session, or per card. Readers
+memory-map the files (``read()``), so a query over years of retros touches only
+the columns it reduces, through the OS page cache, and never MongoDB. The snapshot
+keeps the sessions the cleanup has since deleted — it is the history the live
+collection no longer has.
+
+Refreshes are incremental: only the sessions updated since the previous snapshot
+are read from MongoDB, and they are appended. Rows are in order of their last
+refresh, so the sessions read again are mostly at the end: the rows before the
+first of them are copied over from the previous files by the kernel, the few after
+it in slices, and only the sessions read again pass through Python. Each refresh
+writes a new generation directory, then atomically replaces ``manifest.json`` to
+point at it, so readers always see a complete snapshot.
+
+A directory every pod mounts (``shared``) is refreshed by one pod per interval:
+the first to claim it in Redis.
+"""
+
+import asyncio
+import calendar
+import math
+import mmap
+import os
+import shutil
+from array import array
+from bisect import bisect_left
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any, BinaryIO, TypeVar
+
+import orjson
+import redis.asyncio as aioredis
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from ..models.session import SessionPhase
+
+T = TypeVar("T")
+
+# Column → array typecode. created_at in epoch seconds; phase as its index in PHASES;
+# hours_to_close NaN for sessions not closed; card_session the card's session row;
+# card_column the column name's index in the manifest's column_names
+SESSION_COLUMNS = {
+    "created_at": "q",
+    "phase": "b",
+    "cards": "i",
+    "votes": "i",
+    "reactions": "i",
+    "hours_to_close": "d",
+}
+CARD_COLUMNS = {"card_session": "i", "card_column": "i", "card_votes": "i"}
+PHASES = list(SessionPhase)
+
+# Sessions updated this long before the previous snapshot are read again — writes
+# in flight while it was taken are not missed
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+# A claim on a shared directory's refresh lapses this long before the next interval
+# begins, so the pods' loops drifting apart cannot make one interval skip it
+REFRESH_CLAIM_KEY = "analytics_snapshot:refresh"
+REFRESH_CLAIM_SLACK_SECONDS = 60
+
+_MANIFEST = "manifest.json"
+_PROJECTION = {
+    "phase": True,
+    "created_at": True,
+    "updated_at": True,
+    "cards.column": True,
+    "cards.votes": True,
+    "cards.reactions": True,
+}
+
+
+class SnapshotColumns:
+    """An open snapshot: ``columns["votes"]`` is a read-only view of the mapped file."""
+
+    def __init__(self, generation: Path, manifest: dict[str, Any]) -> None:
+        self.taken_at = datetime.fromisoformat(manifest["taken_at"])
+        self.column_names: list[str] = manifest["column_names"]
+        self._maps: list[mmap.mmap] = []
+        self._views: dict[str, memoryview] = {}
+        for name, code in {**SESSION_COLUMNS, **CARD_COLUMNS}.items():
+            with open(generation / f"{name}.bin", "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:  # mmap cannot map an empty file
+                    self._views[name] = memoryview(b"").cast(code)  # type: ignore[call-overload]
+                    continue
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps.append(mapped)
+            self._views[name] = memoryview(mapped).cast(code)  # type: ignore[call-overload]
+
+    def __getitem__(self, name: str) -> memoryview:
+        return self._views[name]
+
+    def close(self) -> None:
+        for view in self._views.values():
+            view.release()
+        for mapped in self._maps:
+            mapped.close()
+
+
+class _Builder:
+    """Columns being assembled in memory, a session (and its cards) at a time."""
+
+    def __init__(self, column_names: list[str]) -> None:
+        self.ids: list[str] = []
+        self.columns: dict[str, array[Any]] = {
+            name: array(code) for name, code in {**SESSION_COLUMNS, **CARD_COLUMNS}.items()
+        }
+        self.column_names = list(column_names)
+        self._column_codes = {name: code for code, name in enumerate(column_names)}
+
+    def add(self, doc: dict[str, Any]) -> None:
+        cards = doc.get("cards") or []
+        created_at, updated_at = doc.get("created_at"), doc.get("updated_at")
+        phase = doc.get("phase")
+        row = len(self.ids)
+        self.ids.append(str(doc["_id"]))
+        self.columns["created_at"].append(_epoch(created_at) if created_at else 0)
+        self.columns["phase"].append(_PHASE_CODES.get(phase, -1) if isinstance(phase, str) else -1)
+        self.columns["cards"].append(len(cards))
+        self.columns["votes"].append(sum(len(card.get("votes") or ()) for card in cards))
+        self.columns["reactions"].append(sum(_reactions(card) for card in cards))
+        hours_to_close = math.nan
+        if phase == SessionPhase.CLOSED and created_at and updated_at:
+            hours_to_close = (updated_at - created_at).total_seconds() / 3600
+        self.columns["hours_to_close"].append(hours_to_close)
+        for card in cards:
+            self.columns["card_session"].append(row)
+            self.columns["card_column"].append(self._column_code(card.get("column", "")))
+            self.columns["card_votes"].append(len(card.get("votes") or ()))
+
+    def _column_code(self, name: str) -> int:
+        code = self._column_codes.get(name)
+        if code is None:
+            code = self._column_codes[name] = len(self.column_names)
+            self.column_names.append(name)
+        return code
+
+
+_PHASE_CODES = {phase.value: code for code, phase in enumerate(PHASES)}
+
+
+class AnalyticsSnapshot:
+    def __init__(self, directory: str | Path, shared: bool = False) -> None:
+        self.directory = Path(directory)
+        self.shared = shared
+        # (generation, reduce, result) of the last read — a snapshot never changes,
+        # so each generation is reduced once, not once per request
+        self._last: tuple[str, Callable[[SnapshotColumns], Any], Any] | None = None
+
+    def read(self, reduce: Callable[[SnapshotColumns], T]) -> T | None:
+        """*reduce* applied to the current snapshot (None if none was taken yet).
+        Blocking — run it in a thread."""
+        manifest = self._manifest()
+        if manifest is None:
+            return None
+        if self._last is not None and self._last[:2] == (manifest["generation"], reduce):
+            return self._last[2]  # type: ignore[no-any-return]
+        columns = SnapshotColumns(self.directory / manifest["generation"], manifest)
+        try:
+            result = reduce(columns)
+        finally:
+            columns.close()
+        self._last = (manifest["generation"], reduce, result)
+        return result
+
+    async def claim_refresh(self, redis: aioredis.Redis, interval_seconds: float) -> bool:
+        """Whether this pod is to refresh the snapshot now — always, unless the
+        directory is shared and another pod has claimed this interval's refresh."""
+        if not self.shared:
+            return True
+        ttl = max(1, int(interval_seconds) - REFRESH_CLAIM_SLACK_SECONDS)
+        return bool(await redis.set(REFRESH_CLAIM_KEY, "1", nx=True, ex=ttl))
+
+    async def refresh(self, sessions: AsyncIOMotorCollection) -> int:
+        """Bring the snapshot up to date with *sessions*; the number of sessions read."""
+        taken_at = datetime.now(UTC)
+        previous = await asyncio.to_thread(self._manifest)
+        query: dict[str, Any] = {}
+        if previous is not None:
+            since = datetime.fromisoformat(previous["taken_at"]) - REFRESH_OVERLAP
+            query = {"updated_at": {"$gte": since}}
+        fresh = _Builder(previous["column_names"] if previous else [])
+        async for doc in sessions.find(query, _PROJECTION):
+            fresh.add(doc)
+        await asyncio.to_thread(self._write, previous, fresh, taken_at)
+        return len(fresh.ids)
+
+    def _manifest(self) -> dict[str, Any] | None:
+        try:
+            return orjson.loads((self.directory / _MANIFEST).read_bytes())  # type: ignore[no-any-return]
+        except FileNotFoundError:
+            return None
+
+    def _write(self, previous: dict[str, Any] | None, fresh: _Builder, taken_at: datetime) -> None:
+        # Previous rows up to the first session read again are kept as they are;
+        # the rest of them (less the sessions read again) are carried into *tail*
+        tail = _Builder(fresh.column_names)
+        ids: list[str] = []
+        kept = dict.fromkeys({**SESSION_COLUMNS, **CARD_COLUMNS}, 0)
+        if previous is not None:
+            old = self.directory / previous["generation"]
+            ids = orjson.loads((old / "ids.json").read_bytes())
+            replaced = set(fresh.ids)
+            first = next((row for row, session_id in enumerate(ids) if session_id in replaced), len(ids))
+            columns = SnapshotColumns(old, previous)
+            try:
+                kept.update(dict.fromkeys(SESSION_COLUMNS, first))
+                kept.update(dict.fromkeys(CARD_COLUMNS, bisect_left(columns["card_session"], first)))
+                _carry_over(columns, ids, replaced, first, tail)
+            finally:
+                columns.close()
+            del ids[first:]
+        offset = len(ids) + len(tail.ids)
+        ids.extend(tail.ids)
+        ids.extend(fresh.ids)
+        for name in SESSION_COLUMNS:
+            tail.columns[name].extend(fresh.columns[name])
+        tail.columns["card_session"].extend(row + offset for row in fresh.columns["card_session"])
+        tail.columns["card_column"].extend(fresh.columns["card_column"])
+        tail.columns["card_votes"].extend(fresh.columns["card_votes"])
+
+        name = f"gen-{taken_at:%Y%m%dT%H%M%S%f}"
+        generation = self.directory / name
+        generation.mkdir(parents=True)
+        for column, values in tail.columns.items():
+            with open(generation / f"{column}.bin", "wb", buffering=0) as f:
+                if kept[column]:
+                    assert previous is not None
+                    source = self.directory / previous["generation"] / f"{column}.bin"
+                    _copy_prefix(source, f, kept[column] * values.itemsize)
+                values.tofile(f)
+        (generation / "ids.json").write_bytes(orjson.dumps(ids))
+        manifest = {
+            "generation": name,
+            "taken_at": taken_at.isoformat(),
+            "sessions": len(ids),
+            "cards": kept["card_session"] + len(tail.columns["card_session"]),
+            "column_names": tail.column_names,
+        }
+        pending = self.directory / f"{_MANIFEST}.tmp"
+        pending.write_bytes(orjson.dumps(manifest))
+        os.replace(pending, self.directory / _MANIFEST)
+        # Keep the previous generation: a reader may have just read the old manifest
+        keep = {name, previous["generation"] if previous else name}
+        for old_generation in self.directory.glob("gen-*"):
+            if old_generation.name not in keep:
+                shutil.rmtree(old_generation)
+
+
+def _carry_over(
+    columns: SnapshotColumns, ids: list[str], replaced: set[str], first: int, tail: _Builder
+) -> None:
+    """Copy the rows from *first* on of the sessions not read again into *tail*, a
+    run of consecutive rows at a time; only their card rows are renumbered."""
+    cards, card_session = columns["cards"], columns["card_session"]
+    row = first
+    while row < len(ids):
+        if ids[row] in replaced:
+            row += 1
+            continue
+        end = row + 1
+        while end < len(ids) and ids[end] not in replaced:
+            end += 1
+        # Cards are stored in session order: the run's cards are consecutive too
+        first_card, end_card = bisect_left(card_session, row), bisect_left(card_session, end)
+        for name in SESSION_COLUMNS:
+            tail.columns[name].frombytes(columns[name][row:end].cast("B"))
+        for name in ("card_column", "card_votes"):
+            tail.columns[name].frombytes(columns[name][first_card:end_card].cast("B"))
+        shift = row - (first + len(tail.ids))
+        for old_row in range(row, end):
+            tail.columns["card_session"].extend(array("i", [old_row - shift]) * cards[old_row])
+        tail.ids.extend(ids[row:end])
+        row = end
+
+
+def _copy_prefix(source: Path, target: BinaryIO, size: int) -> None:
+    """The first *size* bytes of *source* appended to *target* — by the kernel, with
+    no copy through Python (a reflink on filesystems that share extents)."""
+    with open(source, "rb", buffering=0) as f:
+        try:
+            while size > 0 and (copied := os.copy_file_range(f.fileno(), target.fileno(), size)):
+                size -= copied
+        except (AttributeError, OSError):  # not Linux, or not between these filesystems
+            pass
+        while size > 0 and (chunk := f.read(min(size, 1 << 20))):
+            target.write(chunk)
+            size -= len(chunk)
+
+
+def _epoch(dt: datetime) -> int:
+    """Epoch seconds — naive values are taken as UTC."""
+    return calendar.timegm(dt.utctimetuple())
+
+
+def _reactions(card: dict[str, Any]) -> int:
+    # Emoji → names, or (documents from before the compact layout) a list of objects
+    reactions = card.get("reactions") or {}
+    if isinstance(reactions, list):
+        return len(reactions)
+    return sum(len(names) for names in reactions.values())
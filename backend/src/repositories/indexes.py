@@ -0,0 +1,213 @@
+"""Index registry — every index the repositories' queries rely on, declared in one place.
+
+``ensure_indexes()`` builds ``INDEXES`` (at startup, in the background, so the app
+serves while a build runs). ``QUERIES`` lists the filter and sort shapes the
+repositories issue — tests/test_indexes.py records the queries actually sent and
+fails on one not listed, or listed and never sent. ``advise()`` runs ``explain``
+on each against a real MongoDB and reports those whose winning plan scans a whole
+collection. A query added to a repository goes in ``QUERIES`` together with the
+index that serves it — or, if it reads every document by design (an all-time
+total), with ``scans=True``, which the advisor does not explain.
+
+Usage (from backend/), exits 1 when a query scans a collection:
+    uv run python -m src.repositories.indexes --mongodb-url mongodb://localhost:27017
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import IndexModel
+
+from ..config import settings
+from .activity_repo import (
+    ACTIVITY_COLLECTION,
+    BACKFILL_ID,
+    MIGRATIONS_COLLECTION,
+    ActivityEvent,
+    ActivityRepository,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class IndexSpec:
+    collection: str
+    keys: tuple[tuple[str, int], ...]
+
+    @property
+    def name(self) -> str:
+        """MongoDB's default name for the index, e.g. ``created_at_-1``."""
+        return "_".join(f"{field}_{direction}" for field, direction in self.keys)
+
+
+@dataclass(frozen=True, slots=True)
+class QueryShape:
+    name: str
+    collection: str
+    filter: dict[str, Any]
+    sort: tuple[tuple[str, int], ...] = ()
+    scans: bool = False
+
+
+INDEXES: tuple[IndexSpec, ...] = (
+    IndexSpec("sessions", (("last_accessed_at", 1),)),
+    IndexSpec("sessions", (("phase", 1), ("created_at", 1))),
+    IndexSpec("sessions", (("created_at", 1),)),
+    IndexSpec("sessions", (("updated_at", 1),)),
+    IndexSpec("feedback", (("created_at", -1),)),
+    IndexSpec("feedback", (("rating", 1),)),
+    IndexSpec(ACTIVITY_COLLECTION, (("meta.event", 1), ("at", 1))),
+)
+
+# Values only shape the plan; any date will do
+_T = datetime(2025, 1, 1, tzinfo=UTC)
+
+QUERIES: tuple[QueryShape, ...] = (
+    QueryShape("session by id (session repo)", "sessions", {"_id": "id"}),
+    QueryShape(
+        "session unless the name joined (add_participant)",
+        "sessions",
+        {"_id": "id", "participants.name": {"$ne": "name"}},
+    ),
+    QueryShape("stale sessions (delete_stale)", "sessions", {"last_accessed_at": {"$lt": _T}}),
+    QueryShape("sessions in a phase (admin stats)", "sessions", {"phase": "closed"}),
+    QueryShape("open sessions (admin stats)", "sessions", {"phase": {"$ne": "closed"}}),
+    QueryShape(
+        "open sessions near expiry (admin stats)",
+        "sessions",
+        {"phase": {"$ne": "closed"}, "created_at": {"$gt": _T, "$lte": _T}},
+    ),
+    QueryShape(
+        "closed sessions created in a window (admin stats durations)",
+        "sessions",
+        {"phase": "closed", "created_at": {"$gte": _T, "$lt": _T}},
+    ),
+    QueryShape(
+        "sessions created in a window (admin stats reactions, cards per column)",
+        "sessions",
+        {"created_at": {"$gte": _T, "$lt": _T}},
+    ),
+    QueryShape(
+        "sessions by age (admin stats lifetime distribution)",
+        "sessions",
+        {"created_at": {"$gt": _T, "$lte": _T}},
+    ),
+    QueryShape("sessions by creation (stats export)", "sessions", {}, sort=(("created_at", 1),)),
+    QueryShape("sessions updated since (analytics snapshot)", "sessions", {"updated_at": {"$gte": _T}}),
+    QueryShape("sessions before the activity backfill", "sessions", {"created_at": {"$lt": _T}}),
+    QueryShape(
+        "every session (all-time admin stats, counter reconcile, first analytics snapshot)",
+        "sessions",
+        {},
+        scans=True,
+    ),
+    QueryShape("recent feedback (list_feedback, admin stats)", "feedback", {}, sort=(("created_at", -1),)),
+    QueryShape("feedback by rating (admin stats)", "feedback", {}, sort=(("rating", 1),)),
+    QueryShape("every feedback (counter reconcile)", "feedback", {}, scans=True),
+    QueryShape(
+        "lifecycle events in a window (admin charts)",
+        ACTIVITY_COLLECTION,
+        {"meta.event": "created", "at": {"$gte": _T}},
+    ),
+    QueryShape(
+        "events in a window (engagement funnel)",
+        ACTIVITY_COLLECTION,
+        {"meta.event": {"$in": list(ActivityEvent)}, "at": {"$gte": _T, "$lt": _T}},
+    ),
+    QueryShape(
+        "events of an unfinished backfill (activity backfill)",
+        ACTIVITY_COLLECTION,
+        {"meta.event": {"$in": ["created"]}, "meta.backfill": True},
+    ),
+    QueryShape("activity backfill marker", MIGRATIONS_COLLECTION, {"_id": BACKFILL_ID}),
+    QueryShape(
+        "unclaimed activity backfill marker",
+        MIGRATIONS_COLLECTION,
+        {"_id": BACKFILL_ID, "done": False, "$or": [{"claimed_at": None}]},
+    ),
+    QueryShape("public stats counters", "stats", {"_id": "public"}),
+)
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase) -> None:
+    by_collection: dict[str, list[IndexModel]] = {}
+    for spec in INDEXES:
+        by_collection.setdefault(spec.collection, []).append(IndexModel(list(spec.keys), name=spec.name))
+    for collection, models in by_collection.items():
+        await db[collection].create_indexes(models)
+
+
+# ── Advisor ──────────────────────────────────────────────────────────────────
+
+
+def plan_stages(explain: Any) -> Iterator[str]:
+    """Every stage of every winning plan in an ``explain`` result (time-series
+    collections nest theirs in an aggregation)."""
+    if isinstance(explain, dict):
+        for key, value in explain.items():
+            if key == "winningPlan":
+                yield from _stages(value)
+            else:
+                yield from plan_stages(value)
+    elif isinstance(explain, list):
+        for item in explain:
+            yield from plan_stages(item)
+
+
+def _stages(plan: dict[str, Any]) -> Iterator[str]:
+    if "stage" in plan:
+        yield plan["stage"]
+    for key in ("queryPlan", "inputStage"):
+        if key in plan:
+            yield from _stages(plan[key])
+    for child in plan.get("inputStages", ()):
+        yield from _stages(child)
+
+
+async def advise(db: AsyncIOMotorDatabase) -> list[dict[str, Any]]:
+    """One finding per registered query whose plan scans a whole collection."""
+    findings = []
+    for query in QUERIES:
+        if query.scans:
+            continue
+        command: dict[str, Any] = {"find": query.collection, "filter": query.filter}
+        if query.sort:
+            command["sort"] = dict(query.sort)
+        explain = await db.command({"explain": command, "verbosity": "queryPlanner"})
+        stages = list(plan_stages(explain))
+        if "COLLSCAN" in stages:
+            findings.append({"query": query.name, "collection": query.collection, "stages": stages})
+    return findings
+
+
+async def _run(mongodb_url: str, database: str) -> list[dict[str, Any]]:  # pragma: no cover
+    client: AsyncIOMotorClient = AsyncIOMotorClient(mongodb_url)
+    try:
+        db = client[database]
+        await ActivityRepository(db).ensure_collection()
+        await ensure_indexes(db)
+        return await advise(db)
+    finally:
+        client.close()
+
+
+def main(argv: list[str] | None = None) -> None:  # pragma: no cover - needs a real MongoDB
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--mongodb-url", default=settings.mongodb_url)
+    parser.add_argument("--database", default=settings.mongodb_database)
+    args = parser.parse_args(argv)
+    findings = asyncio.run(_run(args.mongodb_url, args.database))
+    print(json.dumps({"queries": len(QUERIES), "collection_scans": findings}, indent=2))
+    sys.exit(1 if findings else 0)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
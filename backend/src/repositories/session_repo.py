@@ -1,24 +1,63 @@
 from datetime import UTC, datetime
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import TypeAdapter
+from pymongo import ReturnDocument
 
-from ..models.session import Session
+from ..config import settings
+from ..models.session import Participant, Session, _expand_names, _reactors, _voters
+from .activity_repo import ActivityEvent, ActivityRepository, lifecycle_events
+from .indexes import ensure_indexes
+from .stats_repo import StatsCounters, session_totals
+
+_session_validator = TypeAdapter(Session)
 
 
 def _doc_to_session(doc: dict) -> Session:
+    """Decode a stored document. Documents are ones we wrote, so they are trusted;
+    VALIDATE_SESSION_DOCUMENTS=true type-checks every field instead (and raises)."""
     doc["id"] = str(doc.pop("_id"))
-    return Session(**doc)
+    session = _validated(doc) if settings.validate_session_documents else Session.from_dict(doc)
+    session.stored_counts = session.counts()
+    return session
+
+
+def _validated(doc: dict) -> Session:
+    # Bring interned names and votes and reactions written in the legacy layout
+    # (lists of objects) to the plain compact layout the validator checks against
+    name_table = doc.pop("name_table", None)
+    for card in doc.get("cards") or ():
+        if isinstance(card, dict):
+            if name_table is not None:
+                _expand_names(card, name_table)
+            card["votes"] = _voters(card.get("votes", ()))
+            card["reactions"] = _reactors(card.get("reactions", ()))
+    session = _session_validator.validate_python(doc)
+    if "vote_tally" not in doc:
+        session.recount_votes()
+    return session
+
+
+def _session_to_doc(session: Session) -> dict:
+    doc = session.to_doc(intern_names=settings.intern_participant_names)
+    doc["_id"] = doc.pop("id")
+    return doc
 
 
 class SessionRepository:
+    """Session persistence. Writes also keep the public stats counters current and
+    record lifecycle events in the activity collection."""
+
     def __init__(self, db: AsyncIOMotorDatabase) -> None:
         self.collection = db["sessions"]
+        self.counters = StatsCounters(db)
+        self.activity = ActivityRepository(db)
 
     async def create(self, session: Session) -> Session:
-        doc = session.model_dump()
-        doc["_id"] = session.id
-        del doc["id"]
-        await self.collection.insert_one(doc)
+        await self.collection.insert_one(_session_to_doc(session))
+        session.stored_counts = session.counts()
+        await self.counters.record(None, session.stored_counts, created_at=session.created_at)
+        await self.activity.record(session.id, [ActivityEvent.CREATED], session.created_at)
         return session
 
     async def get_by_id(self, session_id: str) -> Session | None:
@@ -27,27 +66,77 @@ class SessionRepository:
             return None
         return _doc_to_session(doc)
 
-    async def touch(self, session_id: str) -> None:
-        """Update last_accessed_at without a full document replace."""
-        await self.collection.update_one(
+    async def add_participant(self, session_id: str, participant: Participant) -> Session | None:
+        """Atomically append a participant unless one with that name already exists.
+
+        Returns the updated session, or None when nothing was written (unknown session
+        or the name is already taken). A join is an access too: last_accessed_at is
+        set in the same write.
+        """
+        now = datetime.now(UTC)
+        doc = await self.collection.find_one_and_update(
+            {"_id": session_id, "participants.name": {"$ne": participant.name}},
+            {
+                "$push": {"participants": participant.to_dict()},
+                "$set": {"updated_at": now, "last_accessed_at": now},
+                "$inc": {"version": 1},
+            },
+            return_document=ReturnDocument.AFTER,
+        )
+        if not doc:
+            return None
+        return _doc_to_session(doc)
+
+    async def get_and_touch(self, session_id: str) -> Session | None:
+        """The session, with last_accessed_at updated in the same round trip."""
+        doc = await self.collection.find_one_and_update(
             {"_id": session_id},
             {"$set": {"last_accessed_at": datetime.now(UTC)}},
+            return_document=ReturnDocument.AFTER,
         )
+        if not doc:
+            return None
+        return _doc_to_session(doc)
+
+    async def touch(self, session_id: str) -> tuple[int, datetime] | None:
+        """Update last_accessed_at without a full document replace.
+
+        Returns the session's (version, updated_at) — enough to tell whether a copy
+        is current without loading the board — or None for an unknown session.
+        """
+        doc = await self.collection.find_one_and_update(
+            {"_id": session_id},
+            {"$set": {"last_accessed_at": datetime.now(UTC)}},
+            projection={"_id": False, "version": True, "updated_at": True},
+        )
+        if doc is None:
+            return None
+        return doc.get("version", 0), doc["updated_at"]
 
     async def delete_stale(self, older_than: datetime) -> int:
         """Delete sessions not accessed since `older_than`. Returns count deleted."""
-        result = await self.collection.delete_many(
-            {"last_accessed_at": {"$lt": older_than}}
-        )
+        stale = {"last_accessed_at": {"$lt": older_than}}
+        totals = await session_totals(self.collection, stale)
+        result = await self.collection.delete_many(stale)
+        if result.deleted_count:
+            await self.counters.subtract(totals)
         return result.deleted_count
 
     async def ensure_indexes(self) -> None:
-        await self.collection.create_index("last_accessed_at")
+        """Build every index in the registry (``indexes.INDEXES``), not only this collection's."""
+        await ensure_indexes(self.collection.database)  # type: ignore[arg-type]
 
     async def update(self, session: Session) -> Session:
         session.updated_at = datetime.now(UTC)
-        doc = session.model_dump()
-        doc["_id"] = session.id
-        del doc["id"]
-        await self.collection.replace_one({"_id": session.id}, doc)
+        session.version += 1
+        result = await self.collection.replace_one({"_id": session.id}, _session_to_doc(session))
+        # A session built without being read has no stored counts to move from;
+        # reconciliation picks it up
+        if result.matched_count and session.stored_counts is not None:
+            counts = session.counts()
+            await self.counters.record(session.stored_counts, counts)
+            await self.activity.record(
+                session.id, lifecycle_events(session.stored_counts, counts), session.updated_at
+            )
+            session.stored_counts = counts
         return session
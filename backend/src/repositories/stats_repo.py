@@ -1,12 +1,120 @@
-"""Stats repository — aggregate-only queries, read-only, never mutates sessions."""
+"""Stats repository — aggregate-only queries, read-only, never mutates sessions.
+
+The public stats are read from running totals (``StatsCounters``) that the session
+and feedback writes keep current, not aggregated per request; ``reconcile_counters()``
+rebuilds them from the collections. Sessions per day, the activity heatmap and the
+engagement funnel come from the lifecycle events in the activity collection
+(``activity_repo``), over a bounded window, so they outlive expired sessions.
+Unique participants are HyperLogLogs in Redis (``UniqueParticipants``).
+The admin stats are independent facet queries, run concurrently and each time-limited.
+"""
+
+import asyncio
+import logging
+import math
+import statistics
+from collections import Counter
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import UTC, date, datetime, time, timedelta
+from functools import partial
+from typing import Any, Literal, NamedTuple
+
+import redis.asyncio as aioredis
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pydantic import BaseModel
+from pymongo.errors import ExecutionTimeout
+from redis.exceptions import RedisError
 
-from datetime import UTC, datetime, timedelta
+from ..config import settings
+from ..models.session import SessionCounts, SessionPhase
+from .activity_repo import ACTIVITY_COLLECTION, ActivityEvent, ActivityRepository
+from .analytics_snapshot import AnalyticsSnapshot, SnapshotColumns
 
-from motor.motor_asyncio import AsyncIOMotorDatabase
-from pydantic import BaseModel
+logger = logging.getLogger(__name__)
+
+# Runs one admin facet query, given the facet's name — e.g. through a cache
+FacetRunner = Callable[[str, Callable[[], Awaitable[Any]]], Awaitable[Any]]
 
 BUCKET_ORDER = ["<1 day", "1–7 days", "7–30 days", "30+ days"]
 
+# One {"emoji", "n"} row per emoji and card. Cards store reactions as emoji → names;
+# documents not rewritten since the compact layout still hold a list of
+# {"emoji", "participant_name"} objects, one per reaction.
+_REACTION_ROWS: list[dict] = [
+    {"$unwind": {"path": "$cards", "preserveNullAndEmptyArrays": False}},
+    {
+        "$project": {
+            "rows": {
+                "$cond": [
+                    {"$isArray": "$cards.reactions"},
+                    {
+                        "$map": {
+                            "input": "$cards.reactions",
+                            "as": "r",
+                            "in": {"emoji": "$$r.emoji", "n": 1},
+                        }
+                    },
+                    {
+                        "$map": {
+                            "input": {"$objectToArray": {"$ifNull": ["$cards.reactions", {}]}},
+                            "as": "r",
+                            "in": {"emoji": "$$r.k", "n": {"$size": "$$r.v"}},
+                        }
+                    },
+                ]
+            }
+        }
+    },
+    {"$unwind": {"path": "$rows", "preserveNullAndEmptyArrays": False}},
+]
+
+
+# Columns of the stats export, in order
+EXPORT_FIELDS = ("created_at", "last_accessed_at", "phase", "cards", "votes", "reactions", "lifetime_hours")
+
+# One row per session, oldest first (served by the created_at index). Only per-card
+# vote and reaction counts leave the server — summed by _export_row(); a server-side
+# total per session ($sum of an array, $reduce) is left out, as mongomock lacks them.
+_EXPORT_PIPELINE: list[dict] = [
+    {"$sort": {"created_at": 1}},
+    {
+        "$project": {
+            "_id": 0,
+            "created_at": 1,
+            "last_accessed_at": 1,
+            "phase": 1,
+            "votes": {
+                "$map": {
+                    "input": {"$ifNull": ["$cards", []]},
+                    "as": "c",
+                    "in": {"$size": {"$ifNull": ["$$c.votes", []]}},
+                }
+            },
+            # Both card layouts, as in _REACTION_ROWS: a list of reaction objects, or
+            # emoji → names (one count per emoji)
+            "reactions": {
+                "$map": {
+                    "input": {"$ifNull": ["$cards", []]},
+                    "as": "c",
+                    "in": {
+                        "$cond": [
+                            {"$isArray": "$$c.reactions"},
+                            {"$size": "$$c.reactions"},
+                            {
+                                "$map": {
+                                    "input": {"$objectToArray": {"$ifNull": ["$$c.reactions", {}]}},
+                                    "as": "r",
+                                    "in": {"$size": "$$r.v"},
+                                }
+                            },
+                        ]
+                    },
+                }
+            },
+        }
+    },
+]
+
 
 class PhaseCount(BaseModel):
     phase: str
@@ -94,6 +202,21 @@ class PublicStats(BaseModel):
     total_votes: int
     total_reactions: int
     feedback_total: int = 0
+    # Approximate distinct participants (HyperLogLog) — over the last 7 / 30 days,
+    # per day, and per week (dated by its Monday)
+    unique_participants_7d: int = 0
+    unique_participants_30d: int = 0
+    unique_participants_per_day: list[DailyCount] = []
+    unique_participants_per_week: list[DailyCount] = []
+
+
+class SessionSeries(BaseModel):
+    start: str  # "YYYY-MM-DD", first day of the window
+    end: str  # "YYYY-MM-DD", last day of the window
+    granularity: str
+    # Dated by the first day of each bucket — within the window: a week or month it
+    # starts in the middle of is dated by the window's first day. Empty ones left out.
+    buckets: list[DailyCount]
 
 
 class SentryIssue(BaseModel):
@@ -116,6 +239,23 @@ class SentryHealth(BaseModel):
     error: str | None = None               # set on partial fetch failure
 
 
+class VoteBucket(BaseModel):
+    votes: int
+    cards: int  # cards with this many votes
+
+
+class HistoryStats(BaseModel):
+    """All-time figures from the analytics snapshot — expired sessions included."""
+
+    taken_at: str  # ISO string, when the snapshot was refreshed
+    sessions: int
+    cards: int
+    cards_per_column: list[ColumnCount]
+    vote_distribution: list[VoteBucket]  # by number of votes, ascending
+    avg_time_to_close_hours: float | None  # None = no closed sessions
+    median_time_to_close_hours: float | None
+
+
 class AdminStats(BaseModel):
     reaction_breakdown: list[ReactionCount]
     cards_per_column: list[ColumnCount]
@@ -125,417 +265,526 @@ class AdminStats(BaseModel):
     sentry: SentryHealth | None = None
     sentry_frontend: SentryHealth | None = None
     feedback: FeedbackStats = FeedbackStats(total=0, avg_rating=None, by_rating=[], recent=[])
+    history: HistoryStats | None = None  # None = no ANALYTICS_SNAPSHOT_DIR, or no snapshot yet
+    # Facets that failed or timed out, left empty above → why
+    errors: dict[str, str] = {}
 
 
-class StatsRepository:
-    def __init__(self, db: AsyncIOMotorDatabase) -> None:
-        self.collection = db["sessions"]
+# ── Running totals ───────────────────────────────────────────────────────────
 
-    async def get_public_stats(self) -> PublicStats:
-        thirty_days_ago = datetime.now(UTC) - timedelta(days=30)
+PER_DAY_WINDOW_DAYS = 30
+ACTIVITY_WINDOW_DAYS = 90  # default span of the admin heatmap and engagement funnel
 
-        pipeline: list[dict] = [
-            {
-                "$facet": {
-                    "total": [{"$count": "n"}],
-                    "active": [
-                        {"$match": {"phase": {"$ne": "closed"}}},
-                        {"$count": "n"},
-                    ],
-                    "by_phase": [
-                        {"$group": {"_id": "$phase", "count": {"$sum": 1}}},
-                        {"$sort": {"_id": 1}},
-                    ],
-                    "per_day": [
-                        {"$match": {"created_at": {"$gte": thirty_days_ago}}},
-                        {
-                            "$group": {
-                                "_id": {
-                                    "$dateToString": {
-                                        "format": "%Y-%m-%d",
-                                        "date": "$created_at",
-                                    }
-                                },
-                                "count": {"$sum": 1},
-                            }
-                        },
-                        {"$sort": {"_id": 1}},
-                    ],
-                    "card_counts": [
-                        {
-                            "$unwind": {
-                                "path": "$cards",
-                                "preserveNullAndEmptyArrays": False,
-                            }
-                        },
-                        {"$count": "total"},
-                    ],
-                    "vote_counts": [
-                        {
-                            "$unwind": {
-                                "path": "$cards",
-                                "preserveNullAndEmptyArrays": False,
-                            }
-                        },
-                        {
-                            "$unwind": {
-                                "path": "$cards.votes",
-                                "preserveNullAndEmptyArrays": False,
-                            }
-                        },
-                        {"$count": "total"},
-                    ],
-                    "reaction_counts": [
-                        {
-                            "$unwind": {
-                                "path": "$cards",
-                                "preserveNullAndEmptyArrays": False,
-                            }
-                        },
-                        {
-                            "$unwind": {
-                                "path": "$cards.reactions",
-                                "preserveNullAndEmptyArrays": False,
-                            }
-                        },
-                        {"$count": "total"},
-                    ],
-                }
+Granularity = Literal["day", "week", "month"]
+
+
+class TimeWindow(NamedTuple):
+    """A range of times, [start, end) — either side open when None."""
+
+    start: datetime | None = None
+    end: datetime | None = None
+
+    @classmethod
+    def of_days(cls, first: date | None, last: date | None) -> "TimeWindow":
+        """The UTC days *first* through *last*."""
+        return cls(
+            datetime.combine(first, time(), UTC) if first else None,
+            datetime.combine(last + timedelta(days=1), time(), UTC) if last else None,
+        )
+
+    def range(self) -> dict[str, datetime]:
+        """The window as a query condition on a date field."""
+        condition = {}
+        if self.start is not None:
+            condition["$gte"] = self.start
+        if self.end is not None:
+            condition["$lt"] = self.end
+        return condition
+
+
+def _totals_pipeline(match: dict[str, Any]) -> list[dict]:
+    return [
+        {"$match": match},
+        {
+            "$facet": {
+                "by_phase": [{"$group": {"_id": "$phase", "count": {"$sum": 1}}}],
+                "card_counts": [
+                    {"$unwind": {"path": "$cards", "preserveNullAndEmptyArrays": False}},
+                    {"$count": "total"},
+                ],
+                # One array element per vote in both card layouts (names or objects)
+                "vote_counts": [
+                    {"$unwind": {"path": "$cards", "preserveNullAndEmptyArrays": False}},
+                    {"$unwind": {"path": "$cards.votes", "preserveNullAndEmptyArrays": False}},
+                    {"$count": "total"},
+                ],
+                "reaction_counts": [
+                    *_REACTION_ROWS,
+                    {"$group": {"_id": None, "total": {"$sum": "$rows.n"}}},
+                ],
             }
-        ]
+        },
+    ]
+
+
+async def session_totals(
+    collection: AsyncIOMotorCollection, match: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    """The public stats totals of the sessions matching *match* (all by default), in
+    the shape of the counters document — less sessions_per_day, which is counted from
+    the activity events."""
+    result = await collection.aggregate(_totals_pipeline(match or {})).to_list(length=1)
+    facets = result[0] if result else {}
+    return {
+        "sessions_by_phase": {d["_id"]: d["count"] for d in facets.get("by_phase", ())},
+        "cards": facets["card_counts"][0]["total"] if facets.get("card_counts") else 0,
+        "votes": facets["vote_counts"][0]["total"] if facets.get("vote_counts") else 0,
+        "reactions": facets["reaction_counts"][0]["total"] if facets.get("reaction_counts") else 0,
+    }
+
+
+async def _created_per_day(activity: AsyncIOMotorCollection, window: TimeWindow) -> dict[str, int]:
+    pipeline: list[dict] = [
+        {"$match": {"meta.event": ActivityEvent.CREATED.value, "at": window.range()}},
+        {
+            "$group": {
+                "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$at"}},
+                "count": {"$sum": 1},
+            }
+        },
+    ]
+    return {d["_id"]: d["count"] async for d in activity.aggregate(pipeline)}
 
-        result = await self.collection.aggregate(pipeline).to_list(length=1)
-        if not result:
-            return _empty_public_stats()
 
-        facets = result[0]
-        total = facets["total"][0]["n"] if facets["total"] else 0
-        active = facets["active"][0]["n"] if facets["active"] else 0
-        by_phase = [
-            PhaseCount(phase=d["_id"], count=d["count"]) for d in facets["by_phase"]
-        ]
-        per_day = [
-            DailyCount(date=d["_id"], count=d["count"]) for d in facets["per_day"]
-        ]
-        total_cards = facets["card_counts"][0]["total"] if facets["card_counts"] else 0
-        total_votes = facets["vote_counts"][0]["total"] if facets["vote_counts"] else 0
-        total_reactions = (
-            facets["reaction_counts"][0]["total"] if facets["reaction_counts"] else 0
+class StatsCounters:
+    """Running totals behind the public stats: one document in the ``stats`` collection.
+
+    Writes move them with ``$inc``, and only once the document exists —
+    ``StatsRepository.reconcile_counters()`` creates it from a full aggregation on
+    the first public stats read, and rebuilds it periodically to correct drift (two
+    requests replacing the same session at once both count their change, though
+    only the last one is kept).
+    """
+
+    _ID = "public"
+
+    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+        self.collection = db["stats"]
+
+    async def read(self) -> dict[str, Any] | None:
+        return await self.collection.find_one({"_id": self._ID})
+
+    async def replace(self, totals: dict[str, Any]) -> None:
+        await self.collection.replace_one(
+            {"_id": self._ID}, {**totals, "reconciled_at": datetime.now(UTC)}, upsert=True
         )
-        avg = round(total_cards / total, 2) if total > 0 else 0.0
 
-        feedback_total = await self.collection.database["feedback"].count_documents({})
+    async def record(
+        self,
+        before: SessionCounts | None,
+        after: SessionCounts | None,
+        created_at: datetime | None = None,
+    ) -> None:
+        """Move the totals from a session's *before* counts to its *after* counts
+        (None: it did not / no longer exists); *created_at* for a new session."""
+        inc: Counter[str] = Counter()
+        for counts, sign in ((before, -1), (after, 1)):
+            if counts is not None:
+                inc[f"sessions_by_phase.{counts.phase}"] += sign
+                inc["cards"] += sign * counts.cards
+                inc["votes"] += sign * counts.votes
+                inc["reactions"] += sign * counts.reactions
+        if created_at is not None:
+            inc[f"sessions_per_day.{created_at:%Y-%m-%d}"] += 1
+        await self._inc(inc)
+
+    async def subtract(self, totals: dict[str, Any]) -> None:
+        """Take away the ``session_totals()`` of deleted sessions (they stay in the
+        per-day counts, which count creations)."""
+        inc: Counter[str] = Counter()
+        for phase, n in totals["sessions_by_phase"].items():
+            inc[f"sessions_by_phase.{phase}"] -= n
+        for key in ("cards", "votes", "reactions"):
+            inc[key] -= totals[key]
+        await self._inc(inc)
+
+    async def add_feedback(self) -> None:
+        await self._inc(Counter(feedback=1))
+
+    async def _inc(self, inc: Counter[str]) -> None:
+        changes = {key: n for key, n in inc.items() if n}
+        if changes:
+            await self.collection.update_one({"_id": self._ID}, {"$inc": changes})
+
+
+# ── Unique participants ──────────────────────────────────────────────────────
+
+UNIQUES_WEEKS = 12  # span of the public weekly series; days are kept this long
+
+
+class UniqueParticipants:
+    """Distinct participants per UTC day, as Redis HyperLogLogs (``PFADD``): about
+    0.8% standard error and at most 12 KB a day, however many take part.
+
+    A participant is a name within a session — the only identity there is. Creating
+    a session and every join (including the page load's ``?join=``) adds one, so a
+    day counts the participants active on it. A range of days is counted from the
+    union of its keys (``PFCOUNT`` over several keys merges them without storing the
+    result), so someone active on several days counts once.
+    """
+
+    def __init__(self, redis: aioredis.Redis) -> None:
+        self.redis = redis
+
+    async def add(self, session_id: str, name: str, at: datetime | None = None) -> None:
+        """Count the participant. Best effort: a Redis failure is logged, not raised —
+        a missed count must not fail the create or join it rides along with."""
+        key = _uniques_key((at or datetime.now(UTC)).date())
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.pfadd(key, f"{session_id}:{name}")
+                pipe.expire(key, timedelta(weeks=UNIQUES_WEEKS + 1))
+                await pipe.execute()
+        except RedisError as exc:
+            logger.warning("Uniques: could not count %s in %s: %r", name, session_id, exc)
+
+    async def count(self, first: date, last: date) -> int:
+        """Distinct participants over the days *first* through *last*."""
+        return await self.redis.pfcount(*(_uniques_key(day) for day in _days(first, last)))  # type: ignore[no-any-return]
+
+    async def series(self, ranges: list[tuple[date, date]]) -> list[DailyCount]:
+        """``count()`` of each range in one round trip, by first day; empty ranges left out."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for first, last in ranges:
+                pipe.pfcount(*(_uniques_key(day) for day in _days(first, last)))
+            counts = await pipe.execute()
+        return [
+            DailyCount(date=first.isoformat(), count=n)
+            for (first, _), n in zip(ranges, counts, strict=True)
+            if n
+        ]
+
+
+def _uniques_key(day: date) -> str:
+    return f"stats:participants:{day.isoformat()}"
+
+
+def _days(first: date, last: date) -> list[date]:
+    return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+
+class StatsRepository:
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        uniques: UniqueParticipants | None = None,
+        analytics: AsyncIOMotorDatabase | None = None,
+        snapshot: AnalyticsSnapshot | None = None,
+    ) -> None:
+        """The aggregations read from *analytics* (``database.analytics_db``: secondaries,
+        boundedly stale) when given; the counters, and their reconciliation, use *db*.
+        The all-time admin history is reduced from *snapshot*'s columns."""
+        reads = analytics if analytics is not None else db
+        self.collection = reads["sessions"]
+        self.activity = reads[ACTIVITY_COLLECTION]
+        self.feedback = reads["feedback"]
+        self.counters = StatsCounters(db)
+        self.uniques = uniques
+        self.snapshot = snapshot
+        self._db = db
+
+    async def get_public_stats(self) -> PublicStats:
+        totals = await self.counters.read()
+        if totals is None:  # not started yet
+            totals = await self.reconcile_counters()
+
+        by_phase = {phase: n for phase, n in totals.get("sessions_by_phase", {}).items() if n}
+        total = sum(by_phase.values())
+        first_day = f"{datetime.now(UTC) - timedelta(days=PER_DAY_WINDOW_DAYS):%Y-%m-%d}"
+        per_day = sorted(
+            (day, n) for day, n in totals.get("sessions_per_day", {}).items() if n and day >= first_day
+        )
+        total_cards = totals.get("cards", 0)
 
         return PublicStats(
+            **(await self._unique_participants()),
             total_sessions=total,
-            active_sessions=active,
-            sessions_by_phase=by_phase,
-            sessions_per_day=per_day,
+            active_sessions=total - by_phase.get(SessionPhase.CLOSED, 0),
+            sessions_by_phase=[PhaseCount(phase=p, count=n) for p, n in sorted(by_phase.items())],
+            sessions_per_day=[DailyCount(date=day, count=n) for day, n in per_day],
             total_cards=total_cards,
-            avg_cards_per_session=avg,
-            total_votes=total_votes,
-            total_reactions=total_reactions,
-            feedback_total=feedback_total,
+            avg_cards_per_session=round(total_cards / total, 2) if total > 0 else 0.0,
+            total_votes=totals.get("votes", 0),
+            total_reactions=totals.get("reactions", 0),
+            feedback_total=totals.get("feedback", 0),
+        )
+
+    async def _unique_participants(self) -> dict[str, Any]:
+        if self.uniques is None:
+            return {}
+        today = datetime.now(UTC).date()
+        this_week = today - timedelta(days=today.weekday())
+        weeks = [this_week - timedelta(weeks=i) for i in reversed(range(UNIQUES_WEEKS))]
+        days = [today - timedelta(days=i) for i in reversed(range(PER_DAY_WINDOW_DAYS))]
+        last_7, last_30, per_day, per_week = await asyncio.gather(
+            self.uniques.count(today - timedelta(days=6), today),
+            self.uniques.count(days[0], today),
+            self.uniques.series([(day, day) for day in days]),
+            self.uniques.series([(monday, min(monday + timedelta(days=6), today)) for monday in weeks]),
+        )
+        return {
+            "unique_participants_7d": last_7,
+            "unique_participants_30d": last_30,
+            "unique_participants_per_day": per_day,
+            "unique_participants_per_week": per_week,
+        }
+
+    async def reconcile_counters(self) -> dict[str, Any]:
+        """Recompute the public stats totals from the collections and store them —
+        read from the primary: totals even seconds old would drop the writes
+        counted meanwhile."""
+        totals = await session_totals(self._db["sessions"])
+        totals["sessions_per_day"] = await _created_per_day(
+            self._db[ACTIVITY_COLLECTION], TimeWindow(datetime.now(UTC) - timedelta(days=PER_DAY_WINDOW_DAYS))
         )
+        totals["feedback"] = await self._db["feedback"].count_documents({})
+        await self.counters.replace(totals)
+        return totals
+
+    # ── Activity events ──────────────────────────────────────────────────────
+
+    async def sessions_created(self, first: date, last: date, granularity: Granularity) -> list[DailyCount]:
+        """Sessions created on the UTC days *first* through *last*, per day, week
+        (from Monday) or month — bucketed by MongoDB ($dateTrunc), so at most one row
+        per bucket leaves the server. Only the window's events are read (by the
+        (meta.event, at) index): the work is proportional to its length."""
+        window = TimeWindow.of_days(first, last)
+        bucket: dict[str, Any] = {"$dateToString": {"format": "%Y-%m-%d", "date": "$at"}}
+        if granularity != "day":
+            trunc: dict[str, Any] = {"date": "$at", "unit": granularity, "timezone": "UTC"}
+            if granularity == "week":
+                trunc["startOfWeek"] = "monday"
+            bucket = {"$dateToString": {"format": "%Y-%m-%d", "date": {"$dateTrunc": trunc}}}
+        pipeline: list[dict] = [
+            {"$match": {"meta.event": ActivityEvent.CREATED.value, "at": window.range()}},
+            {"$group": {"_id": bucket, "count": {"$sum": 1}}},
+            {"$sort": {"_id": 1}},
+        ]
+        return [
+            DailyCount(date=max(d["_id"], first.isoformat()), count=d["count"])
+            async for d in self.activity.aggregate(pipeline)
+        ]
 
-    async def get_admin_stats(self, expiry_days: int = 30) -> AdminStats:
-        # Use naive UTC for pipeline constants — MongoDB stores datetimes as UTC without tzinfo,
-        # and $subtract arithmetic requires both operands to have the same tzinfo status.
-        now = datetime.now(UTC).replace(tzinfo=None)
-        expiry_delta = timedelta(days=expiry_days)
+    async def events_complete(self) -> bool:
+        """Whether the activity events cover every session — not while the backfill of
+        the sessions older than the collection runs (asked of the primary)."""
+        return await ActivityRepository(self._db).backfill_done()
 
+    async def _activity_heatmap(self, window: TimeWindow) -> list[HeatmapCell]:
         pipeline: list[dict] = [
+            {"$match": {"meta.event": ActivityEvent.CREATED.value, "at": window.range()}},
             {
-                "$facet": {
-                    "reaction_breakdown": [
-                        {
-                            "$unwind": {
-                                "path": "$cards",
-                                "preserveNullAndEmptyArrays": False,
-                            }
-                        },
-                        {
-                            "$unwind": {
-                                "path": "$cards.reactions",
-                                "preserveNullAndEmptyArrays": False,
-                            }
-                        },
-                        {
-                            "$group": {
-                                "_id": "$cards.reactions.emoji",
-                                "count": {"$sum": 1},
-                            }
-                        },
-                        {"$sort": {"count": -1}},
-                    ],
-                    "cards_per_column": [
-                        {
-                            "$unwind": {
-                                "path": "$cards",
-                                "preserveNullAndEmptyArrays": False,
-                            }
-                        },
-                        {
-                            "$group": {
-                                "_id": "$cards.column",
-                                "count": {"$sum": 1},
-                            }
-                        },
-                        {"$sort": {"count": -1}},
-                    ],
-                    "activity_heatmap": [
-                        {
-                            "$addFields": {
-                                "dow": {"$dayOfWeek": "$created_at"},
-                                "hour": {"$hour": "$created_at"},
-                            }
-                        },
-                        {
-                            "$group": {
-                                "_id": {"dow": "$dow", "hour": "$hour"},
-                                "count": {"$sum": 1},
-                            }
-                        },
-                        {"$sort": {"_id.dow": 1, "_id.hour": 1}},
-                    ],
-                    "funnel_created": [{"$count": "n"}],
-                    "funnel_has_cards": [
-                        {"$match": {"cards.0": {"$exists": True}}},
-                        {"$count": "n"},
-                    ],
-                    "funnel_has_votes": [
-                        {
-                            "$match": {
-                                "cards": {
-                                    "$elemMatch": {"votes.0": {"$exists": True}}
-                                }
-                            }
-                        },
-                        {"$count": "n"},
-                    ],
-                    "funnel_closed": [
-                        {"$match": {"phase": "closed"}},
-                        {"$count": "n"},
-                    ],
-                    # Sessions expiring within 7 days: created_at in (now-expiry, now-expiry+7d]
-                    "expiry_7": [
-                        {
-                            "$match": {
-                                "phase": {"$ne": "closed"},
-                                "created_at": {
-                                    "$gt": now - expiry_delta,
-                                    "$lte": now - expiry_delta + timedelta(days=7),
-                                },
-                            }
-                        },
-                        {"$count": "n"},
-                    ],
-                    # All non-expired, non-closed sessions (within 30 days of expiry)
-                    "expiry_30": [
-                        {
-                            "$match": {
-                                "phase": {"$ne": "closed"},
-                                "created_at": {"$gt": now - expiry_delta},
-                            }
-                        },
-                        {"$count": "n"},
-                    ],
-                    # Lifetime distribution: bucket by age (now - created_at) in hours
-                    # Uses $subtract (ms diff) / 3600000 — broadly supported vs $dateDiff (Mongo 5.0+)
-                    "lifetime_dist": [
-                        {
-                            "$addFields": {
-                                "age_hours": {
-                                    "$divide": [
-                                        {"$subtract": [now, "$created_at"]},
-                                        3_600_000,
-                                    ]
-                                }
-                            }
-                        },
-                        {
-                            "$group": {
-                                "_id": {
-                                    "$switch": {
-                                        "branches": [
-                                            {
-                                                "case": {"$lt": ["$age_hours", 24]},
-                                                "then": "<1 day",
-                                            },
-                                            {
-                                                "case": {"$lt": ["$age_hours", 168]},
-                                                "then": "1–7 days",
-                                            },
-                                            {
-                                                "case": {"$lt": ["$age_hours", 720]},
-                                                "then": "7–30 days",
-                                            },
-                                        ],
-                                        "default": "30+ days",
-                                    }
-                                },
-                                "count": {"$sum": 1},
-                            }
-                        },
-                    ],
-                    # Avg duration (created_at → last_accessed_at) by open/closed
-                    "avg_duration_open": [
-                        {"$match": {"phase": {"$ne": "closed"}}},
-                        {
-                            "$addFields": {
-                                "h": {
-                                    "$divide": [
-                                        {"$subtract": ["$last_accessed_at", "$created_at"]},
-                                        3_600_000,
-                                    ]
-                                }
-                            }
-                        },
-                        {"$group": {"_id": None, "avg": {"$avg": "$h"}}},
-                    ],
-                    "avg_duration_closed": [
-                        {"$match": {"phase": "closed"}},
-                        {
-                            "$addFields": {
-                                "h": {
-                                    "$divide": [
-                                        {"$subtract": ["$last_accessed_at", "$created_at"]},
-                                        3_600_000,
-                                    ]
-                                }
-                            }
-                        },
-                        {"$group": {"_id": None, "avg": {"$avg": "$h"}}},
-                    ],
-                    # Avg time to close: created_at → updated_at (closed sessions only)
-                    "time_to_close": [
-                        {"$match": {"phase": "closed"}},
-                        {
-                            "$addFields": {
-                                "h": {
-                                    "$divide": [
-                                        {"$subtract": ["$updated_at", "$created_at"]},
-                                        3_600_000,
-                                    ]
-                                }
-                            }
-                        },
-                        {"$group": {"_id": None, "avg": {"$avg": "$h"}}},
-                    ],
+                "$group": {
+                    "_id": {"dow": {"$dayOfWeek": "$at"}, "hour": {"$hour": "$at"}},
+                    "count": {"$sum": 1},
                 }
-            }
+            },
+            {"$sort": {"_id.dow": 1, "_id.hour": 1}},
+        ]
+        return [
+            HeatmapCell(day_of_week=d["_id"]["dow"], hour_bucket=d["_id"]["hour"], count=d["count"])
+            for d in await self._aggregate(self.activity, pipeline)
         ]
 
-        result = await self.collection.aggregate(pipeline).to_list(length=1)
-        if not result:
-            return _empty_admin_stats()
+    async def _engagement_funnel(self, window: TimeWindow) -> FunnelStats:
+        """How far the sessions created in *window* got (as far as its events tell) —
+        each counted once per step."""
+        pipeline: list[dict] = [
+            # Every event type, so the range on at is read from the (meta.event, at) index
+            {"$match": {"meta.event": {"$in": list(ActivityEvent)}, "at": window.range()}},
+            {"$group": {"_id": "$meta.session_id", "events": {"$addToSet": "$meta.event"}}},
+            {"$match": {"events": ActivityEvent.CREATED.value}},
+            {"$unwind": "$events"},
+            {"$group": {"_id": "$events", "count": {"$sum": 1}}},
+        ]
+        steps = {d["_id"]: d["count"] for d in await self._aggregate(self.activity, pipeline)}
+        return FunnelStats(
+            created=steps.get(ActivityEvent.CREATED, 0),
+            has_cards=steps.get(ActivityEvent.FIRST_CARD, 0),
+            has_votes=steps.get(ActivityEvent.FIRST_VOTE, 0),
+            closed=steps.get(ActivityEvent.CLOSED, 0),
+        )
 
-        facets = result[0]
+    # ── Admin stats ──────────────────────────────────────────────────────────
+
+    def admin_facets(
+        self, expiry_days: int = 30, window: TimeWindow | None = None
+    ) -> dict[str, Callable[[], Awaitable[Any]]]:
+        """The independent queries behind the admin stats, by ``AdminStats`` field.
+
+        With a *window*, the session facets only cover the sessions created in it
+        (a range on the created_at index) and the charts its events; without one,
+        every session and the last ACTIVITY_WINDOW_DAYS of events. The expiry
+        countdown and feedback are always current, the history always all-time.
+        """
+        created = {"created_at": window.range()} if window else {}
+        activity = window or TimeWindow(datetime.now(UTC) - timedelta(days=ACTIVITY_WINDOW_DAYS))
+        return {
+            "reaction_breakdown": partial(self._reaction_breakdown, created),
+            "cards_per_column": partial(self._cards_per_column, created),
+            "activity_heatmap": partial(self._activity_heatmap, activity),
+            "engagement_funnel": partial(self._engagement_funnel, activity),
+            "session_lifetime": partial(self._session_lifetime, expiry_days, created),
+            "feedback": self._get_feedback_stats,
+            "history": self._history,
+        }
+
+    async def get_admin_stats(
+        self,
+        expiry_days: int = 30,
+        run: FacetRunner | None = None,
+        window: TimeWindow | None = None,
+    ) -> AdminStats:
+        """Every admin facet, queried concurrently — the page takes as long as the
+        slowest one. A facet that fails, or runs past ADMIN_FACET_TIMEOUT_MS, comes
+        back empty and is named in ``errors``. *run* (facet name, query) runs each
+        query, so the caller can cache facets."""
+        facets = self.admin_facets(expiry_days, window)
+        results = await asyncio.gather(
+            *(run(name, load) if run else load() for name, load in facets.items()),
+            return_exceptions=True,
+        )
+        empty = _empty_admin_stats()
+        values: dict[str, Any] = {}
+        errors: dict[str, str] = {}
+        for name, result in zip(facets, results, strict=True):
+            if isinstance(result, Exception):
+                logger.warning("Admin stats: facet %s failed: %r", name, result)
+                values[name] = getattr(empty, name)
+                errors[name] = "timed out" if isinstance(result, ExecutionTimeout) else str(result)
+            elif isinstance(result, BaseException):  # cancelled
+                raise result
+            else:
+                values[name] = result
+        return AdminStats(**values, errors=errors)
+
+    async def _aggregate(self, collection: AsyncIOMotorCollection, pipeline: list[dict]) -> list[dict]:
+        return await collection.aggregate(pipeline, maxTimeMS=settings.admin_facet_timeout_ms).to_list(
+            length=None
+        )
 
-        reaction_breakdown = [
-            ReactionCount(emoji=d["_id"], count=d["count"])
-            for d in facets["reaction_breakdown"]
-        ]
-        cards_per_column = [
-            ColumnCount(column=d["_id"], count=d["count"])
-            for d in facets["cards_per_column"]
+    async def _reaction_breakdown(self, match: dict[str, Any]) -> list[ReactionCount]:
+        pipeline: list[dict] = [
+            {"$match": match},
+            *_REACTION_ROWS,
+            {"$group": {"_id": "$rows.emoji", "count": {"$sum": "$rows.n"}}},
+            {"$sort": {"count": -1}},
         ]
-        activity_heatmap = [
-            HeatmapCell(
-                day_of_week=d["_id"]["dow"],
-                hour_bucket=d["_id"]["hour"],
-                count=d["count"],
-            )
-            for d in facets["activity_heatmap"]
+        return [
+            ReactionCount(emoji=d["_id"], count=d["count"])
+            for d in await self._aggregate(self.collection, pipeline)
         ]
-        funnel = FunnelStats(
-            created=facets["funnel_created"][0]["n"] if facets["funnel_created"] else 0,
-            has_cards=(
-                facets["funnel_has_cards"][0]["n"] if facets["funnel_has_cards"] else 0
-            ),
-            has_votes=(
-                facets["funnel_has_votes"][0]["n"] if facets["funnel_has_votes"] else 0
-            ),
-            closed=facets["funnel_closed"][0]["n"] if facets["funnel_closed"] else 0,
-        )
 
-        # Lifetime distribution — always emit 4 ordered buckets
-        dist_map = {d["_id"]: d["count"] for d in facets["lifetime_dist"]}
-        lifetime_distribution = [
-            LifetimeBucket(label=label, count=dist_map.get(label, 0))
-            for label in BUCKET_ORDER
+    async def _cards_per_column(self, match: dict[str, Any]) -> list[ColumnCount]:
+        pipeline: list[dict] = [
+            {"$match": match},
+            {"$unwind": {"path": "$cards", "preserveNullAndEmptyArrays": False}},
+            {"$group": {"_id": "$cards.column", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}},
+        ]
+        return [
+            ColumnCount(column=d["_id"], count=d["count"])
+            for d in await self._aggregate(self.collection, pipeline)
         ]
 
-        # Avg duration by phase
-        open_raw = facets["avg_duration_open"][0]["avg"] if facets["avg_duration_open"] else None
-        closed_raw = facets["avg_duration_closed"][0]["avg"] if facets["avg_duration_closed"] else None
-        avg_duration = AvgDurationByPhase(
-            open_avg_hours=round(open_raw, 2) if open_raw is not None else None,
-            closed_avg_hours=round(closed_raw, 2) if closed_raw is not None else None,
+    async def _session_lifetime(self, expiry_days: int, match: dict[str, Any]) -> SessionLifetimeStats:
+        # Aware UTC, like the dates the tz-aware client decodes — $subtract arithmetic
+        # (in mongomock) requires both operands to have the same tzinfo status.
+        now = datetime.now(UTC)
+        expiry_start = now - timedelta(days=expiry_days)
+        open_sessions = {"phase": {"$ne": SessionPhase.CLOSED.value}}
+        closed_sessions = {"phase": SessionPhase.CLOSED.value}
+        # Sessions created in the window, if any
+        open_in_window, closed_in_window = {**open_sessions, **match}, {**closed_sessions, **match}
+        # Each query filters on phase / created_at up front, so it can use the
+        # registered indexes (a $facet branch cannot)
+        expiring_7, expiring_30, distribution, open_avg, closed_avg, time_to_close = await asyncio.gather(
+            # Sessions expiring within 7 days: created_at in (now-expiry, now-expiry+7d]
+            self._count(
+                {
+                    **open_sessions,
+                    "created_at": {"$gt": expiry_start, "$lte": expiry_start + timedelta(days=7)},
+                }
+            ),
+            # All non-expired, non-closed sessions (within 30 days of expiry)
+            self._count({**open_sessions, "created_at": {"$gt": expiry_start}}),
+            self._lifetime_distribution(now, match),
+            # Avg duration (created_at → last_accessed_at) by open/closed
+            self._avg_hours(open_in_window, "$last_accessed_at"),
+            self._avg_hours(closed_in_window, "$last_accessed_at"),
+            # Avg time to close: created_at → updated_at (closed sessions only)
+            self._avg_hours(closed_in_window, "$updated_at"),
         )
-
-        # Avg time to close
-        ttc_raw = facets["time_to_close"][0]["avg"] if facets["time_to_close"] else None
-        avg_time_to_close = round(ttc_raw, 2) if ttc_raw is not None else None
-
-        session_lifetime = SessionLifetimeStats(
+        return SessionLifetimeStats(
             expiry_countdown=ExpiryCountdown(
-                expiring_within_7_days=(
-                    facets["expiry_7"][0]["n"] if facets["expiry_7"] else 0
-                ),
-                expiring_within_30_days=(
-                    facets["expiry_30"][0]["n"] if facets["expiry_30"] else 0
-                ),
+                expiring_within_7_days=expiring_7,
+                expiring_within_30_days=expiring_30,
             ),
-            lifetime_distribution=lifetime_distribution,
-            avg_duration=avg_duration,
-            avg_time_to_close_hours=avg_time_to_close,
+            lifetime_distribution=distribution,
+            avg_duration=AvgDurationByPhase(open_avg_hours=open_avg, closed_avg_hours=closed_avg),
+            avg_time_to_close_hours=time_to_close,
         )
 
-        feedback = await self._get_feedback_stats()
+    async def _count(self, match: dict[str, Any]) -> int:
+        return await self.collection.count_documents(match, maxTimeMS=settings.admin_facet_timeout_ms)
 
-        return AdminStats(
-            reaction_breakdown=reaction_breakdown,
-            cards_per_column=cards_per_column,
-            activity_heatmap=activity_heatmap,
-            engagement_funnel=funnel,
-            session_lifetime=session_lifetime,
-            feedback=feedback,
-        )
+    async def _lifetime_distribution(self, now: datetime, match: dict[str, Any]) -> list[LifetimeBucket]:
+        """Sessions by age (now - created_at): one range count on the created_at
+        index per bucket, within the window's range if *match* has one."""
+        window = match.get("created_at", {})
+        day, week, month = (now - timedelta(hours=hours) for hours in (24, 168, 720))
+        bounds = [{"$gt": day}, {"$gt": week, "$lte": day}, {"$gt": month, "$lte": week}, {"$lte": month}]
+        counts = await asyncio.gather(*(self._count({"created_at": {**window, **b}}) for b in bounds))
+        return [LifetimeBucket(label=label, count=n) for label, n in zip(BUCKET_ORDER, counts, strict=True)]
 
+    async def _avg_hours(self, match: dict[str, Any], until: str) -> float | None:
+        """Mean hours from created_at to the *until* field over the matching sessions."""
+        pipeline: list[dict] = [
+            {"$match": match},
+            {"$addFields": {"h": {"$divide": [{"$subtract": [until, "$created_at"]}, 3_600_000]}}},
+            {"$group": {"_id": None, "avg": {"$avg": "$h"}}},
+        ]
+        result = await self._aggregate(self.collection, pipeline)
+        avg = result[0]["avg"] if result else None
+        return round(avg, 2) if avg is not None else None
 
-    async def _get_feedback_stats(self) -> FeedbackStats:
-        feedback_col = self.collection.database["feedback"]
+    async def _history(self) -> HistoryStats | None:
+        if self.snapshot is None:
+            return None
+        return await asyncio.to_thread(self.snapshot.read, _history_stats)
 
-        pipeline: list[dict] = [
-            {
-                "$facet": {
-                    "total": [{"$count": "n"}],
-                    "avg": [{"$group": {"_id": None, "avg": {"$avg": "$rating"}}}],
-                    "by_rating": [
-                        {"$group": {"_id": "$rating", "count": {"$sum": 1}}},
-                        {"$sort": {"_id": 1}},
-                    ],
-                    "recent": [
-                        {"$sort": {"created_at": -1}},
-                        {"$limit": 5},
-                    ],
-                }
-            }
+    async def _get_feedback_stats(self) -> FeedbackStats:
+        # Ratings grouped off the rating index (covered — no document is fetched),
+        # the latest entries off the created_at one; total and mean follow from the
+        # per-rating counts
+        ratings: list[dict] = [
+            {"$sort": {"rating": 1}},
+            {"$project": {"_id": 0, "rating": 1}},
+            {"$group": {"_id": "$rating", "count": {"$sum": 1}}},
         ]
-        result = await feedback_col.aggregate(pipeline).to_list(length=1)
-        if not result:
-            return FeedbackStats(total=0, avg_rating=None, by_rating=[], recent=[])
-
-        facets = result[0]
-        total = facets["total"][0]["n"] if facets["total"] else 0
-        avg_raw = facets["avg"][0]["avg"] if facets["avg"] else None
-        avg_rating = round(float(avg_raw), 2) if avg_raw is not None else None
+        counts, latest = await asyncio.gather(
+            self._aggregate(self.feedback, ratings),
+            self.feedback.find(
+                {}, sort=[("created_at", -1)], limit=5, max_time_ms=settings.admin_facet_timeout_ms
+            ).to_list(length=5),
+        )
         by_rating = [
-            RatingCount(rating=d["_id"], count=d["count"]) for d in facets["by_rating"]
+            RatingCount(rating=d["_id"], count=d["count"]) for d in sorted(counts, key=lambda d: d["_id"])
         ]
+        total = sum(r.count for r in by_rating)
+        avg_rating = round(sum(r.rating * r.count for r in by_rating) / total, 2) if total else None
         recent = []
-        for d in facets["recent"]:
+        for d in latest:
             created = d.get("created_at", "")
             created_str = created.isoformat() if hasattr(created, "isoformat") else str(created)
             recent.append(
@@ -551,17 +800,66 @@ class StatsRepository:
 
         return FeedbackStats(total=total, avg_rating=avg_rating, by_rating=by_rating, recent=recent)
 
-
-def _empty_public_stats() -> PublicStats:
-    return PublicStats(
-        total_sessions=0,
-        active_sessions=0,
-        sessions_by_phase=[],
-        sessions_per_day=[],
-        total_cards=0,
-        avg_cards_per_session=0.0,
-        total_votes=0,
-        total_reactions=0,
+    # ── Export ───────────────────────────────────────────────────────────────
+
+    async def export_batches(self, batch_size: int) -> AsyncIterator[list[dict[str, Any]]]:
+        """One row per session (``EXPORT_FIELDS``), oldest first, *batch_size* rows
+        at a time — each batch one cursor round trip, so memory stays flat however
+        many sessions there are. The sort may spill to disk: until the
+        background build of the ``created_at`` index finishes it is an in-memory
+        sort, and a large table would hit MongoDB's 100 MB sort limit."""
+        batch = []
+        cursor = self.collection.aggregate(_EXPORT_PIPELINE, batchSize=batch_size, allowDiskUse=True)
+        async for doc in cursor:
+            batch.append(_export_row(doc))
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _export_row(doc: dict[str, Any]) -> dict[str, Any]:
+    created_at, last_accessed_at = doc.get("created_at"), doc.get("last_accessed_at")
+    lifetime_hours = None
+    if created_at is not None and last_accessed_at is not None:
+        lifetime_hours = round((last_accessed_at - created_at).total_seconds() / 3600, 2)
+    return {
+        "created_at": _iso(created_at),
+        "last_accessed_at": _iso(last_accessed_at),
+        "phase": doc.get("phase"),
+        "cards": len(doc["votes"]),
+        "votes": sum(doc["votes"]),
+        "reactions": sum(n if isinstance(n, int) else sum(n) for n in doc["reactions"]),
+        "lifetime_hours": lifetime_hours,
+    }
+
+
+def _iso(dt: datetime | None) -> str | None:
+    """ISO 8601 in UTC with ``Z``, as the API writes dates — naive values are UTC."""
+    if dt is None:
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(UTC).replace(tzinfo=None)
+    return dt.isoformat() + "Z"
+
+
+def _history_stats(columns: SnapshotColumns) -> HistoryStats:
+    """Reduce the snapshot's columns — each a pass over one memory-mapped file, in C
+    (Counter's counting loop, filter, the median's sort), none through Python bytecode."""
+    per_column = Counter(columns["card_column"])
+    by_votes = Counter(columns["card_votes"])
+    hours = list(filter(math.isfinite, columns["hours_to_close"]))  # NaN: not closed
+    return HistoryStats(
+        taken_at=_iso(columns.taken_at) or "",
+        sessions=len(columns["created_at"]),
+        cards=len(columns["card_session"]),
+        cards_per_column=[
+            ColumnCount(column=columns.column_names[code], count=n) for code, n in per_column.most_common()
+        ],
+        vote_distribution=[VoteBucket(votes=votes, cards=n) for votes, n in sorted(by_votes.items())],
+        avg_time_to_close_hours=round(math.fsum(hours) / len(hours), 2) if hours else None,
+        median_time_to_close_hours=round(statistics.median(hours), 2) if hours else None,
     )
 
 
@@ -1,11 +1,25 @@
 """Shared helpers used across multiple routers."""
 
-from ..models.session import Session
+from datetime import datetime
 
+import redis.asyncio as aioredis
+from fastapi import HTTPException
 
-def _public(session: Session) -> dict:
-    """Strip internal fields before sending to clients."""
-    d = session.model_dump()
-    d.pop("facilitator_token", None)
-    d.pop("last_accessed_at", None)
-    return d
+from ..snapshots import epoch_millis
+
+
+def _etag(version: int, updated_at: datetime) -> str:
+    """Strong ETag of a session's public snapshot — it changes with every write."""
+    return f'"{version}-{epoch_millis(updated_at)}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match comparison (weak, as RFC 9110 prescribes for it)."""
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+async def _check_admin_token(redis: aioredis.Redis, token: str) -> None:
+    if not token or not await redis.exists(f"admin_token:{token}"):
+        raise HTTPException(status_code=401, detail="Invalid or expired admin token")
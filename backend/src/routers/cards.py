@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, Header, HTTPException, Query
 
 from ..dependencies import get_repo
+from ..encoding import ORJSONRoute
 from ..models.requests import (
     AddCardRequest,
     AddReactionRequest,
@@ -8,22 +9,12 @@ from ..models.requests import (
     PublishAllRequest,
     UpdateCardTextRequest,
 )
-from ..models.session import REACTION_EMOJI, Card, Reaction, Session, Vote
+from ..models.session import REACTION_EMOJI, Card
 from ..repositories.session_repo import SessionRepository
 from ..services.sse_manager import sse_manager
-from ._shared import _public
+from ..snapshots import public_snapshot
 
-router = APIRouter(prefix="/api/v1/sessions")
-
-
-def _count_participant_votes(session: Session, participant_name: str) -> int:
-    return len(
-        {
-            c.group_id or c.id
-            for c in session.cards
-            if any(v.participant_name == participant_name for v in c.votes)
-        }
-    )
+router = APIRouter(prefix="/api/v1/sessions", route_class=ORJSONRoute)
 
 
 @router.post("/{session_id}/cards", status_code=201)
@@ -39,10 +30,10 @@ async def add_card(
         raise HTTPException(status_code=409, detail="Cards cannot be added in the closed phase")
 
     card = Card(column=body.column, text=body.text, author_name=body.author_name)
-    session.cards.append(card)
+    session.add_card(card)
     session = await repo.update(session)
-    await sse_manager.broadcast(session_id, _public(session))
-    return card.model_dump()
+    await sse_manager.broadcast(session_id, public_snapshot(session))
+    return card.to_dict()
 
 
 @router.delete("/{session_id}/cards/{card_id}", status_code=204)
@@ -59,15 +50,15 @@ async def delete_card(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    card = next((c for c in session.cards if c.id == card_id), None)
+    card = session.card(card_id)
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
     if card.author_name != x_participant_name:
         raise HTTPException(status_code=403, detail="Only the author can delete this card")
 
-    session.cards = [c for c in session.cards if c.id != card_id]
+    session.remove_cards([card])
     session = await repo.update(session)
-    await sse_manager.broadcast(session_id, _public(session))
+    await sse_manager.broadcast(session_id, public_snapshot(session))
 
 
 @router.post("/{session_id}/cards/{card_id}/votes")
@@ -84,7 +75,7 @@ async def add_vote(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    card = next((c for c in session.cards if c.id == card_id), None)
+    card = session.card(card_id)
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
 
@@ -92,19 +83,18 @@ async def add_vote(
         raise HTTPException(status_code=409, detail="Voting is only allowed during the discussion phase")
 
     # Idempotent — re-vote is a no-op even at the limit
-    if any(v.participant_name == x_participant_name for v in card.votes):
-        return card.model_dump()
+    if x_participant_name in card.votes:
+        return card.to_dict()
 
     if session.max_votes_per_participant is not None:
-        used = _count_participant_votes(session, x_participant_name)
-        if used >= session.max_votes_per_participant:
+        if session.votes_used(x_participant_name) >= session.max_votes_per_participant:
             raise HTTPException(status_code=409, detail="Vote limit reached")
 
-    card.votes.append(Vote(participant_name=x_participant_name))
+    session.add_vote(card, x_participant_name)
     session = await repo.update(session)
-    await sse_manager.broadcast(session_id, _public(session))
+    await sse_manager.broadcast(session_id, public_snapshot(session))
 
-    return card.model_dump()
+    return card.to_dict()
 
 
 @router.delete("/{session_id}/cards/{card_id}/votes")
@@ -121,15 +111,15 @@ async def remove_vote(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    card = next((c for c in session.cards if c.id == card_id), None)
+    card = session.card(card_id)
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
 
-    card.votes = [v for v in card.votes if v.participant_name != x_participant_name]
+    session.remove_vote(card, x_participant_name)
     session = await repo.update(session)
-    await sse_manager.broadcast(session_id, _public(session))
+    await sse_manager.broadcast(session_id, public_snapshot(session))
 
-    return card.model_dump()
+    return card.to_dict()
 
 
 @router.post("/{session_id}/cards/publish-all")
@@ -156,9 +146,9 @@ async def publish_all_cards(
 
     if published:
         session = await repo.update(session)
-        await sse_manager.broadcast(session_id, _public(session))
+        await sse_manager.broadcast(session_id, public_snapshot(session))
 
-    return [c.model_dump() for c in published]
+    return [c.to_dict() for c in published]
 
 
 @router.post("/{session_id}/cards/{card_id}/publish")
@@ -177,7 +167,7 @@ async def publish_card(
     if session.phase != "discussing":
         raise HTTPException(status_code=409, detail="Cards can only be published during the discussion phase")
 
-    card = next((c for c in session.cards if c.id == card_id), None)
+    card = session.card(card_id)
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
     if card.author_name != x_participant_name:
@@ -185,9 +175,9 @@ async def publish_card(
 
     card.published = True
     session = await repo.update(session)
-    await sse_manager.broadcast(session_id, _public(session))
+    await sse_manager.broadcast(session_id, public_snapshot(session))
 
-    return card.model_dump()
+    return card.to_dict()
 
 
 @router.post("/{session_id}/cards/{card_id}/reactions")
@@ -211,19 +201,18 @@ async def add_reaction(
             status_code=409, detail="Reactions are only allowed during discussing or closed phase"
         )
 
-    card = next((c for c in session.cards if c.id == card_id), None)
+    card = session.card(card_id)
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
     if not card.published:
         raise HTTPException(status_code=409, detail="Card must be published to react")
 
     # Idempotent — ignore duplicate reactions
-    if not any(r.emoji == body.emoji and r.participant_name == x_participant_name for r in card.reactions):
-        card.reactions.append(Reaction(emoji=body.emoji, participant_name=x_participant_name))
+    if card.add_reaction(body.emoji, x_participant_name):
         session = await repo.update(session)
-        await sse_manager.broadcast(session_id, _public(session))
+        await sse_manager.broadcast(session_id, public_snapshot(session))
 
-    return card.model_dump()
+    return card.to_dict()
 
 
 @router.delete("/{session_id}/cards/{card_id}/reactions", status_code=204)
@@ -241,15 +230,13 @@ async def remove_reaction(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    card = next((c for c in session.cards if c.id == card_id), None)
+    card = session.card(card_id)
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
 
-    card.reactions = [
-        r for r in card.reactions if not (r.emoji == emoji and r.participant_name == x_participant_name)
-    ]
+    card.remove_reaction(emoji, x_participant_name)
     session = await repo.update(session)
-    await sse_manager.broadcast(session_id, _public(session))
+    await sse_manager.broadcast(session_id, public_snapshot(session))
 
 
 @router.patch("/{session_id}/cards/{card_id}/assignee")
@@ -267,7 +254,7 @@ async def assign_card(
     if session.phase == "collecting":
         raise HTTPException(status_code=409, detail="Cards cannot be assigned during collecting phase")
 
-    card = next((c for c in session.cards if c.id == card_id), None)
+    card = session.card(card_id)
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
     if not card.published:
@@ -280,9 +267,9 @@ async def assign_card(
 
     card.assignee = body.assignee
     session = await repo.update(session)
-    await sse_manager.broadcast(session_id, _public(session))
+    await sse_manager.broadcast(session_id, public_snapshot(session))
 
-    return card.model_dump()
+    return card.to_dict()
 
 
 @router.patch("/{session_id}/cards/{card_id}/text")
@@ -302,7 +289,7 @@ async def update_card_text(
     if session.phase == "closed":
         raise HTTPException(status_code=409, detail="Session is closed")
 
-    card = next((c for c in session.cards if c.id == card_id), None)
+    card = session.card(card_id)
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
     if card.author_name != x_participant_name:
@@ -310,6 +297,6 @@ async def update_card_text(
 
     card.text = body.text
     session = await repo.update(session)
-    await sse_manager.broadcast(session_id, _public(session))
+    await sse_manager.broadcast(session_id, public_snapshot(session))
 
-    return card.model_dump()
+    return card.to_dict()
@@ -7,10 +7,11 @@ from fastapi import APIRouter, Depends, Header, HTTPException
 from pydantic import BaseModel, Field
 
 from ..dependencies import get_feedback_repo, get_redis
+from ..encoding import ORJSONResponse
 from ..models.feedback import Feedback
 from ..repositories.feedback_repo import FeedbackRepository
 
-router = APIRouter(prefix="/api/v1/feedback", tags=["feedback"])
+router = APIRouter(prefix="/api/v1/feedback", tags=["feedback"], default_response_class=ORJSONResponse)
 
 
 class SubmitFeedbackRequest(BaseModel):
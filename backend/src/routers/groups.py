@@ -3,12 +3,13 @@ from uuid import uuid4
 from fastapi import APIRouter, Depends, Header, HTTPException
 
 from ..dependencies import get_repo
+from ..encoding import ORJSONRoute
 from ..models.requests import GroupCardRequest
 from ..repositories.session_repo import SessionRepository
 from ..services.sse_manager import sse_manager
-from ._shared import _public
+from ..snapshots import public_snapshot
 
-router = APIRouter(prefix="/api/v1/sessions")
+router = APIRouter(prefix="/api/v1/sessions", route_class=ORJSONRoute)
 
 
 @router.post("/{session_id}/cards/{card_id}/group")
@@ -28,11 +29,11 @@ async def group_card(
     if session.phase != "discussing":
         raise HTTPException(status_code=409, detail="Grouping is only allowed during the discussing phase")
 
-    card = next((c for c in session.cards if c.id == card_id), None)
+    card = session.card(card_id)
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
 
-    target = next((c for c in session.cards if c.id == body.target_card_id), None)
+    target = session.card(body.target_card_id)
     if not target:
         raise HTTPException(status_code=404, detail="Target card not found")
 
@@ -43,23 +44,15 @@ async def group_card(
     if card.column != target.column:
         raise HTTPException(status_code=409, detail="Cards must be in the same column to group")
 
-    # Determine the group UUID: reuse target's existing group or create a new one
-    new_group_id = target.group_id if target.group_id is not None else str(uuid4())
+    # Reuse target's existing group or create a new one; moving the card out of
+    # its old group dissolves that group if a single card is left
     if target.group_id is None:
-        target.group_id = new_group_id
-
-    # Remove card from its old group, cleaning up any resulting singleton
-    old_group_id = card.group_id
-    card.group_id = new_group_id
-
-    if old_group_id and old_group_id != new_group_id:
-        remaining = [c for c in session.cards if c.group_id == old_group_id]
-        if len(remaining) == 1:
-            remaining[0].group_id = None
+        session.set_group(target, str(uuid4()))
+    session.set_group(card, target.group_id)
 
     session = await repo.update(session)
-    await sse_manager.broadcast(session_id, _public(session))
-    return _public(session)
+    await sse_manager.broadcast(session_id, public_snapshot(session))
+    return public_snapshot(session)
 
 
 @router.delete("/{session_id}/cards/{card_id}/group", status_code=204)
@@ -78,17 +71,10 @@ async def ungroup_card(
     if session.phase != "discussing":
         raise HTTPException(status_code=409, detail="Ungrouping is only allowed during the discussing phase")
 
-    card = next((c for c in session.cards if c.id == card_id), None)
+    card = session.card(card_id)
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
 
-    old_group_id = card.group_id
-    card.group_id = None
-
-    if old_group_id:
-        remaining = [c for c in session.cards if c.group_id == old_group_id]
-        if len(remaining) == 1:
-            remaining[0].group_id = None
-
+    session.set_group(card, None)
     session = await repo.update(session)
-    await sse_manager.broadcast(session_id, _public(session))
+    await sse_manager.broadcast(session_id, public_snapshot(session))
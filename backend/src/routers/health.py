@@ -1,8 +1,35 @@
-from fastapi import APIRouter
+from typing import Annotated
 
-router = APIRouter()
+import redis.asyncio as aioredis
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from .. import compression
+from ..dependencies import get_redis
+from ..encoding import ORJSONResponse
+from ..services.sse_manager import sse_manager
+from ._shared import _check_admin_token
+
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 @router.get("/health")
 async def health() -> dict:
     return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready() -> dict:
+    """Readiness probe — fails while SSE streams are draining so no new traffic arrives."""
+    if sse_manager.draining:
+        raise HTTPException(status_code=503, detail="Draining")
+    return {"status": "ready"}
+
+
+@router.get("/metrics/compression")
+async def compression_metrics(
+    redis: Annotated[aioredis.Redis, Depends(get_redis)],
+    x_admin_token: Annotated[str, Header()] = "",
+) -> dict:
+    """Bytes before and after compression per encoding, since this process started (admin only)."""
+    await _check_admin_token(redis, x_admin_token)
+    return {coding: counted.as_dict() for coding, counted in compression.stats.items()}
@@ -1,13 +1,14 @@
 from fastapi import APIRouter, Depends, Header, HTTPException
 
 from ..dependencies import get_repo
+from ..encoding import ORJSONRoute
 from ..models.requests import AddNoteRequest, UpdateNoteRequest
 from ..models.session import Note
 from ..repositories.session_repo import SessionRepository
 from ..services.sse_manager import sse_manager
-from ._shared import _public
+from ..snapshots import public_snapshot
 
-router = APIRouter(prefix="/api/v1/sessions")
+router = APIRouter(prefix="/api/v1/sessions", route_class=ORJSONRoute)
 
 
 @router.post("/{session_id}/notes", status_code=201)
@@ -25,10 +26,10 @@ async def add_note(
         raise HTTPException(status_code=404, detail="Session not found")
 
     note = Note(text=body.text, author_name=body.author_name)
-    session.notes.append(note)
+    session.add_note(note)
     session = await repo.update(session)
-    await sse_manager.broadcast(session_id, _public(session))
-    return note.model_dump()
+    await sse_manager.broadcast(session_id, public_snapshot(session))
+    return note.to_dict()
 
 
 @router.patch("/{session_id}/notes/{note_id}")
@@ -46,16 +47,15 @@ async def update_note(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    note = next((n for n in session.notes if n.id == note_id), None)
+    note = session.note(note_id)
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
 
     note.text = body.text
     session = await repo.update(session)
-    await sse_manager.broadcast(session_id, _public(session))
+    await sse_manager.broadcast(session_id, public_snapshot(session))
 
-    updated_note = next(n for n in session.notes if n.id == note_id)
-    return updated_note.model_dump()
+    return note.to_dict()
 
 
 @router.delete("/{session_id}/notes/{note_id}", status_code=204)
@@ -72,10 +72,10 @@ async def delete_note(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    note = next((n for n in session.notes if n.id == note_id), None)
+    note = session.note(note_id)
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
 
-    session.notes = [n for n in session.notes if n.id != note_id]
+    session.remove_note(note)
     session = await repo.update(session)
-    await sse_manager.broadcast(session_id, _public(session))
+    await sse_manager.broadcast(session_id, public_snapshot(session))
@@ -2,10 +2,12 @@ from collections.abc import AsyncGenerator
 from datetime import UTC, datetime, timedelta
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from fastapi.responses import StreamingResponse
 
-from ..dependencies import get_repo
+from ..config import settings
+from ..dependencies import get_repo, get_uniques
+from ..encoding import ORJSONResponse, ORJSONRoute
 from ..models.requests import (
     AddColumnRequest,
     CreateSessionRequest,
@@ -16,12 +18,14 @@ from ..models.requests import (
     SetTimerDurationRequest,
     UpdateSessionRequest,
 )
-from ..models.session import Participant, Session, SessionPhase, TimerState
+from ..models.session import DEFAULT_COLUMNS, Participant, Session, SessionPhase, TimerState
 from ..repositories.session_repo import SessionRepository
+from ..repositories.stats_repo import UniqueParticipants
 from ..services.sse_manager import sse_manager
-from ._shared import _public
+from ..snapshots import cached_public_snapshot, public_snapshot, public_snapshot_chunks
+from ._shared import _etag, _etag_matches
 
-router = APIRouter(prefix="/api/v1/sessions")
+router = APIRouter(prefix="/api/v1/sessions", route_class=ORJSONRoute)
 
 
 def _check_facilitator_auth(
@@ -38,10 +42,35 @@ def _check_facilitator_auth(
     raise HTTPException(status_code=403, detail="Facilitator token required")
 
 
+async def _join(
+    session: Session, participant_name: str, repo: SessionRepository, uniques: UniqueParticipants
+) -> Session:
+    """Add the participant if not yet present, broadcasting only when the board changed.
+
+    Marks the session accessed with exactly one write: the join itself, or a touch.
+    """
+    await uniques.add(session.id, participant_name)  # active today, joined before or not
+    if any(p.name == participant_name for p in session.participants):
+        await repo.touch(session.id)
+        return session
+    joined = await repo.add_participant(session.id, Participant(name=participant_name))
+    if joined is None:  # joined concurrently — that request broadcast it
+        return await repo.get_and_touch(session.id) or session
+    await sse_manager.broadcast(session.id, public_snapshot(joined))
+    return joined
+
+
+def _revalidate(etag: str) -> dict[str, str]:
+    """Validator headers for a session snapshot. no-cache: browsers keep the board
+    but revalidate it (If-None-Match) on every fetch."""
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
 @router.post("", status_code=201)
 async def create_session(
     body: CreateSessionRequest,
     repo: SessionRepository = Depends(get_repo),
+    uniques: UniqueParticipants = Depends(get_uniques),
 ) -> dict:
     session = Session(
         id=str(uuid4()),
@@ -49,25 +78,49 @@ async def create_session(
         reactions_enabled=body.reactions_enabled,
         open_facilitator=body.open_facilitator,
         max_votes_per_participant=body.max_votes_per_participant,
-        columns=body.columns or Session.model_fields["columns"].default,
+        columns=body.columns or list(DEFAULT_COLUMNS),
     )
     # Seed the creator as first participant
     session.participants.append(Participant(name=body.participant_name))
     session = await repo.create(session)
+    await uniques.add(session.id, body.participant_name)
     # Return full dict including facilitator_token (only time it's exposed)
-    return session.model_dump()
+    created = session.to_dict()
+    del created["version"]
+    return created
 
 
-@router.get("/{session_id}")
+@router.get(
+    "/{session_id}",
+    response_model=dict,
+    responses={304: {"description": "Not modified since the ETag sent"}},
+)
 async def get_session(
     session_id: str,
+    if_none_match: str | None = Header(default=None),
     repo: SessionRepository = Depends(get_repo),
-) -> dict:
-    session = await repo.get_by_id(session_id)
-    if not session:
+) -> Response:
+    # Resetting the expiry clock also yields the session's version, so a client
+    # holding the current copy is answered without loading the board
+    stamp = await repo.touch(session_id)
+    if stamp is None:
         raise HTTPException(status_code=404, detail="Session not found")
-    await repo.touch(session_id)  # reset expiry clock
-    return _public(session)
+    etag = _etag(*stamp)
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=_revalidate(etag))
+
+    snapshot = cached_public_snapshot(session_id, *stamp)
+    if snapshot is None:
+        session = await repo.get_by_id(session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+        etag = _etag(session.version, session.updated_at)
+        if len(session.cards) >= settings.stream_session_min_cards:
+            return StreamingResponse(
+                public_snapshot_chunks(session), media_type="application/json", headers=_revalidate(etag)
+            )
+        snapshot = public_snapshot(session)
+    return ORJSONResponse(snapshot, headers=_revalidate(etag))
 
 
 @router.patch("/{session_id}")
@@ -93,8 +146,8 @@ async def update_session(
         session.max_votes_per_participant = body.max_votes_per_participant
 
     session = await repo.update(session)
-    await sse_manager.broadcast(session_id, _public(session))
-    return _public(session)
+    await sse_manager.broadcast(session_id, public_snapshot(session))
+    return public_snapshot(session)
 
 
 @router.post("/{session_id}/join")
@@ -102,18 +155,14 @@ async def join_session(
     session_id: str,
     body: JoinSessionRequest,
     repo: SessionRepository = Depends(get_repo),
+    uniques: UniqueParticipants = Depends(get_uniques),
 ) -> dict:
     session = await repo.get_by_id(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    existing_names = {p.name for p in session.participants}
-    if body.participant_name not in existing_names:
-        session.participants.append(Participant(name=body.participant_name))
-        session = await repo.update(session)
-        await sse_manager.broadcast(session_id, _public(session))
-
-    return _public(session)
+    session = await _join(session, body.participant_name, repo, uniques)
+    return public_snapshot(session)
 
 
 @router.post("/{session_id}/phase")
@@ -135,8 +184,8 @@ async def set_phase(
         raise HTTPException(status_code=400, detail=f"Invalid phase: {body.phase}")
 
     session = await repo.update(session)
-    await sse_manager.broadcast(session_id, _public(session))
-    return _public(session)
+    await sse_manager.broadcast(session_id, public_snapshot(session))
+    return public_snapshot(session)
 
 
 @router.post("/{session_id}/columns", status_code=201)
@@ -158,8 +207,8 @@ async def add_column(
 
     session.columns.append(body.name)
     session = await repo.update(session)
-    await sse_manager.broadcast(session_id, _public(session))
-    return _public(session)
+    await sse_manager.broadcast(session_id, public_snapshot(session))
+    return public_snapshot(session)
 
 
 @router.patch("/{session_id}/columns/{column_name}")
@@ -189,8 +238,8 @@ async def rename_column(
             card.column = body.name
 
     session = await repo.update(session)
-    await sse_manager.broadcast(session_id, _public(session))
-    return _public(session)
+    await sse_manager.broadcast(session_id, public_snapshot(session))
+    return public_snapshot(session)
 
 
 @router.delete("/{session_id}/columns/{column_name}", status_code=204)
@@ -211,9 +260,9 @@ async def remove_column(
         raise HTTPException(status_code=404, detail="Column not found")
 
     session.columns.remove(column_name)
-    session.cards = [c for c in session.cards if c.column != column_name]
+    session.remove_cards([c for c in session.cards if c.column == column_name])
     session = await repo.update(session)
-    await sse_manager.broadcast(session_id, _public(session))
+    await sse_manager.broadcast(session_id, public_snapshot(session))
 
 
 @router.patch("/{session_id}/columns/{column_name}/sort")
@@ -236,8 +285,8 @@ async def set_column_sort(
 
     session.column_sorts[column_name] = body.sort_by_votes
     session = await repo.update(session)
-    await sse_manager.broadcast(session_id, _public(session))
-    return _public(session)
+    await sse_manager.broadcast(session_id, public_snapshot(session))
+    return public_snapshot(session)
 
 
 @router.patch("/{session_id}/timer")
@@ -257,8 +306,8 @@ async def set_timer_duration(
 
     session.timer = TimerState(duration_seconds=body.duration_seconds)
     session = await repo.update(session)
-    await sse_manager.broadcast(session_id, _public(session))
-    return _public(session)
+    await sse_manager.broadcast(session_id, public_snapshot(session))
+    return public_snapshot(session)
 
 
 @router.post("/{session_id}/timer/start")
@@ -287,8 +336,8 @@ async def start_timer(
     session.timer.paused_remaining = None
 
     session = await repo.update(session)
-    await sse_manager.broadcast(session_id, _public(session))
-    return _public(session)
+    await sse_manager.broadcast(session_id, public_snapshot(session))
+    return public_snapshot(session)
 
 
 @router.post("/{session_id}/timer/pause")
@@ -311,8 +360,8 @@ async def pause_timer(
     session.timer.started_at = None
 
     session = await repo.update(session)
-    await sse_manager.broadcast(session_id, _public(session))
-    return _public(session)
+    await sse_manager.broadcast(session_id, public_snapshot(session))
+    return public_snapshot(session)
 
 
 @router.post("/{session_id}/timer/reset")
@@ -333,29 +382,51 @@ async def reset_timer(
     session.timer.paused_remaining = None
 
     session = await repo.update(session)
-    await sse_manager.broadcast(session_id, _public(session))
-    return _public(session)
+    await sse_manager.broadcast(session_id, public_snapshot(session))
+    return public_snapshot(session)
+
+
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+    "Connection": "keep-alive",
+}
 
 
 @router.get("/{session_id}/stream")
 async def stream_session(
     session_id: str,
+    join: str | None = Query(default=None),
     repo: SessionRepository = Depends(get_repo),
+    uniques: UniqueParticipants = Depends(get_uniques),
 ) -> StreamingResponse:
+    """SSE stream; the first event is the full session snapshot.
+
+    `?join=<name>` bootstraps the session page in one request: the participant is
+    added (if needed) and the resulting snapshot becomes the initial event.
+    """
+    if sse_manager.draining:
+        # Answer with a reconnect hint only — no Mongo read, no Redis subscription
+        return StreamingResponse(
+            iter([sse_manager.retry_hint()]), media_type="text/event-stream", headers=_SSE_HEADERS
+        )
+
     session = await repo.get_by_id(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
+    # The page loads through here, not GET /sessions/{id} — keep the board from expiring
+    # (a join writes last_accessed_at itself)
+    if join:
+        session = await _join(session, join, repo, uniques)
+    else:
+        await repo.touch(session_id)
 
     async def event_stream() -> AsyncGenerator[str, None]:  # pragma: no cover
-        async for chunk in sse_manager.stream(session_id, initial_data=_public(session)):
+        async for chunk in sse_manager.stream(session_id, initial_data=public_snapshot(session)):
             yield chunk
 
     return StreamingResponse(  # pragma: no cover
         event_stream(),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "X-Accel-Buffering": "no",
-            "Connection": "keep-alive",
-        },
+        headers=_SSE_HEADERS,
     )
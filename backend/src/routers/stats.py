@@ -1,36 +1,130 @@
 """Stats router — public aggregate data + password-protected admin section."""
 
-from typing import Annotated
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Annotated, Any
 from uuid import uuid4
 
 import redis.asyncio as aioredis
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
-from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
+from motor.motor_asyncio import AsyncIOMotorDatabase
 from pydantic import BaseModel
 
 from ..config import settings
-from ..dependencies import get_redis, get_repo
+from ..dependencies import (
+    get_admin_stats_caches,
+    get_analytics_db,
+    get_analytics_snapshot,
+    get_redis,
+    get_repo,
+    get_series_cache,
+    get_stats_cache,
+    get_uniques,
+)
+from ..encoding import EncodedDict, ORJSONResponse
+from ..repositories.analytics_snapshot import AnalyticsSnapshot
 from ..repositories.session_repo import SessionRepository
-from ..repositories.stats_repo import AdminStats, PublicStats, SentryHealth, StatsRepository
+from ..repositories.stats_repo import (
+    PER_DAY_WINDOW_DAYS,
+    AdminStats,
+    Granularity,
+    PublicStats,
+    SentryHealth,
+    SessionSeries,
+    StatsRepository,
+    TimeWindow,
+    UniqueParticipants,
+)
 from ..services.sentry_service import SentryService
+from ..services.stats_cache import ClosedWindowCache, StatsCache
+from ..services.stats_export import MEDIA_TYPES, ExportFormat, encode_rows
+from ._shared import _check_admin_token
 
-router = APIRouter(prefix="/api/v1/stats", tags=["stats"])
+router = APIRouter(prefix="/api/v1/stats", tags=["stats"], default_response_class=ORJSONResponse)
+
+# A window's stats are final this long after its last day ends — time for writes
+# in flight at midnight to land
+CLOSED_WINDOW_GRACE = timedelta(minutes=5)
 
 
 class AdminAuthRequest(BaseModel):
     password: str
 
 
-def _stats_repo(repo: Annotated[SessionRepository, Depends(get_repo)]) -> StatsRepository:
-    return StatsRepository(repo.collection.database)  # type: ignore[arg-type]
+def _stats_repo(
+    repo: Annotated[SessionRepository, Depends(get_repo)],
+    analytics: Annotated[AsyncIOMotorDatabase, Depends(get_analytics_db)],
+    uniques: Annotated[UniqueParticipants, Depends(get_uniques)],
+    snapshot: Annotated[AnalyticsSnapshot | None, Depends(get_analytics_snapshot)],
+) -> StatsRepository:
+    return StatsRepository(repo.collection.database, uniques, analytics, snapshot)  # type: ignore[arg-type]
+
 
+def _cache_control(age: float) -> str:
+    """Lets nginx or a CDN share the stats on the same schedule as the process cache."""
+    max_age = int(settings.stats_cache_seconds - age)
+    if max_age <= 0:
+        return "no-cache"
+    return f"public, max-age={max_age}, stale-while-revalidate={int(settings.stats_stale_seconds)}"
 
-@router.get("")
+
+@router.get("", response_model=PublicStats)
 async def get_public_stats(
     stats: Annotated[StatsRepository, Depends(_stats_repo)],
-) -> PublicStats:
-    return await stats.get_public_stats()
+    cache: Annotated[StatsCache, Depends(get_stats_cache)],
+) -> Response:
+    async def load() -> EncodedDict:
+        return EncodedDict((await stats.get_public_stats()).model_dump())
+
+    body, age = await cache.get(load, settings.stats_cache_seconds, settings.stats_stale_seconds)
+    return ORJSONResponse(body, headers={"Cache-Control": _cache_control(age)})
+
+
+@router.get("/sessions", response_model=SessionSeries)
+async def get_session_series(
+    stats: Annotated[StatsRepository, Depends(_stats_repo)],
+    cache: Annotated[ClosedWindowCache, Depends(get_series_cache)],
+    start: Annotated[date | None, Query(alias="from")] = None,
+    end: Annotated[date | None, Query(alias="to")] = None,
+    granularity: Granularity = "day",
+) -> Response:
+    """Sessions created per day, week or month over the days from–to (default: the
+    last 30). A window that has ended never changes, so it is cached indefinitely —
+    here and, via Cache-Control, by browsers and proxies — once the activity backfill
+    is done: until then its counts may still grow."""
+    _check_window(start, end)
+    end = end or datetime.now(UTC).date()
+    start = start or end - timedelta(days=PER_DAY_WINDOW_DAYS - 1)
+    _check_window(start, end, settings.stats_max_window_days)
+
+    async def load() -> EncodedDict:
+        buckets = await stats.sessions_created(start, end, granularity)
+        series = SessionSeries(
+            start=start.isoformat(), end=end.isoformat(), granularity=granularity, buckets=buckets
+        )
+        return EncodedDict(series.model_dump())
+
+    closed = datetime.combine(end + timedelta(days=1), time(), UTC) + CLOSED_WINDOW_GRACE <= datetime.now(UTC)
+    if closed and await stats.events_complete():
+        body = await cache.get((start, end, granularity), load)
+        return ORJSONResponse(body, headers={"Cache-Control": "public, max-age=31536000, immutable"})
+    return ORJSONResponse(await load(), headers={"Cache-Control": "no-cache"})
+
+
+def _check_window(start: date | None, end: date | None, max_days: int | None = None) -> None:
+    # Somewhere it is already tomorrow; any later day has no sessions yet (and near
+    # date.max, no end of day to compute)
+    latest = datetime.now(UTC).date() + timedelta(days=1)
+    if any(day > latest for day in (start, end) if day):
+        raise HTTPException(status_code=422, detail="'from' and 'to' must not be after tomorrow")
+    if start and end and start > end:
+        raise HTTPException(status_code=422, detail="'from' must not be after 'to'")
+    if max_days and start and end and (end - start).days >= max_days:
+        raise HTTPException(status_code=422, detail=f"The window must not exceed {max_days} days")
 
 
 @router.post("/auth")
@@ -53,45 +147,61 @@ async def admin_auth(
 async def get_admin_stats(
     stats: Annotated[StatsRepository, Depends(_stats_repo)],
     redis: Annotated[aioredis.Redis, Depends(get_redis)],
+    caches: Annotated[dict[str, StatsCache], Depends(get_admin_stats_caches)],
     expiry_days: Annotated[int, Depends(lambda: settings.session_expiry_days)],
+    start: Annotated[date | None, Query(alias="from")] = None,
+    end: Annotated[date | None, Query(alias="to")] = None,
     x_admin_token: Annotated[str, Header()] = "",
 ) -> AdminStats:
-    if not x_admin_token:
-        raise HTTPException(status_code=401, detail="Invalid or expired admin token")
-    exists = await redis.exists(f"admin_token:{x_admin_token}")
-    if not exists:
-        raise HTTPException(status_code=401, detail="Invalid or expired admin token")
-    result = await stats.get_admin_stats(expiry_days=expiry_days)
-    if settings.sentry_api_configured:
-        svc = SentryService(
-            settings.sentry_auth_token,
-            settings.sentry_org_slug,
-            settings.sentry_project_slug,
-        )
-        try:
-            result.sentry = await svc.get_health()
-        except Exception as exc:
-            result.sentry = SentryHealth(
-                unresolved_count=0,
-                top_issues=[],
-                error_rate_7d=[],
-                p95_latency_7d=[],
-                error=str(exc),
-            )
-    if settings.sentry_frontend_api_configured:
-        svc_fe = SentryService(
-            settings.sentry_auth_token,
-            settings.sentry_org_slug,
-            settings.sentry_frontend_project_slug,
-        )
-        try:
-            result.sentry_frontend = await svc_fe.get_health()
-        except Exception as exc:
-            result.sentry_frontend = SentryHealth(
-                unresolved_count=0,
-                top_issues=[],
-                error_rate_7d=[],
-                p95_latency_7d=[],
-                error=str(exc),
-            )
+    """All admin facets; from/to (days) narrow them to the sessions created then."""
+    await _check_admin_token(redis, x_admin_token)
+    _check_window(start, end)
+    window = TimeWindow.of_days(start, end) if start or end else None
+
+    async def cached(name: str, load: Callable[[], Awaitable[Any]]) -> Any:
+        value, _ = await caches[name].get(load, settings.admin_facet_cache_seconds, 0)
+        return value
+
+    result, sentry, sentry_frontend = await asyncio.gather(
+        # Only the default view is cached: arbitrary windows would each take an entry
+        stats.get_admin_stats(expiry_days=expiry_days, run=None if window else cached, window=window),
+        _sentry_health(settings.sentry_project_slug, settings.sentry_api_configured),
+        _sentry_health(settings.sentry_frontend_project_slug, settings.sentry_frontend_api_configured),
+    )
+    result.sentry = sentry
+    result.sentry_frontend = sentry_frontend
     return result
+
+
+@router.get("/admin/export", response_class=StreamingResponse)
+async def export_admin_stats(
+    stats: Annotated[StatsRepository, Depends(_stats_repo)],
+    redis: Annotated[aioredis.Redis, Depends(get_redis)],
+    fmt: Annotated[ExportFormat, Query(alias="format")] = "csv",
+    x_admin_token: Annotated[str, Header()] = "",
+) -> StreamingResponse:
+    """One row per session — for offline analysis — streamed from a cursor in
+    batches of STATS_EXPORT_BATCH_SIZE."""
+    await _check_admin_token(redis, x_admin_token)
+    filename = f"retrospekt-sessions-{datetime.now(UTC):%Y%m%d}.{fmt}"
+    return StreamingResponse(
+        encode_rows(stats.export_batches(settings.stats_export_batch_size), fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+async def _sentry_health(project_slug: str, configured: bool) -> SentryHealth | None:
+    if not configured:
+        return None
+    svc = SentryService(settings.sentry_auth_token, settings.sentry_org_slug, project_slug)
+    try:
+        return await svc.get_health()
+    except Exception as exc:
+        return SentryHealth(
+            unresolved_count=0,
+            top_issues=[],
+            error_rate_7d=[],
+            p95_latency_7d=[],
+            error=str(exc),
+        )
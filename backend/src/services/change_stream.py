@@ -0,0 +1,166 @@
+"""MongoDB change-stream watcher — publishes every session write to SSE subscribers.
+
+Optional alternative to per-handler broadcasts (``SSE_CHANGE_STREAM=true``). A single
+watcher per deployment tails the ``sessions`` collection, so writes made outside the
+HTTP path (cleanup loop, manual fixes in mongosh) also reach connected clients.
+
+Leadership is a Redis key with a short TTL: every pod runs a watcher, but only the one
+holding the key tails the stream, renewing it on a timer well inside the TTL. The last
+processed resume token is stored in Redis every few events or seconds (and on the way
+out), so a restarted (or newly elected) leader continues where the previous one
+stopped — at worst replaying a few events, which only republishes the same snapshots.
+Requires MongoDB running as a replica set — a single-node one is enough locally.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+from uuid import uuid4
+
+import redis.asyncio as aioredis
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import OperationFailure, PyMongoError
+from redis.exceptions import WatchError
+
+from ..repositories.session_repo import _doc_to_session
+from ..snapshots import public_snapshot
+from .sse_manager import SSEManager, sse_manager
+
+logger = logging.getLogger(__name__)
+
+LEADER_KEY = "change_stream:leader"
+RESUME_TOKEN_KEY = "change_stream:resume_token"
+LEADER_TTL_SECONDS = 15
+LEADER_RENEW_SECONDS = LEADER_TTL_SECONDS / 3  # two renewals may fail before the key lapses
+MAX_AWAIT_MS = 1000  # how long try_next() blocks — bounds how late a renewal can run
+RESUME_TOKEN_SAVE_EVENTS = 100
+RESUME_TOKEN_SAVE_SECONDS = 5.0
+RETRY_DELAY_SECONDS = 5.0
+
+# Updates that only touch these fields are bookkeeping — clients never see them
+_SILENT_FIELDS = frozenset({"last_accessed_at"})
+
+# ChangeStreamHistoryLost / ChangeStreamFatalError: the stored token is unusable
+_STALE_TOKEN_CODES = frozenset({280, 286})
+
+
+class ChangeStreamWatcher:
+    def __init__(
+        self,
+        collection: AsyncIOMotorCollection,
+        redis_client: aioredis.Redis,  # type: ignore[type-arg]
+        manager: SSEManager = sse_manager,
+    ) -> None:
+        self._collection = collection
+        self._redis = redis_client
+        self._manager = manager
+        self._pod_id = str(uuid4())
+
+    async def run(self) -> None:
+        """Campaign for leadership forever; tail the change stream while holding it."""
+        logger.info("Change-stream watcher started (pod %s)", self._pod_id)
+        try:
+            while True:
+                if await self.hold_leadership():
+                    try:
+                        await self.watch()
+                    except OperationFailure as exc:
+                        if exc.code in _STALE_TOKEN_CODES:
+                            logger.warning("Change stream: resume token expired, starting fresh")
+                            await self._redis.delete(RESUME_TOKEN_KEY)
+                        else:
+                            logger.exception("Change stream: operation failure")
+                    except PyMongoError:
+                        logger.exception("Change stream: connection error")
+                await asyncio.sleep(RETRY_DELAY_SECONDS)
+        finally:
+            await self.release_leadership()
+
+    async def hold_leadership(self) -> bool:
+        """Acquire the leader key, or extend it if this pod already owns it."""
+        if await self._redis.set(LEADER_KEY, self._pod_id, nx=True, ex=LEADER_TTL_SECONDS):
+            return True
+        return await self._if_leader(lambda pipe: pipe.expire(LEADER_KEY, LEADER_TTL_SECONDS))
+
+    async def release_leadership(self) -> None:
+        await self._if_leader(lambda pipe: pipe.delete(LEADER_KEY))
+
+    async def _if_leader(self, command: Callable[[Any], Any]) -> bool:
+        """Run *command* on the leader key only if this pod owns it.
+
+        Check and command form one WATCH/MULTI transaction: if the key expires, or
+        another pod takes it, in between, the command is not run — a pod never
+        extends (or deletes) a key that has meanwhile become someone else's.
+        """
+        async with self._redis.pipeline(transaction=True) as pipe:
+            await pipe.watch(LEADER_KEY)
+            owner = await pipe.get(LEADER_KEY)
+            if owner is None or owner.decode() != self._pod_id:
+                return False
+            pipe.multi()
+            command(pipe)
+            try:
+                await pipe.execute()
+            except WatchError:
+                return False
+        return True
+
+    async def watch(self) -> None:
+        """Tail the sessions collection until leadership is lost.
+
+        Redis sees a renewal every ``LEADER_RENEW_SECONDS`` and a resume-token write
+        every ``RESUME_TOKEN_SAVE_EVENTS`` events or ``RESUME_TOKEN_SAVE_SECONDS``,
+        whichever comes first — not a round trip per event. The pending token is
+        saved on the way out too, unless the key has meanwhile become another pod's.
+        """
+        raw_token = await self._redis.get(RESUME_TOKEN_KEY)
+        resume_after = {"_data": raw_token.decode()} if raw_token else None
+        token, unsaved = "", 0
+        renewed_at = saved_at = time.monotonic()
+        try:
+            async with self._collection.watch(
+                full_document="updateLookup",
+                resume_after=resume_after,
+                max_await_time_ms=MAX_AWAIT_MS,
+            ) as stream:
+                while True:
+                    if time.monotonic() - renewed_at >= LEADER_RENEW_SECONDS:
+                        if not await self.hold_leadership():
+                            return
+                        renewed_at = time.monotonic()
+                    change = await stream.try_next()
+                    if change is not None:
+                        await self.handle(change)
+                        token, unsaved = change["_id"]["_data"], unsaved + 1
+                    if unsaved and (
+                        unsaved >= RESUME_TOKEN_SAVE_EVENTS
+                        or time.monotonic() - saved_at >= RESUME_TOKEN_SAVE_SECONDS
+                    ):
+                        await self._redis.set(RESUME_TOKEN_KEY, token)
+                        unsaved, saved_at = 0, time.monotonic()
+        finally:
+            if unsaved:
+                await self._if_leader(lambda pipe: pipe.set(RESUME_TOKEN_KEY, token))
+
+    async def handle(self, change: dict[str, Any]) -> None:
+        """Publish the public snapshot for one change event.
+
+        Handlers write with full-document replaces, so subscribers always receive the
+        complete post-image; ``updateDescription`` is only used to drop updates that
+        touch nothing but bookkeeping fields (``touch()``).
+        """
+        op = change["operationType"]
+        if op not in ("insert", "replace", "update"):
+            return
+        if op == "update":
+            desc = change.get("updateDescription") or {}
+            changed = set(desc.get("updatedFields", {})) | set(desc.get("removedFields", []))
+            if changed <= _SILENT_FIELDS:
+                return
+        doc = change.get("fullDocument")
+        if doc is None:  # deleted again before the post-image lookup
+            return
+        session = _doc_to_session(doc)
+        await self._manager.publish(session.id, public_snapshot(session))
@@ -1,10 +1,13 @@
 import asyncio
-import json
 import logging
+import random
 from collections.abc import AsyncGenerator
 
 import redis.asyncio as aioredis
 
+from ..config import settings
+from ..encoding import dumps
+
 logger = logging.getLogger(__name__)
 
 
@@ -14,25 +17,65 @@ class SSEManager:
     Each pod publishes mutations to a Redis channel and subscribes to receive
     broadcasts from all pods, so all SSE clients see every mutation regardless
     of which replica handled the HTTP request.
+
+    On shutdown, drain() closes the open streams gradually, handing each client a
+    randomized ``retry:`` hint so reconnects spread across the surviving pods over
+    time instead of arriving all at once.
     """
 
     def __init__(self) -> None:
         self._redis: aioredis.Redis | None = None  # type: ignore[type-arg]
+        # When a ChangeStreamWatcher owns broadcasting, handler-driven broadcasts are no-ops
+        self.change_stream_mode = False
+        self.draining = False
+        self._retry_range_ms = (settings.sse_retry_min_ms, settings.sse_retry_max_ms)
+        # One queue per open stream — drain() pushes a retry hint (int) into each
+        self._queues: set[asyncio.Queue[str | int | None]] = set()
 
     def set_client(self, client: aioredis.Redis | None) -> None:  # type: ignore[type-arg]
         self._redis = client
 
     async def broadcast(self, session_id: str, data: dict) -> None:
+        """Publish a mutation from a request handler (skipped in change-stream mode)."""
+        if self.change_stream_mode:
+            return
+        await self.publish(session_id, data)
+
+    async def publish(self, session_id: str, data: dict) -> None:
         assert self._redis is not None
-        await self._redis.publish(f"session:{session_id}", json.dumps(data, default=str))
+        await self._redis.publish(f"session:{session_id}", dumps(data))
+
+    @property
+    def open_streams(self) -> int:
+        return len(self._queues)
+
+    def retry_hint(self) -> str:
+        """SSE ``retry:`` field with a jittered reconnect delay from the drain range."""
+        return f"retry: {random.randint(*self._retry_range_ms)}\n\n"
+
+    async def drain(self, window_seconds: float, retry_min_ms: int, retry_max_ms: int) -> None:
+        """Stop accepting streams and close the open ones evenly over `window_seconds`."""
+        self.draining = True
+        self._retry_range_ms = (retry_min_ms, retry_max_ms)
+        queues = list(self._queues)
+        logger.info("Draining %d SSE stream(s) over %.1fs", len(queues), window_seconds)
+        random.shuffle(queues)
+        interval = window_seconds / len(queues) if queues else 0.0
+        for queue in queues:
+            queue.put_nowait(random.randint(retry_min_ms, retry_max_ms))
+            await asyncio.sleep(interval)
 
     async def stream(
         self, session_id: str, initial_data: dict | None = None
     ) -> AsyncGenerator[str, None]:
+        if self.draining:
+            yield self.retry_hint()
+            return
         assert self._redis is not None
         redis_client = self._redis
         channel = f"session:{session_id}"
-        queue: asyncio.Queue[str | None] = asyncio.Queue()
+        # str = payload, int = drain (retry hint in ms, then close), None = reader stopped
+        queue: asyncio.Queue[str | int | None] = asyncio.Queue()
 
         async def _reader() -> None:
             async with redis_client.pubsub() as pubsub:
@@ -46,14 +89,18 @@ class SSEManager:
                     await queue.put(None)  # sentinel
 
         task = asyncio.create_task(_reader())
+        self._queues.add(queue)
         try:
             if initial_data is not None:
-                yield f"data: {json.dumps(initial_data, default=str)}\n\n"
+                yield f"data: {dumps(initial_data).decode()}\n\n"
             while True:
                 try:
                     item = await asyncio.wait_for(queue.get(), timeout=30.0)
                     if item is None:  # pragma: no cover
                         break
+                    if isinstance(item, int):
+                        yield f"retry: {item}\n\n"
+                        break
                     yield f"data: {item}\n\n"
                 except TimeoutError:
                     yield ": keepalive\n\n"
@@ -61,6 +108,7 @@ class SSEManager:
             task.cancel()
             raise
         finally:
+            self._queues.discard(queue)
             task.cancel()
 
 
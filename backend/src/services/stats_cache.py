@@ -0,0 +1,69 @@
+"""In-process cache for the stats endpoints — stale-while-revalidate, single-flight.
+
+A value younger than ``fresh_for`` seconds is served as is. Until it is
+``fresh_for + stale_for`` old it is still served, while one background task loads
+its replacement; past that, requests wait for the load. Concurrent requests never
+start more than one load, so each process queries MongoDB for the stats at most
+once per refresh however hard the endpoint is hit.
+
+``ClosedWindowCache`` holds stats of time windows that have ended: the past does
+not change, so they are kept until evicted, least recently used first.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class StatsCache:
+    def __init__(self) -> None:
+        self._value: Any = None
+        self._loaded_at = 0.0  # time.monotonic() of the load; 0: nothing loaded
+        self._loading: asyncio.Task[None] | None = None
+
+    async def get(
+        self, load: Callable[[], Awaitable[Any]], fresh_for: float, stale_for: float
+    ) -> tuple[Any, float]:
+        """The cached value, loaded with *load* when missing or too old, and its age in seconds."""
+        age = time.monotonic() - self._loaded_at
+        if not self._loaded_at or age >= fresh_for + stale_for:
+            if self._loading is None:
+                self._loading = asyncio.create_task(self._load(load))
+            # Shielded: a disconnecting client must not cancel the load others wait on
+            await asyncio.shield(self._loading)
+        elif age >= fresh_for and self._loading is None:
+            self._loading = asyncio.create_task(self._load(load))
+            self._loading.add_done_callback(_log_failure)
+        return self._value, time.monotonic() - self._loaded_at
+
+    async def _load(self, load: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            self._value = await load()
+            self._loaded_at = time.monotonic()
+        finally:
+            self._loading = None
+
+
+class ClosedWindowCache:
+    def __init__(self, max_entries: int = 512) -> None:
+        self._values: OrderedDict[Hashable, Any] = OrderedDict()
+        self._max_entries = max_entries
+
+    async def get(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        if key in self._values:
+            self._values.move_to_end(key)
+            return self._values[key]
+        value = self._values[key] = await load()
+        if len(self._values) > self._max_entries:
+            self._values.popitem(last=False)
+        return value
+
+
+def _log_failure(task: asyncio.Task[None]) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Stats: background refresh failed", exc_info=task.exception())
@@ -0,0 +1,42 @@
+"""Stats export encoding — per-session rows as CSV or NDJSON, one chunk per batch.
+
+Rows arrive in batches from ``StatsRepository.export_batches()`` and each batch is
+encoded and handed on before the next is read, so neither the result set nor the
+encoded file is ever held whole.
+"""
+
+import csv
+import io
+from collections.abc import AsyncIterator
+from typing import Any, Literal
+
+from ..encoding import dumps
+from ..repositories.stats_repo import EXPORT_FIELDS
+
+ExportFormat = Literal["csv", "ndjson"]
+
+MEDIA_TYPES: dict[str, str] = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+async def encode_rows(
+    batches: AsyncIterator[list[dict[str, Any]]], fmt: ExportFormat
+) -> AsyncIterator[bytes]:
+    if fmt == "ndjson":
+        async for batch in batches:
+            yield b"".join(dumps(row) + b"\n" for row in batch)
+        return
+    yield _csv_chunk([], header=True)
+    async for batch in batches:
+        yield _csv_chunk(batch)
+
+
+def _csv_chunk(rows: list[dict[str, Any]], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, EXPORT_FIELDS)
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
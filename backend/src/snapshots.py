@@ -0,0 +1,114 @@
+"""Public session snapshots — what clients see of a session, encoded once per write.
+
+Shared by the routers (responses, GETs, stream bootstraps) and the change-stream
+watcher (broadcasts), so both layers serve the same cached bytes.
+"""
+
+import calendar
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
+from datetime import datetime
+
+from .config import settings
+from .encoding import EncodedDict, dumps
+from .models.session import Card, Note, Session
+
+_PRIVATE_FIELDS = {"facilitator_token", "last_accessed_at", "version"}
+
+SNAPSHOT_CACHE_SIZE = 512
+STREAM_CHUNK_ITEMS = 200  # cards (or notes) encoded per chunk by public_snapshot_chunks()
+
+
+class _SnapshotCache:
+    """Least recently used snapshots, at most SNAPSHOT_CACHE_SIZE of them and at most
+    SNAPSHOT_CACHE_BYTES of encoded JSON (their dicts take a few times that again)."""
+
+    def __init__(self) -> None:
+        # session id → ((version, updated_at in ms), snapshot); least recently used first
+        self._entries: OrderedDict[str, tuple[tuple[int, int], EncodedDict]] = OrderedDict()
+        self.size_bytes = 0
+
+    def get(self, session_id: str, key: tuple[int, int]) -> EncodedDict | None:
+        cached = self._entries.get(session_id)
+        if cached is None or cached[0] != key:
+            return None
+        self._entries.move_to_end(session_id)
+        return cached[1]
+
+    def put(self, session_id: str, key: tuple[int, int], snapshot: EncodedDict) -> None:
+        self.pop(session_id)
+        size = len(snapshot.encoded)
+        if size > settings.snapshot_cache_bytes:  # would evict everything else
+            return
+        self._entries[session_id] = (key, snapshot)
+        self.size_bytes += size
+        while len(self._entries) > SNAPSHOT_CACHE_SIZE or self.size_bytes > settings.snapshot_cache_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted.encoded)
+
+    def pop(self, session_id: str) -> None:
+        cached = self._entries.pop(session_id, None)
+        if cached is not None:
+            self.size_bytes -= len(cached[1].encoded)
+
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+
+_snapshots = _SnapshotCache()
+
+
+def epoch_millis(dt: datetime) -> int:
+    """Epoch milliseconds, truncated like BSON dates — naive values are taken as UTC."""
+    return calendar.timegm(dt.utctimetuple()) * 1000 + dt.microsecond // 1000
+
+
+def cached_public_snapshot(session_id: str, version: int, updated_at: datetime) -> dict | None:
+    """The cached snapshot of that exact session state, if this process has it."""
+    return _snapshots.get(session_id, (version, epoch_millis(updated_at)))
+
+
+def public_snapshot(session: Session) -> dict:
+    """Strip internal fields before sending to clients.
+
+    The snapshot is encoded once and cached per session under (version, updated_at),
+    which every repository write changes, so a write's broadcast, its response and
+    later GETs and stream bootstraps share one serialization. Do not mutate it.
+    """
+    key = (session.version, epoch_millis(session.updated_at))
+    cached = _snapshots.get(session.id, key)
+    if cached is not None:
+        return cached
+    data = session.to_dict()
+    for name in _PRIVATE_FIELDS:
+        del data[name]
+    snapshot = EncodedDict(data)
+    _snapshots.put(session.id, key, snapshot)
+    return snapshot
+
+
+def public_snapshot_chunks(session: Session) -> Iterator[bytes]:
+    """The public snapshot encoded piece by piece — the same bytes as dumps(public_snapshot(session)).
+
+    Cards and notes are encoded STREAM_CHUNK_ITEMS at a time, so neither the whole
+    dict nor the whole JSON string of a very large board is held at once.
+    """
+    data = session.to_dict_without_items()
+    for name in _PRIVATE_FIELDS:
+        del data[name]
+    keys = list(data)
+    cards_at = keys.index("cards")  # "notes" follows it
+    yield dumps({k: data[k] for k in keys[:cards_at]})[:-1] + b',"cards":['
+    yield from _item_chunks(session.cards)
+    yield b'],"notes":['
+    yield from _item_chunks(session.notes)
+    yield b"]," + dumps({k: data[k] for k in keys[cards_at + 2 :]})[1:]
+
+
+def _item_chunks(items: Sequence[Card | Note]) -> Iterator[bytes]:
+    for start in range(0, len(items), STREAM_CHUNK_ITEMS):
+        chunk = dumps([item.to_dict() for item in items[start : start + STREAM_CHUNK_ITEMS]])[1:-1]
+        yield chunk if start == 0 else b"," + chunk
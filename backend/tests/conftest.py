@@ -6,16 +6,20 @@ DI strategy:
 - Each test gets a fresh, isolated database via the `db` fixture.
 """
 
+import os
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from uuid import uuid4
 
 import fakeredis.aioredis
+import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from mongomock_motor import AsyncMongoMockClient
+from motor.motor_asyncio import AsyncIOMotorClient
 
-from src.dependencies import get_feedback_repo, get_redis, get_repo
+from src.database import CLIENT_OPTIONS
+from src.dependencies import get_analytics_db, get_feedback_repo, get_redis, get_repo
 from src.main import create_app
 from src.repositories.feedback_repo import FeedbackRepository
 from src.repositories.session_repo import SessionRepository
@@ -35,16 +39,38 @@ async def fake_redis():
 @pytest_asyncio.fixture
 async def db():
     """Fresh in-memory MongoDB for each test."""
-    client = AsyncMongoMockClient()
+    client = AsyncMongoMockClient(**CLIENT_OPTIONS)
     yield client["retrospekt"]
 
 
+# For what mongomock cannot run (e.g. $dateTrunc): these tests use `mongo_db`, on a
+# real server, and are skipped unless MONGODB_TEST_URL is set, e.g.:
+#     docker run -d --name mongo -p 27017:27017 mongo:7
+#     MONGODB_TEST_URL='mongodb://localhost:27017' uv run pytest
+requires_mongo = pytest.mark.skipif(
+    not os.environ.get("MONGODB_TEST_URL"), reason="requires a MongoDB server"
+)
+
+
+@pytest_asyncio.fixture
+async def mongo_db():  # pragma: no cover - needs a real MongoDB
+    """A fresh database on the MongoDB server at MONGODB_TEST_URL, dropped afterwards."""
+    client: AsyncIOMotorClient = AsyncIOMotorClient(os.environ["MONGODB_TEST_URL"], **CLIENT_OPTIONS)
+    name = f"retrospekt_test_{uuid4().hex[:8]}"
+    try:
+        yield client[name]
+    finally:
+        await client.drop_database(name)
+        client.close()
+
+
 @pytest_asyncio.fixture
 async def client(db, fake_redis):
     """FastAPI test client wired to the in-memory DB and fake Redis via dependency overrides."""
     app = create_app()
     app.dependency_overrides[get_repo] = lambda: SessionRepository(db)
     app.dependency_overrides[get_feedback_repo] = lambda: FeedbackRepository(db)
+    app.dependency_overrides[get_analytics_db] = lambda: db
     app.dependency_overrides[get_redis] = lambda: fake_redis
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
         yield c
@@ -0,0 +1,217 @@
+"""Activity event specifications — lifecycle events and the admin charts read from them."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from pymongo.errors import CollectionInvalid, OperationFailure
+
+from src.repositories import activity_repo
+from src.repositories.activity_repo import (
+    ACTIVITY_TIMESERIES,
+    BACKFILL_ID,
+    BACKFILL_LEASE,
+    ActivityEvent,
+    ActivityRepository,
+)
+from src.repositories.session_repo import SessionRepository
+from tests.conftest import make_session
+
+TOKEN = "activity-test-token"
+
+
+async def _events(db, session_id: str) -> list[str]:
+    docs = await db["activity"].find({"meta.session_id": session_id}).sort("at", 1).to_list(None)
+    return [d["meta"]["event"] for d in docs]
+
+
+async def _card(client: AsyncClient, session_id: str) -> str:
+    response = await client.post(
+        f"/api/v1/sessions/{session_id}/cards",
+        json={"column": "Went Well", "text": "Card", "author_name": "Alice"},
+    )
+    return response.json()["id"]
+
+
+async def _phase(client: AsyncClient, session, phase: str) -> None:
+    await client.post(
+        f"/api/v1/sessions/{session.id}/phase",
+        json={"phase": phase},
+        headers={"X-Facilitator-Token": session.facilitator_token},
+    )
+
+
+async def _admin(client: AsyncClient, fake_redis) -> dict:
+    await fake_redis.set(f"admin_token:{TOKEN}", "1", ex=86400)
+    return (await client.get("/api/v1/stats/admin", headers={"X-Admin-Token": TOKEN})).json()
+
+
+# ── Recording ────────────────────────────────────────────────────────────────
+
+
+async def test_lifecycle_steps_are_recorded_once(client: AsyncClient, db):
+    session = await make_session(client)
+    card_id = await _card(client, session.id)
+    await _card(client, session.id)
+    await _phase(client, session, "discussing")
+    await client.post(
+        f"/api/v1/sessions/{session.id}/cards/{card_id}/publish",
+        headers={"X-Participant-Name": "Alice"},
+    )
+    await client.post(
+        f"/api/v1/sessions/{session.id}/cards/{card_id}/votes",
+        headers={"X-Participant-Name": "Bob"},
+    )
+    await _phase(client, session, "closed")
+
+    assert await _events(db, session.id) == ["created", "first_card", "first_vote", "closed"]
+
+
+# ── Charts ───────────────────────────────────────────────────────────────────
+
+
+async def test_admin_charts_keep_expired_sessions(client: AsyncClient, db, fake_redis):
+    session = await make_session(client)
+    await _card(client, session.id)
+    old = datetime.now(UTC) - timedelta(days=60)
+    await db["sessions"].update_one({"_id": session.id}, {"$set": {"last_accessed_at": old}})
+    assert await SessionRepository(db).delete_stale(datetime.now(UTC) - timedelta(days=30)) == 1
+
+    data = await _admin(client, fake_redis)
+
+    assert data["engagement_funnel"] == {"created": 1, "has_cards": 1, "has_votes": 0, "closed": 0}
+    assert sum(cell["count"] for cell in data["activity_heatmap"]) == 1
+
+
+async def test_admin_charts_only_cover_the_activity_window(client: AsyncClient, db, fake_redis):
+    long_ago = datetime.now(UTC) - timedelta(days=120)
+    await ActivityRepository(db).record("old", [ActivityEvent.CREATED], long_ago)
+
+    data = await _admin(client, fake_redis)
+
+    assert data["activity_heatmap"] == []
+    assert data["engagement_funnel"]["created"] == 0
+
+
+# ── Collection setup ─────────────────────────────────────────────────────────
+
+
+async def test_ensure_collection_creates_a_time_series_and_backfill_adds_past_sessions(
+    db, monkeypatch, session_factory
+):
+    now = datetime.now(UTC)
+    await session_factory(created_at=now - timedelta(days=2))
+    closed = await session_factory(phase="closed", created_at=now - timedelta(days=3), updated_at=now)
+    cards = [{"id": "c1", "votes": ["Bob"]}]
+    await db["sessions"].update_one({"_id": closed["_id"]}, {"$set": {"cards": cards}})
+    created = _fake_create_collection(db, monkeypatch)
+    repo = ActivityRepository(db)
+    await repo.ensure_collection()
+    await repo.ensure_collection()  # exists now — left alone
+
+    assert await repo.backfill() == 5
+    assert await repo.backfill() == 0  # done
+
+    assert created == {"activity": {"timeseries": ACTIVITY_TIMESERIES}}
+    assert await db["activity"].count_documents({"meta.event": "created"}) == 2
+    assert await _events(db, closed["_id"]) == ["created", "first_card", "first_vote", "closed"]
+
+
+@pytest.mark.parametrize(
+    "error",
+    [CollectionInvalid("collection activity already exists"), OperationFailure("exists", code=48)],
+)
+async def test_losing_the_creation_race_is_not_an_error(db, monkeypatch, error):
+    async def create_collection(name: str, **options):
+        raise error  # another pod won
+
+    monkeypatch.setattr(db, "create_collection", create_collection)
+
+    await ActivityRepository(db).ensure_collection()
+
+    assert (await db["migrations"].find_one({"_id": BACKFILL_ID}))["done"] is False
+
+
+async def test_other_creation_failures_are_raised(db, monkeypatch):
+    async def create_collection(name: str, **options):
+        raise OperationFailure("not authorized", code=13)
+
+    monkeypatch.setattr(db, "create_collection", create_collection)
+
+    with pytest.raises(OperationFailure):
+        await ActivityRepository(db).ensure_collection()
+
+
+async def test_a_collection_from_before_backfill_markers_is_not_backfilled(db, session_factory):
+    await session_factory()
+    await ActivityRepository(db).record("x", [ActivityEvent.CREATED], datetime.now(UTC))
+    repo = ActivityRepository(db)
+    await repo.ensure_collection()
+
+    assert await repo.backfill() == 0
+    assert await db["activity"].count_documents({}) == 1
+
+
+async def test_backfill_inserts_in_batches_and_skips_sessions_created_since(
+    db, monkeypatch, session_factory
+):
+    past = datetime.now(UTC) - timedelta(days=1)
+    for _ in range(5):
+        await session_factory(created_at=past)
+    _fake_create_collection(db, monkeypatch)
+    monkeypatch.setattr(activity_repo, "BACKFILL_BATCH_SIZE", 2)
+    repo = ActivityRepository(db)
+    await repo.ensure_collection()
+    await session_factory()  # created after the collection — records its own events
+    inserts: list[int] = []
+    insert_many = repo.collection.insert_many
+
+    async def counting_insert_many(docs, **kwargs):
+        inserts.append(len(docs))
+        return await insert_many(docs, **kwargs)
+
+    monkeypatch.setattr(repo.collection, "insert_many", counting_insert_many)
+
+    assert await repo.backfill() == 5
+    assert inserts == [2, 2, 1]
+
+
+async def test_backfill_interrupted_by_a_dead_pod_is_redone_without_duplicates(
+    db, monkeypatch, session_factory
+):
+    past = datetime.now(UTC) - timedelta(days=1)
+    first = await session_factory(created_at=past)
+    await session_factory(created_at=past)
+    _fake_create_collection(db, monkeypatch)
+    repo = ActivityRepository(db)
+    await repo.ensure_collection()
+    # A pod claimed the backfill, wrote part of it, and died
+    dead_claim = datetime.now(UTC) - BACKFILL_LEASE - timedelta(minutes=1)
+    await db["migrations"].update_one({"_id": BACKFILL_ID}, {"$set": {"claimed_at": dead_claim}})
+    await db["activity"].insert_one(
+        {"at": past, "meta": {"event": "created", "session_id": first["_id"], "backfill": True}}
+    )
+
+    assert await repo.backfill() == 2
+    assert await db["activity"].count_documents({"meta.event": "created"}) == 2
+
+
+async def test_backfill_claimed_by_a_live_pod_is_left_to_it(db, monkeypatch, session_factory):
+    await session_factory(created_at=datetime.now(UTC) - timedelta(days=1))
+    _fake_create_collection(db, monkeypatch)
+    repo = ActivityRepository(db)
+    await repo.ensure_collection()
+    await db["migrations"].update_one({"_id": BACKFILL_ID}, {"$set": {"claimed_at": datetime.now(UTC)}})
+
+    assert await repo.backfill() == 0
+
+
+def _fake_create_collection(db, monkeypatch) -> dict[str, dict]:
+    created: dict[str, dict] = {}
+
+    async def create_collection(name: str, **options):
+        created[name] = options  # mongomock has no time-series collections
+        return db[name]
+
+    monkeypatch.setattr(db, "create_collection", create_collection)
+    return created
@@ -0,0 +1,169 @@
+"""Analytics snapshot specifications — columns on disk, incremental refreshes, admin history."""
+
+import math
+import os
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.repositories.analytics_snapshot import PHASES, AnalyticsSnapshot
+from src.repositories.stats_repo import StatsRepository
+
+CARDS = [  # compact reactions, and the legacy layout with reaction objects
+    {"id": "c1", "column": "Went Well", "votes": ["Alice", "Bob"], "reactions": {"🎉": ["Alice", "Bob"]}},
+    {"id": "c2", "column": "To Improve", "votes": [], "reactions": [{"emoji": "👍"}]},
+    {"id": "c3", "column": "Went Well", "votes": ["Carol"], "reactions": {}},
+]
+
+
+def _columns(snapshot: AnalyticsSnapshot) -> dict | None:
+    return snapshot.read(
+        lambda c: {
+            "names": list(c.column_names),
+            **{name: c[name].tolist() for name in ("phase", "cards", "votes", "reactions", "hours_to_close")},
+            **{name: c[name].tolist() for name in ("card_session", "card_column", "card_votes")},
+        }
+    )
+
+
+async def _closed_with_cards(db, session_factory, at: datetime) -> dict:
+    doc = await session_factory(phase="closed", created_at=at - timedelta(hours=6), updated_at=at)
+    await db["sessions"].update_one({"_id": doc["_id"]}, {"$set": {"cards": CARDS}})
+    return doc
+
+
+async def test_nothing_to_read_before_the_first_refresh(tmp_path):
+    assert AnalyticsSnapshot(tmp_path).read(len) is None
+
+
+async def test_refresh_flattens_sessions_and_cards(db, session_factory, tmp_path):
+    week_ago = datetime.now(UTC) - timedelta(days=7)
+    await session_factory(created_at=week_ago, updated_at=week_ago)
+    await _closed_with_cards(db, session_factory, week_ago)
+    snapshot = AnalyticsSnapshot(tmp_path)
+
+    assert await snapshot.refresh(db["sessions"]) == 2
+
+    columns = _columns(snapshot)
+    assert columns is not None
+    assert columns["names"] == ["Went Well", "To Improve"]
+    assert [PHASES[code] for code in columns["phase"]] == ["collecting", "closed"]
+    assert columns["cards"] == [0, 3]
+    assert columns["votes"] == [0, 3]
+    assert columns["reactions"] == [0, 3]
+    assert math.isnan(columns["hours_to_close"][0])
+    assert columns["hours_to_close"][1] == 6.0
+    assert columns["card_session"] == [1, 1, 1]
+    assert columns["card_column"] == [0, 1, 0]
+    assert columns["card_votes"] == [2, 0, 1]
+
+
+async def test_refresh_rereads_only_updated_sessions_and_keeps_deleted_ones(db, session_factory, tmp_path):
+    week_ago = datetime.now(UTC) - timedelta(days=7)
+    with_cards = await _closed_with_cards(db, session_factory, week_ago)
+    changed = await session_factory(created_at=week_ago, updated_at=week_ago)
+    snapshot = AnalyticsSnapshot(tmp_path)
+    await snapshot.refresh(db["sessions"])
+
+    await db["sessions"].delete_one({"_id": with_cards["_id"]})  # expired — the snapshot keeps it
+    card = {"id": "n1", "column": "Action Items", "votes": ["Dan"]}
+    await db["sessions"].update_one(
+        {"_id": changed["_id"]}, {"$set": {"cards": [card], "updated_at": datetime.now(UTC)}}
+    )
+    await session_factory()
+
+    assert await snapshot.refresh(db["sessions"]) == 2
+
+    columns = _columns(snapshot)
+    assert columns is not None
+    assert columns["names"] == ["Went Well", "To Improve", "Action Items"]  # codes stay stable
+    assert columns["cards"] == [3, 1, 0]  # kept row first, then the ones read again
+    assert columns["card_session"] == [0, 0, 0, 1]
+    assert columns["card_column"] == [0, 1, 0, 2]
+    assert columns["card_votes"] == [2, 0, 1, 1]
+
+
+@pytest.mark.parametrize("kernel_copy", [True, False])
+async def test_rows_after_a_session_read_again_move_up(
+    db, session_factory, tmp_path, monkeypatch, kernel_copy
+):
+    if not kernel_copy:  # not Linux, or a filesystem without copy_file_range
+
+        def unsupported(*args):
+            raise OSError("copy_file_range")
+
+        monkeypatch.setattr(os, "copy_file_range", unsupported, raising=False)
+    week_ago = datetime.now(UTC) - timedelta(days=7)
+    kept = await _closed_with_cards(db, session_factory, week_ago)
+    changed = await session_factory(created_at=week_ago, updated_at=week_ago)
+    after = await _closed_with_cards(db, session_factory, week_ago)
+    snapshot = AnalyticsSnapshot(tmp_path)
+    await snapshot.refresh(db["sessions"])
+
+    await db["sessions"].update_one({"_id": changed["_id"]}, {"$set": {"updated_at": datetime.now(UTC)}})
+    assert await snapshot.refresh(db["sessions"]) == 1
+
+    columns = _columns(snapshot)
+    assert columns is not None
+    assert columns["cards"] == [3, 3, 0]  # kept, moved up, read again
+    assert columns["card_session"] == [0, 0, 0, 1, 1, 1]
+    assert columns["card_column"] == [0, 1, 0, 0, 1, 0]
+    assert columns["card_votes"] == [2, 0, 1, 2, 0, 1]
+    ids = (tmp_path / snapshot._manifest()["generation"] / "ids.json").read_text()
+    assert ids.index(str(kept["_id"])) < ids.index(str(after["_id"])) < ids.index(str(changed["_id"]))
+
+
+async def test_each_generation_is_reduced_once(db, session_factory, tmp_path):
+    await session_factory()
+    snapshot = AnalyticsSnapshot(tmp_path)
+    await snapshot.refresh(db["sessions"])
+    calls = []
+
+    def reduce(columns):
+        calls.append(columns.taken_at)
+        return len(columns["created_at"])
+
+    assert [snapshot.read(reduce), snapshot.read(reduce)] == [1, 1]
+    await session_factory()
+    await snapshot.refresh(db["sessions"])
+    assert snapshot.read(reduce) == 2
+    assert len(calls) == 2
+
+
+async def test_a_shared_directory_is_refreshed_by_one_pod_per_interval(fake_redis, tmp_path):
+    pods = [AnalyticsSnapshot(tmp_path, shared=True) for _ in range(2)]
+
+    assert [await pod.claim_refresh(fake_redis, 3600) for pod in pods] == [True, False]
+    assert 0 < await fake_redis.ttl("analytics_snapshot:refresh") <= 3540
+    assert await AnalyticsSnapshot(tmp_path).claim_refresh(fake_redis, 3600)  # each pod its own directory
+
+
+async def test_refresh_keeps_the_current_and_previous_generation(db, session_factory, tmp_path):
+    await session_factory()
+    snapshot = AnalyticsSnapshot(tmp_path)
+
+    for _ in range(3):
+        await snapshot.refresh(db["sessions"])
+
+    assert len(list(tmp_path.glob("gen-*"))) == 2
+    assert snapshot.read(lambda c: len(c["created_at"])) == 1
+
+
+async def test_admin_history_is_reduced_from_the_snapshot(db, session_factory, tmp_path):
+    week_ago = datetime.now(UTC) - timedelta(days=7)
+    await _closed_with_cards(db, session_factory, week_ago)
+    await session_factory(phase="closed", created_at=week_ago - timedelta(hours=10), updated_at=week_ago)
+    await session_factory()
+    snapshot = AnalyticsSnapshot(tmp_path)
+    await snapshot.refresh(db["sessions"])
+    await db["sessions"].delete_many({})
+
+    history = (await StatsRepository(db, snapshot=snapshot).get_admin_stats()).history
+
+    assert history is not None
+    assert (history.sessions, history.cards) == (3, 3)
+    assert [(c.column, c.count) for c in history.cards_per_column] == [("Went Well", 2), ("To Improve", 1)]
+    assert [(b.votes, b.cards) for b in history.vote_distribution] == [(0, 1), (1, 1), (2, 1)]
+    assert history.avg_time_to_close_hours == 8.0
+    assert history.median_time_to_close_hours == 8.0
+    assert (await StatsRepository(db).get_admin_stats()).history is None
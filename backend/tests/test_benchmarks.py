@@ -0,0 +1,49 @@
+"""Benchmark smoke tests — keep benchmarks/ runnable as SSEManager evolves.
+
+These only check that a tiny run completes and reports every delivery; the
+numbers themselves are meaningless at this size.
+"""
+
+import json
+
+from benchmarks.sse_fanout import Config, main, run
+
+
+async def test_sse_fanout_delivers_every_event():
+    config = Config(pods=2, clients=6, sessions=3, rate=50, duration=0.2, cards=3, fake_redis=True)
+
+    results = await run(config)
+
+    assert results.mutations == 10
+    assert results.expected_deliveries == 20  # 2 viewers per session
+    assert results.delivered == results.expected_deliveries
+    assert results.latency_ms_p50 <= results.latency_ms_p99 <= results.latency_ms_max
+    assert results.payload_bytes > 0
+
+
+def test_sse_fanout_cli_writes_json(tmp_path):
+    output = tmp_path / "result.json"
+    main(["--fake-redis", "--clients", "2", "--sessions", "1", "--duration", "0.1", "--output", str(output)])
+
+    report = json.loads(output.read_text())
+    assert report["benchmark"] == "sse_fanout"
+    assert report["config"]["clients"] == 2
+    assert report["results"]["delivered"] == report["results"]["expected_deliveries"]
+
+
+def test_domain_model_benchmark_compares_both_models():
+    from benchmarks.domain_model import run as run_domain_model
+
+    results = run_domain_model(cards=5, votes_per_card=2, number=1, repeat=1)
+
+    assert results["votes"] == 10
+    assert set(results["decode_us"]) == {
+        "pydantic",
+        "dataclass",
+        "dataclass_interned",
+        "dataclass_legacy_layout",
+        "dataclass_validated",
+    }
+    assert results["retained_kb"]["dataclass"] < results["retained_kb"]["pydantic"]
+    sizes = results["document_kb"]
+    assert sizes["interned"] < sizes["compact"] < sizes["legacy"]
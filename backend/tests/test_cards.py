@@ -2,6 +2,7 @@
 
 from httpx import AsyncClient
 
+from src.config import settings
 from tests.conftest import make_session
 
 
@@ -313,3 +314,85 @@ async def test_vote_limit_counts_group_as_one(client: AsyncClient):
     await _publish(client, session.id, card4["id"], "Bob")
     status = await _vote(client, session.id, card4["id"], "Alice")
     assert status == 409  # 2 vote items already used (group + card3)
+
+
+async def test_grouping_cards_returns_a_vote_spent_on_both(client: AsyncClient):
+    session = await make_session(client)
+    cards = [await _add_card(client, session.id, author="Bob") for _ in range(3)]
+    await _to_discussing(client, session.id, session.facilitator_token)
+    for card in cards:
+        await _publish(client, session.id, card["id"], "Bob")
+    await _set_max_votes(client, session.id, session.facilitator_token, 2)
+    await _vote(client, session.id, cards[0]["id"], "Alice")
+    await _vote(client, session.id, cards[1]["id"], "Alice")
+    assert await _vote(client, session.id, cards[2]["id"], "Alice") == 409
+
+    await client.post(
+        f"/api/v1/sessions/{session.id}/cards/{cards[0]['id']}/group",
+        json={"target_card_id": cards[1]["id"]},
+        headers={"X-Participant-Name": "Bob"},
+    )
+
+    assert await _vote(client, session.id, cards[2]["id"], "Alice") == 200
+
+
+async def test_deleting_a_voted_card_returns_the_vote(client: AsyncClient):
+    session = await make_session(client)
+    first = await _add_card(client, session.id, author="Bob")
+    second = await _add_card(client, session.id, author="Bob")
+    await _to_discussing(client, session.id, session.facilitator_token)
+    await _publish(client, session.id, first["id"], "Bob")
+    await _publish(client, session.id, second["id"], "Bob")
+    await _set_max_votes(client, session.id, session.facilitator_token, 1)
+    await _vote(client, session.id, first["id"], "Alice")
+
+    await client.delete(
+        f"/api/v1/sessions/{session.id}/cards/{first['id']}",
+        headers={"X-Participant-Name": "Bob"},
+    )
+
+    assert await _vote(client, session.id, second["id"], "Alice") == 200
+
+
+async def test_removing_a_grouped_vote_keeps_the_group_counted_while_another_remains(client: AsyncClient):
+    session = await make_session(client)
+    cards = [await _add_card(client, session.id, author="Bob") for _ in range(4)]
+    await _to_discussing(client, session.id, session.facilitator_token)
+    for card in cards:
+        await _publish(client, session.id, card["id"], "Bob")
+    await client.post(
+        f"/api/v1/sessions/{session.id}/cards/{cards[0]['id']}/group",
+        json={"target_card_id": cards[1]["id"]},
+        headers={"X-Participant-Name": "Bob"},
+    )
+    await _set_max_votes(client, session.id, session.facilitator_token, 2)
+    await _vote(client, session.id, cards[0]["id"], "Alice")
+    await _vote(client, session.id, cards[1]["id"], "Alice")  # same group — still one vote
+    await _vote(client, session.id, cards[2]["id"], "Alice")
+
+    await client.delete(
+        f"/api/v1/sessions/{session.id}/cards/{cards[0]['id']}/votes",
+        headers={"X-Participant-Name": "Alice"},
+    )
+    assert await _vote(client, session.id, cards[3]["id"], "Alice") == 409
+
+    await client.delete(
+        f"/api/v1/sessions/{session.id}/cards/{cards[1]['id']}/votes",
+        headers={"X-Participant-Name": "Alice"},
+    )
+    assert await _vote(client, session.id, cards[3]["id"], "Alice") == 200
+
+
+async def test_interned_names_are_expanded_in_responses(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(settings, "intern_participant_names", True)
+    session = await make_session(client)
+    card = await _add_card(client, session.id, author="Bob")
+    await _to_discussing(client, session.id, session.facilitator_token)
+    await _publish(client, session.id, card["id"], "Bob")
+    await _vote(client, session.id, card["id"], "Alice")
+
+    response = await client.get(f"/api/v1/sessions/{session.id}")
+
+    [loaded] = response.json()["cards"]
+    assert loaded["author_name"] == "Bob"
+    assert loaded["votes"] == [{"participant_name": "Alice"}]
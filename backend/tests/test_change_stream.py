@@ -0,0 +1,355 @@
+"""ChangeStreamWatcher specifications.
+
+mongomock does not implement change streams, so the unit tests feed the watcher
+hand-built change events through a fake stream. The last test runs against a real
+MongoDB replica set and is skipped unless MONGODB_REPLICA_SET_URL is set, e.g.:
+
+    docker run -d --name rs -p 27018:27017 mongo:7 --replSet rs0
+    docker exec rs mongosh --eval 'rs.initiate()'
+    MONGODB_REPLICA_SET_URL='mongodb://localhost:27018/?directConnection=true' uv run pytest
+"""
+
+import asyncio
+import json
+import os
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+
+from src.models.session import Session
+from src.services.change_stream import LEADER_KEY, RESUME_TOKEN_KEY, ChangeStreamWatcher
+from src.services.sse_manager import SSEManager, sse_manager
+from tests.conftest import make_session
+
+
+def _session_doc(session_id: str = "s1", name: str = "Retro") -> dict:
+    doc = Session(id=session_id, name=name).to_dict()
+    doc["_id"] = doc.pop("id")
+    return doc
+
+
+class FakeChangeStream:
+    """Minimal stand-in for AsyncIOMotorChangeStream."""
+
+    def __init__(self, changes: list[dict]) -> None:
+        self._changes = list(changes)
+
+    async def __aenter__(self) -> "FakeChangeStream":
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+    async def try_next(self) -> dict | None:
+        if self._changes:
+            return self._changes.pop(0)
+        await asyncio.sleep(0)
+        return None
+
+
+class FakeCollection:
+    def __init__(self, changes: list[dict]) -> None:
+        self.changes = changes
+        self.watch_kwargs: dict = {}
+
+    def watch(self, **kwargs: object) -> FakeChangeStream:
+        self.watch_kwargs = kwargs
+        return FakeChangeStream(self.changes)
+
+
+async def _collect_one(manager: SSEManager, session_id: str, received: list[str]) -> None:
+    async for chunk in manager.stream(session_id):
+        received.append(chunk)
+        break
+
+
+# ── Event handling ───────────────────────────────────────────────────────────
+
+
+async def test_replace_event_publishes_public_snapshot(fake_redis):
+    manager = SSEManager()
+    manager.set_client(fake_redis)
+    watcher = ChangeStreamWatcher(FakeCollection([]), fake_redis, manager)  # type: ignore[arg-type]
+    received: list[str] = []
+
+    task = asyncio.create_task(_collect_one(manager, "s1", received))
+    await asyncio.sleep(0.05)
+    await watcher.handle({"operationType": "replace", "fullDocument": _session_doc("s1", "Changed")})
+    await asyncio.wait_for(task, timeout=2.0)
+
+    data = json.loads(received[0].removeprefix("data: ").strip())
+    assert data["name"] == "Changed"
+    assert "facilitator_token" not in data
+    assert "last_accessed_at" not in data
+
+
+async def test_touch_only_update_is_not_published(fake_redis):
+    published: list[str] = []
+    manager = SSEManager()
+
+    async def record(session_id: str, data: dict) -> None:
+        published.append(session_id)
+
+    manager.publish = record  # type: ignore[method-assign]
+    watcher = ChangeStreamWatcher(FakeCollection([]), fake_redis, manager)  # type: ignore[arg-type]
+
+    await watcher.handle(
+        {
+            "operationType": "update",
+            "updateDescription": {"updatedFields": {"last_accessed_at": "now"}, "removedFields": []},
+            "fullDocument": _session_doc(),
+        }
+    )
+    await watcher.handle({"operationType": "delete", "documentKey": {"_id": "s1"}})
+    await watcher.handle({"operationType": "update", "updateDescription": {"updatedFields": {"name": "x"}}})
+
+    assert published == []
+
+
+async def test_update_with_visible_fields_is_published(fake_redis):
+    published: list[str] = []
+    manager = SSEManager()
+
+    async def record(session_id: str, data: dict) -> None:
+        published.append(session_id)
+
+    manager.publish = record  # type: ignore[method-assign]
+    watcher = ChangeStreamWatcher(FakeCollection([]), fake_redis, manager)  # type: ignore[arg-type]
+
+    await watcher.handle(
+        {
+            "operationType": "update",
+            "updateDescription": {"updatedFields": {"phase": "closed"}, "removedFields": []},
+            "fullDocument": _session_doc("s9"),
+        }
+    )
+
+    assert published == ["s9"]
+
+
+# ── Leadership + resume tokens ───────────────────────────────────────────────
+
+
+async def test_only_one_watcher_holds_leadership(fake_redis):
+    first = ChangeStreamWatcher(FakeCollection([]), fake_redis)  # type: ignore[arg-type]
+    second = ChangeStreamWatcher(FakeCollection([]), fake_redis)  # type: ignore[arg-type]
+
+    assert await first.hold_leadership() is True
+    assert await second.hold_leadership() is False
+    assert await first.hold_leadership() is True  # renewal
+
+    await first.release_leadership()
+    assert await second.hold_leadership() is True
+
+
+async def test_renewal_never_extends_a_key_another_pod_took_meanwhile(fake_redis, monkeypatch):
+    watcher = ChangeStreamWatcher(FakeCollection([]), fake_redis)  # type: ignore[arg-type]
+    await watcher.hold_leadership()
+    pipeline = fake_redis.pipeline
+
+    def racing_pipeline(*args, **kwargs):
+        pipe = pipeline(*args, **kwargs)
+        get = pipe.get
+
+        async def get_then_lose_the_key(key):
+            owner = await get(key)
+            await fake_redis.set(LEADER_KEY, "another-pod", ex=60)  # expired and retaken
+            return owner
+
+        pipe.get = get_then_lose_the_key
+        return pipe
+
+    monkeypatch.setattr(fake_redis, "pipeline", racing_pipeline)
+
+    assert await watcher.hold_leadership() is False
+    await watcher.release_leadership()
+    assert await fake_redis.get(LEADER_KEY) == b"another-pod"
+    assert await fake_redis.ttl(LEADER_KEY) > 15
+
+
+def _deletes(*tokens: str) -> list[dict]:
+    return [{"_id": {"_data": t}, "operationType": "delete", "documentKey": {"_id": "s1"}} for t in tokens]
+
+
+async def _watch_briefly(watcher: ChangeStreamWatcher) -> None:
+    """Let watch() drain the fake stream, then stop it as a shutdown would."""
+    task = asyncio.create_task(watcher.watch())
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+def _record_token_writes(fake_redis, monkeypatch) -> list[bytes]:
+    written: list[bytes] = []
+    set_ = fake_redis.set
+
+    async def recording_set(key, value, *args, **kwargs):
+        if key == RESUME_TOKEN_KEY:
+            written.append(value.encode())
+        return await set_(key, value, *args, **kwargs)
+
+    monkeypatch.setattr(fake_redis, "set", recording_set)
+    return written
+
+
+async def test_watch_stores_resume_token_and_resumes_from_it(fake_redis):
+    collection = FakeCollection(_deletes("token-1"))
+    watcher = ChangeStreamWatcher(collection, fake_redis)  # type: ignore[arg-type]
+    await watcher.hold_leadership()
+
+    await _watch_briefly(watcher)
+
+    assert await fake_redis.get(RESUME_TOKEN_KEY) == b"token-1"
+    assert collection.watch_kwargs["resume_after"] is None
+
+    await _watch_briefly(watcher)
+
+    assert collection.watch_kwargs["resume_after"] == {"_data": "token-1"}
+    assert collection.watch_kwargs["full_document"] == "updateLookup"
+
+
+async def test_watch_renews_leadership_on_a_timer_not_per_event(fake_redis, monkeypatch):
+    watcher = ChangeStreamWatcher(FakeCollection(_deletes(*map(str, range(50)))), fake_redis)  # type: ignore[arg-type]
+    await watcher.hold_leadership()
+    renewals = 0
+    hold = watcher.hold_leadership
+
+    async def counting_hold() -> bool:
+        nonlocal renewals
+        renewals += 1
+        return await hold()
+
+    monkeypatch.setattr(watcher, "hold_leadership", counting_hold)
+
+    await _watch_briefly(watcher)
+
+    assert renewals == 0  # LEADER_RENEW_SECONDS has not passed
+
+
+async def test_watch_stops_once_a_renewal_finds_the_key_taken(fake_redis, monkeypatch):
+    from src.services import change_stream
+
+    monkeypatch.setattr(change_stream, "LEADER_RENEW_SECONDS", 0)
+    monkeypatch.setattr(change_stream, "RESUME_TOKEN_SAVE_SECONDS", 60)
+    watcher = ChangeStreamWatcher(FakeCollection(_deletes("token-1")), fake_redis)  # type: ignore[arg-type]
+    await watcher.hold_leadership()
+
+    task = asyncio.create_task(watcher.watch())
+    await asyncio.sleep(0.05)
+    await fake_redis.set(LEADER_KEY, "another-pod")
+    await asyncio.wait_for(task, timeout=2.0)
+
+    assert await fake_redis.get(RESUME_TOKEN_KEY) is None  # the new leader's to write
+
+
+async def test_watch_saves_the_resume_token_every_few_events(fake_redis, monkeypatch):
+    from src.services import change_stream
+
+    monkeypatch.setattr(change_stream, "RESUME_TOKEN_SAVE_EVENTS", 3)
+    written = _record_token_writes(fake_redis, monkeypatch)
+    watcher = ChangeStreamWatcher(FakeCollection(_deletes(*"1234567")), fake_redis)  # type: ignore[arg-type]
+    await watcher.hold_leadership()
+
+    await _watch_briefly(watcher)
+
+    assert written == [b"3", b"6"]
+    assert await fake_redis.get(RESUME_TOKEN_KEY) == b"7"  # saved on the way out
+
+
+async def test_watch_saves_a_pending_resume_token_after_a_while(fake_redis, monkeypatch):
+    from src.services import change_stream
+
+    monkeypatch.setattr(change_stream, "RESUME_TOKEN_SAVE_SECONDS", 0.01)
+    watcher = ChangeStreamWatcher(FakeCollection(_deletes("token-1")), fake_redis)  # type: ignore[arg-type]
+    await watcher.hold_leadership()
+
+    task = asyncio.create_task(watcher.watch())
+    await asyncio.sleep(0.05)
+
+    assert await fake_redis.get(RESUME_TOKEN_KEY) == b"token-1"  # idle, still running
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+async def test_run_discards_expired_resume_token(fake_redis, monkeypatch):
+    from pymongo.errors import OperationFailure
+
+    from src.services import change_stream
+
+    class ExpiredTokenCollection:
+        def watch(self, **kwargs: object) -> None:
+            raise OperationFailure("history lost", code=286)
+
+    monkeypatch.setattr(change_stream, "RETRY_DELAY_SECONDS", 0.01)
+    await fake_redis.set(RESUME_TOKEN_KEY, "too-old")
+    watcher = ChangeStreamWatcher(ExpiredTokenCollection(), fake_redis)  # type: ignore[arg-type]
+
+    task = asyncio.create_task(watcher.run())
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert await fake_redis.get(RESUME_TOKEN_KEY) is None
+    assert await fake_redis.get(LEADER_KEY) is None  # released on shutdown
+
+
+# ── Handler broadcasts defer to the watcher ─────────────────────────────────
+
+
+async def test_handler_broadcast_is_skipped_in_change_stream_mode(client: AsyncClient):
+    session = await make_session(client)
+    published: list[str] = []
+    original_publish = sse_manager.publish
+
+    async def record(session_id: str, data: dict) -> None:
+        published.append(session_id)
+
+    sse_manager.publish = record  # type: ignore[method-assign]
+    sse_manager.change_stream_mode = True
+    try:
+        await client.post(
+            f"/api/v1/sessions/{session.id}/cards",
+            json={"column": "Went Well", "text": "hi", "author_name": "Alice"},
+        )
+    finally:
+        sse_manager.change_stream_mode = False
+        sse_manager.publish = original_publish  # type: ignore[method-assign]
+
+    assert published == []
+
+
+# ── Real replica set (opt-in) ────────────────────────────────────────────────
+
+
+@pytest.mark.skipif(
+    not os.environ.get("MONGODB_REPLICA_SET_URL"), reason="requires a MongoDB replica set"
+)
+async def test_replica_set_write_reaches_stream(fake_redis):  # pragma: no cover
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    from src.repositories.session_repo import SessionRepository
+
+    client: AsyncIOMotorClient = AsyncIOMotorClient(os.environ["MONGODB_REPLICA_SET_URL"])
+    db = client[f"retrospekt_test_{uuid4().hex[:8]}"]
+    repo = SessionRepository(db)
+    manager = SSEManager()
+    manager.set_client(fake_redis)
+    watcher = ChangeStreamWatcher(repo.collection, fake_redis, manager)
+    received: list[str] = []
+    try:
+        session = await repo.create(Session(id=str(uuid4()), name="Before"))
+        watch_task = asyncio.create_task(watcher.run())
+        collect_task = asyncio.create_task(_collect_one(manager, session.id, received))
+        await asyncio.sleep(1.0)
+        session.name = "After"
+        await repo.update(session)  # plain repository write, no handler broadcast
+        await asyncio.wait_for(collect_task, timeout=10.0)
+        watch_task.cancel()
+        assert json.loads(received[0].removeprefix("data: ").strip())["name"] == "After"
+    finally:
+        await client.drop_database(db.name)
+        client.close()
@@ -0,0 +1,170 @@
+"""Response compression specifications."""
+
+import gzip
+
+import brotli
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from src import compression
+from src.compression import CompressionMiddleware, negotiate
+from tests.conftest import make_session
+
+_BIG = {"cards": [{"text": f"card {i}", "votes": []} for i in range(200)]}
+
+
+def _app(*, offload_size: int = 1 << 20) -> Starlette:
+    async def big(request):
+        return JSONResponse(_BIG, headers={"ETag": '"7-1"'})
+
+    async def small(request):
+        return JSONResponse({"status": "ok"})
+
+    async def text(request):
+        return PlainTextResponse("x" * 5000)
+
+    async def chunks():
+        yield b"[" + b"1," * 2000
+        yield b""
+        yield b"1]"
+
+    async def stream(request):
+        return StreamingResponse(chunks(), media_type="application/json")
+
+    async def events(request):
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    app = Starlette(
+        routes=[
+            Route("/big", big),
+            Route("/small", small),
+            Route("/text", text),
+            Route("/stream", stream),
+            Route("/events", events),
+        ]
+    )
+    app.add_middleware(CompressionMiddleware, minimum_size=1024, offload_size=offload_size)
+    return app
+
+
+async def _get(app: Starlette, path: str, accept_encoding: str):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        return await c.get(path, headers={"Accept-Encoding": accept_encoding})
+
+
+# ── Negotiation ──────────────────────────────────────────────────────────────
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0, gzip", "gzip"),
+        ("BR;q=0.5", "br"),
+        ("*", "br"),
+        ("br;q=0, *", "gzip"),
+        ("*, br;q=0, gzip;q=0", None),
+        ("identity", None),
+        ("gzip;q=0", None),
+        ("gzip;q=nonsense", "gzip"),
+        ("", None),
+    ],
+)
+def test_negotiate_prefers_brotli_then_gzip(header: str, expected: str | None):
+    assert negotiate(header) == expected
+
+
+# ── Middleware ───────────────────────────────────────────────────────────────
+
+
+async def test_large_json_is_compressed_with_the_negotiated_encoding():
+    for coding in ("br", "gzip"):
+        before = compression.stats[coding].responses
+        response = await _get(_app(), "/big", coding)
+
+        assert response.headers["content-encoding"] == coding
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) < len(response.content)  # httpx decoded it
+        assert response.json() == _BIG
+        assert response.headers["etag"] == 'W/"7-1"'
+        assert compression.stats[coding].responses == before + 1
+
+
+async def test_compressed_bodies_decode_with_the_standard_libraries():
+    for coding, decompress in (("br", brotli.decompress), ("gzip", gzip.decompress)):
+        app = _app()
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+            async with c.stream("GET", "/big", headers={"Accept-Encoding": coding}) as response:
+                raw = b"".join([chunk async for chunk in response.aiter_raw()])
+        assert len(raw) < len(decompress(raw))
+        assert decompress(raw).startswith(b'{"cards":')
+
+
+async def test_streamed_json_is_compressed_chunk_by_chunk():
+    for coding in ("br", "gzip"):
+        response = await _get(_app(), "/stream", coding)
+
+        assert response.headers["content-encoding"] == coding
+        assert "content-length" not in response.headers
+        assert response.json() == [1] * 2001
+
+
+async def test_small_non_json_and_event_stream_responses_pass_through():
+    for path in ("/small", "/text", "/events"):
+        response = await _get(_app(), path, "gzip, br")
+        assert "content-encoding" not in response.headers, path
+
+    assert (await _get(_app(), "/big", "identity")).headers.get("content-encoding") is None
+
+
+async def test_large_bodies_are_compressed_off_the_event_loop(monkeypatch):
+    calls = []
+
+    async def to_thread(fn, *args):
+        calls.append(len(args[0]))
+        return fn(*args)
+
+    monkeypatch.setattr(compression.asyncio, "to_thread", to_thread)
+    response = await _get(_app(offload_size=2048), "/big", "gzip")
+
+    assert response.json() == _BIG
+    assert calls and calls[0] >= 2048
+
+
+# ── App wiring ───────────────────────────────────────────────────────────────
+
+
+async def test_session_etag_still_matches_after_compression(client: AsyncClient):
+    session = await make_session(client)
+    for i in range(20):
+        await client.post(
+            f"/api/v1/sessions/{session.id}/cards",
+            json={"column": "Went Well", "text": f"A card long enough to matter {i}", "author_name": "Bob"},
+        )
+    response = await client.get(f"/api/v1/sessions/{session.id}", headers={"Accept-Encoding": "br"})
+    assert response.headers["content-encoding"] == "br"
+
+    again = await client.get(
+        f"/api/v1/sessions/{session.id}",
+        headers={"Accept-Encoding": "br", "If-None-Match": response.headers["etag"]},
+    )
+
+    assert again.status_code == 304
+
+
+async def test_compression_metrics_require_an_admin_token(client: AsyncClient):
+    response = await client.get("/metrics/compression")
+
+    assert response.status_code == 401
+
+
+async def test_compression_metrics_report_ratio_per_encoding(client: AsyncClient, fake_redis):
+    await fake_redis.set("admin_token:metrics-token", "1", ex=86400)
+    response = await client.get("/metrics/compression", headers={"X-Admin-Token": "metrics-token"})
+
+    assert set(response.json()) == {"br", "gzip"}
+    assert set(response.json()["gzip"]) == {"responses", "bytes_in", "bytes_out", "ratio"}
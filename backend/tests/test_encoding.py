@@ -0,0 +1,132 @@
+"""orjson encoding specifications.
+
+Responses and SSE payloads are encoded with ``src.encoding.dumps`` instead of
+FastAPI's serializers; the JSON must decode to exactly what they produced.
+"""
+
+import json
+from datetime import UTC, datetime
+
+import pytest
+from fastapi import APIRouter, FastAPI, Response
+from httpx import ASGITransport, AsyncClient
+from pydantic import TypeAdapter
+
+from benchmarks.boards import busy_session
+from benchmarks.json_encoding import run
+from src.encoding import ORJSONRoute, dumps
+from src.models.session import Participant, SessionPhase
+from src.repositories.feedback_repo import FeedbackRepository
+from src.snapshots import public_snapshot
+from tests.conftest import make_session
+
+# ── dumps ────────────────────────────────────────────────────────────────────
+
+
+def test_dumps_writes_utc_datetimes_with_z_suffix():
+    assert dumps({"at": datetime(2025, 1, 1, 12, 0, tzinfo=UTC)}) == b'{"at":"2025-01-01T12:00:00Z"}'
+
+
+def test_dumps_keeps_naive_datetimes_without_offset():
+    assert dumps(datetime(2025, 1, 1, 12, 0, 0, 500)) == b'"2025-01-01T12:00:00.000500"'
+
+
+def test_dumps_encodes_enums_and_models():
+    at = datetime(2025, 1, 1, tzinfo=UTC)
+    assert json.loads(dumps({"phase": SessionPhase.CLOSED, "who": Participant(name="Al", joined_at=at)})) == {
+        "phase": "closed",
+        "who": {"name": "Al", "joined_at": "2025-01-01T00:00:00Z"},
+    }
+
+
+def test_dumps_rejects_unknown_types():
+    with pytest.raises(TypeError):
+        dumps({"x": object()})
+
+
+def test_dumps_matches_pydantic_json_serialization_for_a_board():
+    board = public_snapshot(busy_session("s1", cards=20))
+
+    assert json.loads(dumps(board)) == TypeAdapter(dict).dump_python(board, mode="json")
+
+
+# ── Routes ───────────────────────────────────────────────────────────────────
+
+
+async def test_routes_keep_their_status_codes(client: AsyncClient):
+    session = await make_session(client)
+
+    created = await client.post(
+        f"/api/v1/sessions/{session.id}/cards",
+        json={"column": "Went Well", "text": "hi", "author_name": "Alice"},
+    )
+    deleted = await client.delete(
+        f"/api/v1/sessions/{session.id}/cards/{created.json()['id']}",
+        headers={"X-Participant-Name": "Alice"},
+    )
+
+    assert created.status_code == 201
+    assert created.headers["content-type"] == "application/json"
+    assert deleted.status_code == 204
+    assert deleted.content == b""
+
+
+async def test_session_response_is_orjson_encoded(client: AsyncClient):
+    session = await make_session(client)
+
+    response = await client.get(f"/api/v1/sessions/{session.id}")
+
+    assert response.content == dumps(response.json())
+    assert "facilitator_token" not in response.json()
+
+
+# ── Benchmark smoke test ─────────────────────────────────────────────────────
+
+
+def test_json_encoding_benchmark_reports_every_encoder():
+    results = run(cards=5, number=1, repeat=1)
+
+    assert results["relative_to_orjson"]["orjson"] == 1.0
+    assert set(results["us_per_encode"]) == {
+        "http_jsonable_encoder",
+        "http_pydantic",
+        "sse_json_dumps",
+        "orjson",
+    }
+
+
+# ── Routes ───────────────────────────────────────────────────────────────────
+
+
+async def test_board_routes_keep_the_status_and_headers_of_an_injected_response():
+    router = APIRouter(route_class=ORJSONRoute)
+
+    @router.get("/board")
+    async def board(response: Response) -> dict:
+        response.status_code = 202
+        response.headers["X-Board"] = "1"
+        return {"ok": True}
+
+    app = FastAPI()
+    app.include_router(router)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as http:
+        response = await http.get("/board")
+
+    assert (response.status_code, response.headers["x-board"], response.json()) == (202, "1", {"ok": True})
+
+
+async def test_other_routes_are_validated_against_their_response_model(
+    client: AsyncClient, fake_redis, monkeypatch
+):
+    async def list_feedback(self, limit: int = 100) -> list[dict]:
+        return [{"rating": 5, "internal": "not for clients"}]
+
+    monkeypatch.setattr(FeedbackRepository, "list_feedback", list_feedback)
+    await fake_redis.set("admin_token:t", "1")
+
+    response = await client.get("/api/v1/feedback", headers={"X-Admin-Token": "t"})
+
+    assert response.status_code == 200
+    assert response.content == dumps(response.json())
+    [entry] = response.json()
+    assert entry["rating"] == 5 and "internal" not in entry and "created_at" in entry
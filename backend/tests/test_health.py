@@ -1,9 +1,26 @@
-"""Health endpoint specification."""
+"""Health and readiness endpoint specifications."""
 
 from httpx import AsyncClient
 
+from src.services.sse_manager import sse_manager
+
 
 async def test_health_returns_ok(client: AsyncClient):
     response = await client.get("/health")
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
+
+
+async def test_ready_reports_ready(client: AsyncClient):
+    response = await client.get("/ready")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready"}
+
+
+async def test_ready_fails_while_draining(client: AsyncClient):
+    sse_manager.draining = True
+    try:
+        response = await client.get("/ready")
+    finally:
+        sse_manager.draining = False
+    assert response.status_code == 503
@@ -0,0 +1,188 @@
+"""Index registry specifications.
+
+mongomock builds indexes but does not plan queries, so the advisor is tested on
+hand-built explain results here, and each registered query is checked to have an
+index that leads with one of its fields. The last test explains every registered
+query on a real MongoDB and is skipped unless MONGODB_TEST_URL is set, e.g.:
+
+    docker run -d --name mongo -p 27017:27017 mongo:7
+    MONGODB_TEST_URL='mongodb://localhost:27017' uv run pytest tests/test_indexes.py
+"""
+
+import asyncio
+import os
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from uuid import uuid4
+
+from mongomock_motor import AsyncMongoMockClient
+
+from src.repositories import indexes
+from src.repositories.activity_repo import BACKFILL_ID, ActivityRepository
+from src.repositories.analytics_snapshot import AnalyticsSnapshot
+from src.repositories.indexes import INDEXES, QUERIES, advise, ensure_indexes, plan_stages
+from src.repositories.session_repo import SessionRepository
+from tests.conftest import make_session, requires_mongo
+
+
+def _find_explain(*stages: str) -> dict:
+    plan: dict = {}
+    for stage in reversed(stages):
+        plan = {"stage": stage, "inputStage": plan} if plan else {"stage": stage}
+    return {"queryPlanner": {"winningPlan": plan}, "ok": 1.0}
+
+
+# ── Registry ─────────────────────────────────────────────────────────────────
+
+
+async def test_ensure_indexes_builds_every_registered_index(db):
+    await ensure_indexes(db)
+
+    for spec in INDEXES:
+        info = await db[spec.collection].index_information()
+        assert list(info[spec.name]["key"]) == list(spec.keys), spec.name
+
+
+def test_every_registered_query_has_an_index_leading_with_one_of_its_fields():
+    for query in QUERIES:
+        if query.scans:
+            assert not query.filter and not query.sort, query.name
+            continue
+        fields = set(query.filter) | {field for field, _ in query.sort}
+        # Every collection has its _id index
+        leading = {"_id"} | {spec.keys[0][0] for spec in INDEXES if spec.collection == query.collection}
+        assert fields & leading, query.name
+
+
+# Values blanked, range operators merged: what decides the plan
+_RANGE = {"$gt", "$gte", "$lt", "$lte"}
+_FILTERED = ("find_one", "find_one_and_update", "update_one", "update_many", "delete_many", "replace_one")
+
+
+def _shape(value: Any) -> Any:
+    if isinstance(value, dict):
+        return tuple(sorted({("$range" if k in _RANGE else k): _shape(v) for k, v in value.items()}.items()))
+    return "?"
+
+
+def _record_queries(monkeypatch) -> set[tuple]:
+    """(collection, filter shape, sort) of every query sent from now on."""
+    sent: set[tuple] = set()
+    collection_class = type(AsyncMongoMockClient()["db"]["c"])
+
+    def find(self, filter=None, *args, _original=collection_class.find, **kwargs):
+        sent.add((self.name, _shape(filter or {}), tuple(kwargs.get("sort") or ())))
+        return _original(self, filter, *args, **kwargs)
+
+    def aggregate(self, pipeline, *args, _original=collection_class.aggregate, **kwargs):
+        match = pipeline[0].get("$match", {})
+        after = pipeline[1 if "$match" in pipeline[0] else 0] if len(pipeline) > 1 else {}
+        sent.add((self.name, _shape(match), tuple(after.get("$sort", {}).items())))
+        return _original(self, pipeline, *args, **kwargs)
+
+    monkeypatch.setattr(collection_class, "find", find)
+    monkeypatch.setattr(collection_class, "aggregate", aggregate)
+    for method in (*_FILTERED, "count_documents"):
+
+        async def filtered(self, filter, *args, _original=getattr(collection_class, method), **kwargs):
+            sent.add((self.name, _shape(filter), ()))
+            return await _original(self, filter, *args, **kwargs)
+
+        monkeypatch.setattr(collection_class, method, filtered)
+    return sent
+
+
+async def test_the_repositories_send_exactly_the_registered_queries(
+    client, db, fake_redis, monkeypatch, session_factory, tmp_path
+):
+    sent = _record_queries(monkeypatch)
+    await fake_redis.set("admin_token:t", "1")
+    admin = {"X-Admin-Token": "t"}
+    # A backfill to run: sessions older than the activity collection
+    await session_factory(created_at=datetime.now(UTC) - timedelta(days=3))
+    await db["migrations"].insert_one({"_id": BACKFILL_ID, "cutoff": datetime.now(UTC), "done": False})
+    await ActivityRepository(db).backfill()
+
+    session = await make_session(client)
+    base = f"/api/v1/sessions/{session.id}"
+    await client.get(base)
+    await client.post(f"{base}/join", json={"participant_name": "Bob"})
+    stream = asyncio.create_task(client.get(f"{base}/stream?join=Carol"))
+    await asyncio.sleep(0.1)
+    stream.cancel()
+    card = await client.post(f"{base}/cards", json={"column": "Went Well", "text": "t", "author_name": "Bob"})
+    await client.post(f"{base}/cards/{card.json()['id']}/votes", headers={"X-Participant-Name": "Bob"})
+    await client.post("/api/v1/feedback", json={"rating": 5})
+    await client.get("/api/v1/feedback", headers=admin)
+
+    await client.get("/api/v1/stats")
+    await client.get("/api/v1/stats/sessions", params={"from": "2025-01-01", "to": "2025-01-31"})
+    await client.get("/api/v1/stats/admin", headers=admin)
+    await client.get("/api/v1/stats/admin", params={"from": "2025-01-01", "to": "2025-01-31"}, headers=admin)
+    await client.get("/api/v1/stats/admin/export", headers=admin)
+    snapshot = AnalyticsSnapshot(tmp_path)
+    await snapshot.refresh(db["sessions"])  # the first reads every session
+    await snapshot.refresh(db["sessions"])
+    await SessionRepository(db).delete_stale(older_than=datetime.now(UTC))
+
+    registered = {(q.collection, _shape(q.filter), q.sort) for q in QUERIES}
+    assert sent - registered == set(), "sent but not registered"
+    assert registered - sent == set(), "registered but never sent"
+
+
+# ── Advisor ──────────────────────────────────────────────────────────────────
+
+
+def test_plan_stages_walks_find_and_time_series_plans():
+    time_series = {
+        "stages": [
+            {"$cursor": {"queryPlanner": {"winningPlan": {"queryPlan": {"stage": "CLUSTERED_IXSCAN"}}}}},
+            {"$_internalUnpackBucket": {}},
+        ]
+    }
+    or_plan = {"winningPlan": {"stage": "OR", "inputStages": [{"stage": "IXSCAN"}, {"stage": "COLLSCAN"}]}}
+
+    assert list(plan_stages(_find_explain("FETCH", "IXSCAN"))) == ["FETCH", "IXSCAN"]
+    assert list(plan_stages(time_series)) == ["CLUSTERED_IXSCAN"]
+    assert list(plan_stages(or_plan)) == ["OR", "IXSCAN", "COLLSCAN"]
+
+
+async def test_advise_reports_queries_that_scan_a_collection(db, monkeypatch):
+    explained = []
+
+    async def command(cmd: dict) -> dict:
+        explained.append(cmd["explain"])
+        if cmd["explain"].get("sort") == {"created_at": -1}:
+            return _find_explain("SORT", "COLLSCAN")
+        return _find_explain("FETCH", "IXSCAN")
+
+    monkeypatch.setattr(db, "command", command)  # mongomock cannot explain
+
+    findings = await advise(db)
+
+    assert len(explained) == len([query for query in QUERIES if not query.scans])
+    assert {"find": "feedback", "filter": {}, "sort": {"created_at": -1}} in explained
+    assert {"find": "feedback", "filter": {}} not in explained  # registered as a scan
+    assert findings == [
+        {
+            "query": "recent feedback (list_feedback, admin stats)",
+            "collection": "feedback",
+            "stages": ["SORT", "COLLSCAN"],
+        }
+    ]
+
+
+# ── Real MongoDB (opt-in) ────────────────────────────────────────────────────
+
+
+@requires_mongo
+async def test_no_registered_query_scans_a_collection():  # pragma: no cover
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    name = f"retrospekt_test_{uuid4().hex[:8]}"
+    client: AsyncIOMotorClient = AsyncIOMotorClient(os.environ["MONGODB_TEST_URL"])
+    try:
+        assert await indexes._run(os.environ["MONGODB_TEST_URL"], name) == []
+    finally:
+        await client.drop_database(name)
+        client.close()
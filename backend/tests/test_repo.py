@@ -2,16 +2,20 @@
 
 from datetime import UTC, datetime, timedelta
 
+import pytest
 import pytest_asyncio
 from mongomock_motor import AsyncMongoMockClient
+from pydantic import ValidationError
 
-from src.models.session import Session
+from src.config import settings
+from src.database import CLIENT_OPTIONS
+from src.models.session import Card, Note, Participant, Session, SessionPhase, TimerState
 from src.repositories.session_repo import SessionRepository
 
 
 @pytest_asyncio.fixture
 async def repo():
-    client = AsyncMongoMockClient()
+    client = AsyncMongoMockClient(**CLIENT_OPTIONS)
     yield SessionRepository(client["retrospekt"])
 
 
@@ -47,3 +51,229 @@ async def test_delete_stale_returns_zero_when_nothing_qualifies(repo: SessionRep
     await _create(repo, name="Fresh")
     deleted = await repo.delete_stale(older_than=datetime.now(UTC) - timedelta(days=90))
     assert deleted == 0
+
+
+async def test_add_participant_appends_once(repo: SessionRepository):
+    session = await _create(repo, name="Join")
+
+    joined = await repo.add_participant(session.id, Participant(name="Bob"))
+    again = await repo.add_participant(session.id, Participant(name="Bob"))
+
+    assert joined is not None
+    assert [p.name for p in joined.participants] == ["Bob"]
+    assert again is None
+    assert await repo.add_participant("no-such-id", Participant(name="Bob")) is None
+
+
+# ── Document decoding ────────────────────────────────────────────────────────
+
+
+async def test_round_trip_preserves_nested_state(repo: SessionRepository):
+    session = Session(id="s-round", name="Round")
+    session.cards.append(
+        Card(
+            column="Went Well",
+            text="Ship it",
+            author_name="Alice",
+            votes={"Bob": None},
+            reactions={"🎉": {"Bob": None}},
+        )
+    )
+    session.notes.append(Note(text="note", author_name="Alice"))
+    session.timer = TimerState(duration_seconds=60, started_at=datetime.now(UTC))
+    await repo.create(session)
+
+    loaded = await repo.get_by_id("s-round")
+
+    assert loaded is not None
+    card = loaded.cards[0]
+    assert card.text == "Ship it"
+    assert list(card.votes) == ["Bob"]
+    assert card.reactions == {"🎉": {"Bob": None}}
+    assert loaded.notes[0].text == "note"
+    assert loaded.timer is not None and loaded.timer.duration_seconds == 60
+    assert loaded.timer.started_at is not None and loaded.timer.started_at.utcoffset() == timedelta(0)
+    assert loaded.phase is SessionPhase.COLLECTING
+
+
+async def test_votes_and_reactions_keep_the_order_they_were_cast(repo: SessionRepository):
+    session = Session(id="s-order", name="Order")
+    card = Card(column="Went Well", text="t", author_name="Ann")
+    session.add_card(card)
+    for name in ("Eve", "Bob", "Ann"):
+        session.add_vote(card, name)
+    for emoji, name in (("👀", "Eve"), ("🎉", "Bob"), ("👀", "Ann")):
+        card.add_reaction(emoji, name)
+    await repo.create(session)
+
+    loaded = await repo.get_by_id("s-order")
+
+    assert loaded is not None
+    data = loaded.cards[0].to_dict()
+    assert [v["participant_name"] for v in data["votes"]] == ["Eve", "Bob", "Ann"]
+    assert [(r["emoji"], r["participant_name"]) for r in data["reactions"]] == [
+        ("👀", "Eve"),
+        ("👀", "Ann"),  # grouped by emoji, in order of each emoji's first reaction
+        ("🎉", "Bob"),
+    ]
+
+
+async def test_legacy_document_gets_defaults_for_newer_fields(repo: SessionRepository):
+    now = datetime.now(UTC)
+    await repo.collection.insert_one(
+        {
+            "_id": "s-legacy",
+            "name": "Legacy",
+            "phase": "discussing",
+            "facilitator_token": "tok",
+            "cards": [
+                {"id": "c1", "column": "Went Well", "text": "t", "author_name": "A", "created_at": now}
+            ],
+            "timer": {"duration_seconds": 30, "started_at": datetime(2025, 1, 1, 12, 0)},
+            "created_at": now,
+            "updated_at": now,
+            "last_accessed_at": now,
+        }
+    )
+
+    loaded = await repo.get_by_id("s-legacy")
+
+    assert loaded is not None
+    assert loaded.phase is SessionPhase.DISCUSSING
+    assert loaded.notes == [] and loaded.column_sorts == {} and loaded.version == 0
+    assert loaded.cards[0].votes == {} and loaded.cards[0].reactions == {}
+    assert loaded.timer is not None and loaded.timer.started_at == datetime(2025, 1, 1, 12, 0, tzinfo=UTC)
+
+
+async def test_legacy_vote_layout_loads_and_is_compacted_on_write(repo: SessionRepository):
+    now = datetime.now(UTC)
+    legacy_card = {"column": "Went Well", "text": "t", "author_name": "A", "created_at": now}
+    await repo.collection.insert_one(
+        {
+            "_id": "s-votes",
+            "name": "Votes",
+            "cards": [
+                {
+                    **legacy_card,
+                    "id": "c1",
+                    "group_id": "g",
+                    "votes": [{"participant_name": "Bob"}, {"participant_name": "Eve"}],
+                    "reactions": [
+                        {"emoji": "🎉", "participant_name": "Bob"},
+                        {"emoji": "🎉", "participant_name": "Eve"},
+                    ],
+                },
+                {**legacy_card, "id": "c2", "group_id": "g", "votes": [{"participant_name": "Bob"}]},
+            ],
+        }
+    )
+
+    loaded = await repo.get_by_id("s-votes")
+    assert loaded is not None
+    assert list(loaded.cards[0].votes) == ["Bob", "Eve"]
+    assert {e: list(names) for e, names in loaded.cards[0].reactions.items()} == {"🎉": ["Bob", "Eve"]}
+    assert loaded.vote_tally == {"Bob": 1, "Eve": 1}  # one group, counted once
+
+    await repo.update(loaded)
+    doc = await repo.collection.find_one({"_id": "s-votes"})
+
+    assert doc["cards"][0]["votes"] == ["Bob", "Eve"]
+    assert doc["cards"][0]["reactions"] == {"🎉": ["Bob", "Eve"]}
+    assert doc["vote_tally"] == {"Bob": 1, "Eve": 1}
+
+
+async def test_validation_mode_reads_the_legacy_vote_layout(repo: SessionRepository, monkeypatch):
+    await repo.collection.insert_one(
+        {
+            "_id": "s-legacy-votes",
+            "name": "Legacy votes",
+            "cards": [
+                {
+                    "id": "c1",
+                    "column": "Went Well",
+                    "text": "t",
+                    "author_name": "A",
+                    "votes": [{"participant_name": "Bob"}],
+                    "reactions": [{"emoji": "👀", "participant_name": "Bob"}],
+                }
+            ],
+        }
+    )
+    monkeypatch.setattr(settings, "validate_session_documents", True)
+
+    loaded = await repo.get_by_id("s-legacy-votes")
+
+    assert loaded is not None
+    assert list(loaded.cards[0].votes) == ["Bob"]
+    assert loaded.cards[0].reactions == {"👀": {"Bob": None}}
+    assert loaded.vote_tally == {"Bob": 1}
+
+
+async def test_interned_names_are_stored_once_and_read_either_way(repo: SessionRepository, monkeypatch):
+    session = Session(id="s-interned", name="Interned")
+    card = Card(id="c1", column="Went Well", text="t", author_name="Ann", assignee="Bob")
+    session.add_card(card)
+    session.add_vote(card, "Bob")
+    session.add_vote(card, "Eve")
+    card.add_reaction("🎉", "Ann")
+    monkeypatch.setattr(settings, "intern_participant_names", True)
+
+    await repo.create(session)
+    doc = await repo.collection.find_one({"_id": "s-interned"})
+    names = doc["name_table"]
+
+    assert sorted(names) == ["Ann", "Bob", "Eve"]
+    assert [names[i] for i in doc["cards"][0]["votes"]] == ["Bob", "Eve"]
+    assert names[doc["cards"][0]["assignee"]] == "Bob"
+    assert doc["vote_tally"] == {"Bob": 1, "Eve": 1}
+
+    # Still readable with the setting off, trusted or validated, and rewritten with names
+    monkeypatch.setattr(settings, "intern_participant_names", False)
+    for validate in (False, True):
+        monkeypatch.setattr(settings, "validate_session_documents", validate)
+        loaded = await repo.get_by_id("s-interned")
+        assert loaded is not None
+        [read] = loaded.cards
+        assert (read.author_name, read.assignee, list(read.votes)) == ("Ann", "Bob", ["Bob", "Eve"])
+        assert read.reactions == {"🎉": {"Ann": None}}
+    await repo.update(loaded)
+    doc = await repo.collection.find_one({"_id": "s-interned"})
+
+    assert "name_table" not in doc
+    assert doc["cards"][0]["author_name"] == "Ann"
+
+
+async def test_loaded_datetimes_are_utc_aware(repo: SessionRepository):
+    await repo.collection.insert_one(
+        {"_id": "s-naive", "name": "Naive", "created_at": datetime(2025, 1, 1, 12, 0)}
+    )
+
+    loaded = await repo.get_by_id("s-naive")
+
+    assert loaded is not None
+    assert loaded.created_at == datetime(2025, 1, 1, 12, 0, tzinfo=UTC)  # codec, not a fix-up
+
+
+async def test_validation_mode_rejects_malformed_documents(repo: SessionRepository, monkeypatch):
+    await repo.collection.insert_one(
+        {"_id": "s-bad", "name": "Bad", "max_votes_per_participant": "many"}
+    )
+
+    trusted = await repo.get_by_id("s-bad")
+    monkeypatch.setattr(settings, "validate_session_documents", True)
+    with pytest.raises(ValidationError):
+        await repo.get_by_id("s-bad")
+
+    assert trusted is not None
+    assert trusted.max_votes_per_participant == "many"  # trusted loads copy values as-is
+
+
+async def test_validation_mode_loads_well_formed_documents(repo: SessionRepository, monkeypatch):
+    session = await _create(repo, name="Valid")
+    monkeypatch.setattr(settings, "validate_session_documents", True)
+
+    loaded = await repo.get_by_id(session.id)
+
+    assert isinstance(loaded, Session)
+    assert loaded.name == "Valid"
+    assert loaded.phase is SessionPhase.COLLECTING
@@ -0,0 +1,131 @@
+"""Session model specifications — lookup indexes and the mutations that keep them current."""
+
+import random
+
+from src.models.session import Card, Note, Session
+
+
+def _board(*group_ids: str | None) -> Session:
+    session = Session(id="s", name="Board")
+    session.cards = [
+        Card(id=f"c{i}", column="Went Well", text="t", author_name="A", group_id=group_id)
+        for i, group_id in enumerate(group_ids)
+    ]
+    return session
+
+
+# ── Lookups ──────────────────────────────────────────────────────────────────
+
+
+def test_card_and_note_lookups_follow_additions_and_removals():
+    session = _board(None, None)
+    assert session.card("c1") is session.cards[1]
+    assert session.card("nope") is None
+
+    added = Card(id="new", column="Went Well", text="t", author_name="A")
+    session.add_card(added)
+    session.remove_cards([session.cards[0]])
+
+    assert session.card("new") is added
+    assert session.card("c0") is None
+    assert [c.id for c in session.cards] == ["c1", "new"]
+
+    note = Note(id="n1", text="t", author_name="A")
+    assert session.note("n1") is None
+    session.add_note(note)
+    assert session.note("n1") is note
+    session.remove_note(note)
+    assert session.note("n1") is None and session.notes == []
+
+
+def test_group_lists_members_in_board_order():
+    session = _board("g", None, "g")
+
+    assert [c.id for c in session.group("g")] == ["c0", "c2"]
+    assert session.group("other") == []
+
+
+# ── Groups ───────────────────────────────────────────────────────────────────
+
+
+def test_set_group_moves_a_card_and_dissolves_a_group_left_with_one_card():
+    session = _board("g", "g", None)
+    c0, c1, c2 = session.cards
+
+    session.set_group(c0, "h")
+    session.set_group(c2, "h")
+
+    assert c1.group_id is None  # last card of "g"
+    assert session.group("g") == []
+    assert session.group("h") == [c0, c2]
+
+
+def test_added_cards_join_the_group_index():
+    session = _board("g", "g")
+    session.group("g")  # build the index
+
+    session.add_card(Card(id="late", column="Went Well", text="t", author_name="A", group_id="g"))
+    session.remove_cards([session.cards[0]])
+
+    assert [c.id for c in session.group("g")] == ["c1", "late"]
+
+
+# ── Vote tally ───────────────────────────────────────────────────────────────
+
+
+def test_regrouping_and_removing_cards_keep_the_vote_tally_current():
+    session = _board(None, None, None)
+    c0, c1, c2 = session.cards
+    for card in (c0, c1, c2):
+        session.add_vote(card, "Bob")
+    assert session.votes_used("Bob") == 3
+
+    session.set_group(c0, "g")
+    session.set_group(c1, "g")
+    assert session.votes_used("Bob") == 2
+
+    session.remove_cards([c2])
+    assert session.votes_used("Bob") == 1
+
+    session.remove_vote(c0, "Bob")
+    assert session.votes_used("Bob") == 1  # still voting on the group through c1
+    session.remove_vote(c1, "Bob")
+    assert session.votes_used("Bob") == 0
+
+
+def test_the_incremental_tally_matches_a_recount_through_random_edits():
+    rng = random.Random(7)
+    session = _board(*(rng.choice([None, "g", "h"]) for _ in range(12)))
+    session.recount_votes()
+    for _ in range(300):
+        card = rng.choice(session.cards)
+        action = rng.random()
+        if action < 0.4:
+            session.add_vote(card, rng.choice(["Bob", "Eve", "Zoe"]))
+        elif action < 0.8:
+            session.set_group(card, rng.choice([None, "g", "h", "i"]))
+        elif len(session.cards) > 4:
+            session.remove_cards([card])
+        else:
+            session.add_card(Card(id=f"n{_}", column="Went Well", text="t", author_name="A"))
+        tally = dict(session.vote_tally)
+        session.recount_votes()
+        assert tally == session.vote_tally
+
+
+def test_regrouping_reads_only_the_cards_it_moves_between():
+    session = _board("g", "g", *([None] * 50))
+    session.group("g")  # build the index
+    seen = []
+
+    class Spy(dict):
+        def __iter__(self):
+            seen.append(self)
+            return super().__iter__()
+
+    for card in session.cards:
+        card.votes = Spy(card.votes)
+    session.set_group(session.cards[2], "g")
+    session.set_group(session.cards[0], None)
+
+    assert len(seen) == 2 * 3 * 2  # per move: the group's three cards, before and after
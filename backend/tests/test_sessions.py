@@ -189,3 +189,56 @@ async def test_update_session_clears_max_votes(client: AsyncClient):
     )
     assert response.status_code == 200
     assert response.json()["max_votes_per_participant"] is None
+
+
+# ── Conditional GET (ETag / If-None-Match) ───────────────────────────────────
+
+
+async def test_get_session_sends_a_revalidated_etag(client: AsyncClient):
+    session = await make_session(client)
+    response = await client.get(f"/api/v1/sessions/{session.id}")
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["cache-control"] == "no-cache"
+
+
+async def test_matching_if_none_match_returns_304_without_a_body(client: AsyncClient, db):
+    session = await make_session(client)
+    etag = (await client.get(f"/api/v1/sessions/{session.id}")).headers["etag"]
+    before = (await db["sessions"].find_one({"_id": session.id}))["last_accessed_at"]
+
+    response = await client.get(f"/api/v1/sessions/{session.id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert (await db["sessions"].find_one({"_id": session.id}))["last_accessed_at"] >= before
+
+
+async def test_if_none_match_accepts_lists_weak_tags_and_wildcard(client: AsyncClient):
+    session = await make_session(client)
+    etag = (await client.get(f"/api/v1/sessions/{session.id}")).headers["etag"]
+
+    for header in (f'"stale", {etag}', f"W/{etag}", "*"):
+        response = await client.get(f"/api/v1/sessions/{session.id}", headers={"If-None-Match": header})
+        assert response.status_code == 304, header
+
+
+async def test_a_write_changes_the_etag(client: AsyncClient):
+    session = await make_session(client)
+    etag = (await client.get(f"/api/v1/sessions/{session.id}")).headers["etag"]
+    await client.patch(
+        f"/api/v1/sessions/{session.id}",
+        json={"name": "Renamed"},
+        headers={"X-Facilitator-Token": session.facilitator_token},
+    )
+
+    response = await client.get(f"/api/v1/sessions/{session.id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "Renamed"
+    assert response.headers["etag"] != etag
+
+
+async def test_if_none_match_on_unknown_session_returns_404(client: AsyncClient):
+    response = await client.get("/api/v1/sessions/does-not-exist", headers={"If-None-Match": "*"})
+    assert response.status_code == 404
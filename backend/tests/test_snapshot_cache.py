@@ -0,0 +1,140 @@
+"""Public snapshot cache specifications.
+
+public_snapshot() encodes a session once per write: the snapshot is cached under the
+session's (version, updated_at), and dumps() reuses its bytes for the broadcast,
+the response and later stream bootstraps.
+"""
+
+from httpx import AsyncClient
+
+from benchmarks.boards import busy_session
+from src import snapshots
+from src.config import settings
+from src.encoding import EncodedDict, dumps
+from src.models.session import Card, Note, Participant, Session
+from src.repositories.session_repo import SessionRepository
+from src.snapshots import public_snapshot, public_snapshot_chunks
+from tests.conftest import make_session
+
+# ── Cache keys ───────────────────────────────────────────────────────────────
+
+
+def test_same_version_returns_cached_snapshot():
+    session = Session(id="cache-1", name="Retro")
+
+    first = public_snapshot(session)
+
+    assert public_snapshot(session) is first
+    assert dumps(first) is first.encoded  # reused, not re-encoded
+
+
+async def test_write_invalidates_and_reload_hits_cache(db):
+    repo = SessionRepository(db)
+    session = await repo.create(Session(id="cache-2", name="Retro"))
+    before = public_snapshot(session)
+
+    session.cards.append(Card(column="Went Well", text="new", author_name="Alice"))
+    session = await repo.update(session)
+    after_write = public_snapshot(session)
+    reloaded = await repo.get_by_id("cache-2")
+
+    assert after_write is not before
+    assert after_write["cards"][0]["text"] == "new"
+    assert reloaded is not None
+    assert public_snapshot(reloaded) is after_write  # GET after the write shares its encoding
+
+
+async def test_add_participant_bumps_version(db):
+    repo = SessionRepository(db)
+    session = await repo.create(Session(id="cache-3", name="Retro"))
+
+    joined = await repo.add_participant("cache-3", Participant(name="Bob"))
+
+    assert joined is not None
+    assert joined.version == session.version + 1
+    assert [p["name"] for p in public_snapshot(joined)["participants"]] == ["Bob"]
+
+
+def test_least_recently_used_sessions_are_evicted(monkeypatch):
+    monkeypatch.setattr(snapshots, "SNAPSHOT_CACHE_SIZE", 2)
+    monkeypatch.setattr(snapshots, "_snapshots", type(snapshots._snapshots)())
+    a, b, c = (Session(id=f"lru-{i}", name="Retro") for i in range(3))
+
+    snapshot_a = public_snapshot(a)
+    public_snapshot(b)
+    public_snapshot(a)  # a is now most recently used
+    public_snapshot(c)
+
+    assert set(snapshots._snapshots) == {"lru-0", "lru-2"}
+    assert public_snapshot(a) is snapshot_a
+
+
+def test_cache_is_bounded_by_encoded_size(monkeypatch):
+    monkeypatch.setattr(snapshots, "_snapshots", type(snapshots._snapshots)())
+    small = Session(id="bytes-0", name="Retro")
+    size = len(public_snapshot(small).encoded)
+    monkeypatch.setattr(settings, "snapshot_cache_bytes", 2 * size + 1)
+    public_snapshot(Session(id="bytes-1", name="Retro"))
+    public_snapshot(Session(id="bytes-2", name="Retro"))  # over budget — the oldest goes
+
+    large = busy_session("bytes-3", cards=5)
+    public_snapshot(large)  # larger than the whole budget — not cached
+
+    assert set(snapshots._snapshots) == {"bytes-1", "bytes-2"}
+    assert snapshots._snapshots.size_bytes == 2 * size
+
+
+# ── Routes ───────────────────────────────────────────────────────────────────
+
+
+async def test_version_is_not_exposed(client: AsyncClient):
+    session = await make_session(client)
+
+    response = await client.get(f"/api/v1/sessions/{session.id}")
+
+    assert "version" not in response.json()
+
+
+def test_snapshot_is_an_encoded_dict():
+    snapshot = public_snapshot(Session(id="cache-4", name="Retro"))
+
+    assert isinstance(snapshot, EncodedDict)
+    assert dumps(dict(snapshot)) == snapshot.encoded
+
+
+# ── Streamed snapshots ───────────────────────────────────────────────────────
+
+
+def test_chunks_join_to_the_cached_encoding(monkeypatch):
+    monkeypatch.setattr(snapshots, "STREAM_CHUNK_ITEMS", 3)
+    session = busy_session("stream-1", cards=10)
+    session.notes = [Note(text=f"note {i}", author_name="Alice") for i in range(4)]
+
+    chunks = list(public_snapshot_chunks(session))
+
+    assert b"".join(chunks) == dumps(public_snapshot(session))
+    assert len(chunks) == 1 + 4 + 1 + 2 + 1  # head, card chunks, separator, note chunks, tail
+
+
+def test_chunks_of_an_empty_board_join_to_the_cached_encoding():
+    session = Session(id="stream-2", name="Empty")
+
+    assert b"".join(public_snapshot_chunks(session)) == dumps(public_snapshot(session))
+
+
+async def test_large_boards_are_streamed_and_not_cached(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(settings, "stream_session_min_cards", 2)
+    session = await make_session(client)
+    for text in ("one", "two"):
+        await client.post(
+            f"/api/v1/sessions/{session.id}/cards",
+            json={"column": "Went Well", "text": text, "author_name": "Bob"},
+        )
+    snapshots._snapshots.pop(session.id)  # as on a pod that did not handle the writes
+
+    response = await client.get(f"/api/v1/sessions/{session.id}", headers={"Accept-Encoding": "identity"})
+
+    assert response.headers.get("content-length") is None  # chunked
+    assert [c["text"] for c in response.json()["cards"]] == ["one", "two"]
+    assert response.headers["etag"]
+    assert session.id not in snapshots._snapshots
@@ -10,9 +10,15 @@ subscribe to Redis, trigger an HTTP mutation, then wait for the collected chunk.
 import asyncio
 import json
 import unittest.mock as mock
+from datetime import UTC, datetime, timedelta
 
+import pytest
+import redis.exceptions
 from httpx import AsyncClient
 
+from src.repositories.session_repo import SessionRepository
+from src.repositories.stats_repo import UniqueParticipants
+from src.routers.sessions import _join
 from src.services.sse_manager import SSEManager, sse_manager
 from tests.conftest import make_session
 
@@ -246,3 +252,163 @@ async def test_multiple_subscribers_all_receive_broadcast(client: AsyncClient):
 
     assert json.loads(received1[0].removeprefix("data: ").strip())["cards"][0]["text"] == "Multi-sub"
     assert json.loads(received2[0].removeprefix("data: ").strip())["cards"][0]["text"] == "Multi-sub"
+
+
+# ── Graceful drain ───────────────────────────────────────────────────────────
+
+
+async def test_drain_closes_open_streams_with_jittered_retry_hint(fake_redis):
+    manager = SSEManager()
+    manager.set_client(fake_redis)
+    received: dict[int, list[str]] = {1: [], 2: []}
+
+    async def consume(n: int) -> None:
+        async for chunk in manager.stream("s1", initial_data={"n": n}):
+            received[n].append(chunk)
+
+    tasks = [asyncio.create_task(consume(n)) for n in received]
+    await asyncio.sleep(0.05)
+    assert manager.open_streams == 2
+
+    await manager.drain(0.1, 2000, 4000)
+    await asyncio.wait_for(asyncio.gather(*tasks), timeout=2.0)
+
+    for chunks in received.values():
+        assert chunks[-1].startswith("retry: ")
+        assert 2000 <= int(chunks[-1].removeprefix("retry: ").strip()) <= 4000
+    assert manager.open_streams == 0
+
+
+async def test_stream_opened_while_draining_only_sends_retry_hint(fake_redis):
+    manager = SSEManager()
+    manager.set_client(fake_redis)
+    await manager.drain(0, 500, 500)
+
+    chunks = [chunk async for chunk in manager.stream("s1", initial_data={"ignored": True})]
+
+    assert chunks == ["retry: 500\n\n"]
+
+
+async def test_stream_endpoint_sends_retry_hint_without_loading_session_while_draining(
+    client: AsyncClient,
+):
+    sse_manager.draining = True
+    try:
+        response = await client.get("/api/v1/sessions/no-such-id/stream")
+    finally:
+        sse_manager.draining = False
+
+    assert response.status_code == 200
+    assert response.text.startswith("retry: ")
+
+
+# ── Bootstrap: /stream?join=<name> ───────────────────────────────────────────
+
+
+async def test_stream_join_adds_participant_and_broadcasts(client: AsyncClient):
+    session = await make_session(client, facilitator="Alice")
+    received: list[str] = []
+
+    async def collect() -> None:
+        async for chunk in sse_manager.stream(session.id):
+            received.append(chunk)
+            break
+
+    collector = asyncio.create_task(collect())
+    await asyncio.sleep(0.05)
+    # The stream itself never ends in-process, so run it in the background and cancel it
+    task = asyncio.create_task(client.get(f"/api/v1/sessions/{session.id}/stream?join=Bob"))
+    await asyncio.wait_for(collector, timeout=2.0)
+    task.cancel()
+
+    names = [p["name"] for p in json.loads(received[0].removeprefix("data: ").strip())["participants"]]
+    assert names == ["Alice", "Bob"]
+
+
+async def test_stream_join_survives_a_redis_failure_while_counting(
+    client: AsyncClient, fake_redis, monkeypatch, caplog
+):
+    session = await make_session(client, facilitator="Alice")
+
+    def down(**kwargs):
+        raise redis.exceptions.ConnectionError("redis is down")
+
+    monkeypatch.setattr(fake_redis, "pipeline", down)
+    task = asyncio.create_task(client.get(f"/api/v1/sessions/{session.id}/stream?join=Bob"))
+    await asyncio.sleep(0.1)
+    assert not task.done()  # streaming, not a 500
+    task.cancel()
+
+    board = (await client.get(f"/api/v1/sessions/{session.id}")).json()
+    assert [p["name"] for p in board["participants"]] == ["Alice", "Bob"]
+    assert "could not count Bob" in caplog.text
+
+
+async def test_stream_join_for_existing_participant_does_not_write(client: AsyncClient):
+    session = await make_session(client, facilitator="Alice")
+    before = (await client.get(f"/api/v1/sessions/{session.id}")).json()
+
+    task = asyncio.create_task(client.get(f"/api/v1/sessions/{session.id}/stream?join=Alice"))
+    await asyncio.sleep(0.1)
+    task.cancel()
+
+    after = (await client.get(f"/api/v1/sessions/{session.id}")).json()
+    assert after["updated_at"] == before["updated_at"]
+    assert [p["name"] for p in after["participants"]] == ["Alice"]
+
+
+async def test_stream_keeps_the_board_from_expiring(client: AsyncClient, db):
+    session = await make_session(client, facilitator="Alice")
+    old = datetime.now(UTC) - timedelta(days=20)
+    await db["sessions"].update_one({"_id": session.id}, {"$set": {"last_accessed_at": old}})
+
+    task = asyncio.create_task(client.get(f"/api/v1/sessions/{session.id}/stream"))
+    await asyncio.sleep(0.1)
+    task.cancel()
+
+    doc = await db["sessions"].find_one({"_id": session.id})
+    assert doc["last_accessed_at"] > datetime.now(UTC) - timedelta(minutes=1)
+
+
+def _repo_calls(monkeypatch) -> list[str]:
+    calls: list[str] = []
+    for name in ("get_by_id", "add_participant", "get_and_touch", "touch"):
+        original = getattr(SessionRepository, name)
+
+        async def spy(self, *args, _name=name, _original=original):
+            calls.append(_name)
+            return await _original(self, *args)
+
+        monkeypatch.setattr(SessionRepository, name, spy)
+    return calls
+
+
+@pytest.mark.parametrize(("name", "writes"), [("Bob", ["add_participant"]), ("Alice", ["touch"])])
+async def test_stream_join_reads_once_and_writes_once(client: AsyncClient, db, monkeypatch, name, writes):
+    session = await make_session(client, facilitator="Alice")
+    old = datetime.now(UTC) - timedelta(days=20)
+    await db["sessions"].update_one({"_id": session.id}, {"$set": {"last_accessed_at": old}})
+    calls = _repo_calls(monkeypatch)
+
+    task = asyncio.create_task(client.get(f"/api/v1/sessions/{session.id}/stream?join={name}"))
+    await asyncio.sleep(0.1)
+    task.cancel()
+
+    assert calls == ["get_by_id", *writes]
+    doc = await db["sessions"].find_one({"_id": session.id})
+    assert doc["last_accessed_at"] > datetime.now(UTC) - timedelta(minutes=1)
+
+
+async def test_join_after_a_concurrent_join_returns_the_current_board(
+    client: AsyncClient, db, fake_redis, monkeypatch
+):
+    session = await make_session(client, facilitator="Alice")
+    repo = SessionRepository(db)
+    stale = await repo.get_by_id(session.id)
+    await client.post(f"/api/v1/sessions/{session.id}/join", json={"participant_name": "Bob"})
+    calls = _repo_calls(monkeypatch)
+
+    joined = await _join(stale, "Bob", repo, UniqueParticipants(fake_redis))
+
+    assert [p.name for p in joined.participants] == ["Alice", "Bob"]
+    assert calls == ["add_participant", "get_and_touch"]  # the current board comes with the touch
@@ -15,12 +15,16 @@ TDD commit order:
   feat(stats): add SentryHealth to AdminStats and call SentryService in admin endpoint
 """
 
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
 
+import pytest
 from argon2 import PasswordHasher
 
 from src.config import settings
-from tests.conftest import make_session
+from src.repositories.activity_repo import ActivityEvent, ActivityRepository
+from src.repositories.session_repo import SessionRepository
+from src.repositories.stats_repo import StatsRepository, UniqueParticipants
+from tests.conftest import make_session, requires_mongo
 
 # ---------------------------------------------------------------------------
 # Public stats — GET /api/v1/stats
@@ -178,6 +182,286 @@ class TestPublicStatsCardsVotesReactions:
         assert response.json()["total_reactions"] == 1
 
 
+    async def test_counts_votes_and_reactions_in_both_card_layouts(self, client, db):
+        now = datetime.now(UTC)
+        card = {"id": "c", "column": "Went Well", "text": "t", "author_name": "A"}
+        await db["sessions"].insert_many(
+            [
+                {
+                    "_id": "legacy",
+                    "name": "Legacy",
+                    "phase": "discussing",
+                    "created_at": now,
+                    "cards": [
+                        {
+                            **card,
+                            "votes": [{"participant_name": "Bob"}],
+                            "reactions": [
+                                {"emoji": "🎉", "participant_name": "Bob"},
+                                {"emoji": "👀", "participant_name": "Bob"},
+                            ],
+                        }
+                    ],
+                },
+                {
+                    "_id": "compact",
+                    "name": "Compact",
+                    "phase": "discussing",
+                    "created_at": now,
+                    "cards": [{**card, "votes": ["Bob", "Eve"], "reactions": {"🎉": ["Bob", "Eve"]}}],
+                },
+            ]
+        )
+        response = await client.get("/api/v1/stats")
+        assert response.json()["total_votes"] == 3
+        assert response.json()["total_reactions"] == 4
+
+
+class TestPublicStatsCounters:
+    """After the first read the totals come from counters the writes keep current."""
+
+    @pytest.fixture(autouse=True)
+    def _uncached(self, monkeypatch):
+        monkeypatch.setattr(settings, "stats_cache_seconds", 0)
+        monkeypatch.setattr(settings, "stats_stale_seconds", 0)
+
+    async def test_writes_move_the_counters(self, client):
+        await client.get("/api/v1/stats")  # starts the counters
+        s = await make_session(client, name="Retro")
+        resp = await client.post(
+            f"/api/v1/sessions/{s.id}/cards",
+            json={"column": "Went Well", "text": "Card", "author_name": "Alice"},
+        )
+        card_id = resp.json()["id"]
+        await client.post(
+            f"/api/v1/sessions/{s.id}/phase",
+            json={"phase": "discussing"},
+            headers={"X-Facilitator-Token": s.facilitator_token},
+        )
+        await client.post(
+            f"/api/v1/sessions/{s.id}/cards/{card_id}/publish",
+            headers={"X-Participant-Name": "Alice"},
+        )
+        await client.post(
+            f"/api/v1/sessions/{s.id}/cards/{card_id}/votes",
+            headers={"X-Participant-Name": "Bob"},
+        )
+        await client.post(
+            f"/api/v1/sessions/{s.id}/cards/{card_id}/reactions",
+            json={"emoji": "🎉"},
+            headers={"X-Participant-Name": "Bob"},
+        )
+        await client.post("/api/v1/feedback", json={"rating": 5})
+
+        data = (await client.get("/api/v1/stats")).json()
+        assert data["total_sessions"] == 1 and data["active_sessions"] == 1
+        assert data["sessions_by_phase"] == [{"phase": "discussing", "count": 1}]
+        assert data["sessions_per_day"] == [{"date": f"{datetime.now(UTC):%Y-%m-%d}", "count": 1}]
+        assert (data["total_cards"], data["total_votes"], data["total_reactions"]) == (1, 1, 1)
+        assert data["feedback_total"] == 1
+
+        await client.delete(
+            f"/api/v1/sessions/{s.id}/cards/{card_id}",
+            headers={"X-Participant-Name": "Alice"},
+        )
+        data = (await client.get("/api/v1/stats")).json()
+        assert (data["total_cards"], data["total_votes"], data["total_reactions"]) == (0, 0, 0)
+
+    async def test_reads_do_not_aggregate_and_reconciliation_corrects_drift(self, client, db):
+        await make_session(client)
+        await client.get("/api/v1/stats")
+        await db["sessions"].insert_one(  # bypasses the counters
+            {"_id": "raw", "name": "Raw", "phase": "closed", "created_at": datetime.now(UTC), "cards": []}
+        )
+
+        assert (await client.get("/api/v1/stats")).json()["total_sessions"] == 1
+
+        await StatsRepository(db).reconcile_counters()
+        data = (await client.get("/api/v1/stats")).json()
+        assert data["total_sessions"] == 2
+        assert data["active_sessions"] == 1
+
+    async def test_stale_session_cleanup_subtracts_from_the_counters(self, client, db):
+        s = await make_session(client)
+        await client.post(
+            f"/api/v1/sessions/{s.id}/cards",
+            json={"column": "Went Well", "text": "Card", "author_name": "Alice"},
+        )
+        await make_session(client, name="Kept")
+        await client.get("/api/v1/stats")
+        old = datetime.now(UTC) - timedelta(days=60)
+        await db["sessions"].update_one({"_id": s.id}, {"$set": {"last_accessed_at": old}})
+
+        assert await SessionRepository(db).delete_stale(datetime.now(UTC) - timedelta(days=30)) == 1
+
+        data = (await client.get("/api/v1/stats")).json()
+        assert (data["total_sessions"], data["total_cards"]) == (1, 0)
+        assert data["sessions_per_day"][0]["count"] == 2  # creations, kept after expiry
+
+
+
+class TestPublicStatsUniqueParticipants:
+    async def test_creators_and_joins_count_once_per_session(self, client):
+        s = await make_session(client, facilitator="Alice")
+        for name in ("Bob", "Bob", "Alice"):
+            await client.post(f"/api/v1/sessions/{s.id}/join", json={"participant_name": name})
+        await make_session(client, facilitator="Alice")  # another session's Alice
+
+        data = (await client.get("/api/v1/stats")).json()
+
+        today = datetime.now(UTC).date()
+        assert data["unique_participants_7d"] == data["unique_participants_30d"] == 3
+        assert data["unique_participants_per_day"] == [{"date": today.isoformat(), "count": 3}]
+        monday = today - timedelta(days=today.weekday())
+        assert data["unique_participants_per_week"] == [{"date": monday.isoformat(), "count": 3}]
+
+    async def test_ranges_count_a_participant_active_on_several_days_once(self, client, fake_redis):
+        uniques = UniqueParticipants(fake_redis)
+        now = datetime.now(UTC)
+        active = [("Alice", 0), ("Alice", 1), ("Alice", 2), ("Bob", 20), ("Carol", 60)]
+        weeks: dict[str, set[str]] = {}
+        for name, days_ago in active:
+            at = now - timedelta(days=days_ago)
+            await uniques.add("s1", name, at)
+            weeks.setdefault(f"{at.date() - timedelta(days=at.weekday()):%Y-%m-%d}", set()).add(name)
+
+        data = (await client.get("/api/v1/stats")).json()
+
+        assert data["unique_participants_7d"] == 1
+        assert data["unique_participants_30d"] == 2
+        assert [d["count"] for d in data["unique_participants_per_day"]] == [1, 1, 1, 1]
+        assert data["unique_participants_per_week"] == [
+            {"date": monday, "count": len(names)} for monday, names in sorted(weeks.items())
+        ]
+        assert 0 < await fake_redis.ttl(f"stats:participants:{now.date().isoformat()}")
+
+
+
+
+class TestAnalyticsReads:
+    """Aggregations read from the analytics handle; the counters stay on the primary."""
+
+    async def test_aggregations_use_the_analytics_handle_and_reconciliation_the_primary(self, db):
+        analytics = db.client["retrospekt_replica"]  # stands in for a lagging secondary
+        now = datetime.now(UTC)
+        session = {"_id": "s", "phase": "collecting", "created_at": now, "cards": []}
+        await analytics["sessions"].insert_one(dict(session))
+        await db["sessions"].insert_many([session, {**session, "_id": "new", "phase": "closed"}])
+        repo = StatsRepository(db, analytics=analytics)
+
+        stats = await repo.get_admin_stats()
+        totals = await repo.reconcile_counters()
+
+        assert sum(b.count for b in stats.session_lifetime.lifetime_distribution) == 1
+        assert totals["sessions_by_phase"] == {"collecting": 1, "closed": 1}
+        assert await analytics["stats"].count_documents({}) == 0
+
+# ---------------------------------------------------------------------------
+# Session series — GET /api/v1/stats/sessions
+# ---------------------------------------------------------------------------
+
+
+class TestSessionSeries:
+    async def _created(self, db, *days: str) -> None:
+        activity = ActivityRepository(db)
+        for i, day in enumerate(days):
+            at = datetime.fromisoformat(f"{day}T10:00:00+00:00")
+            await activity.record(f"s{i}", [ActivityEvent.CREATED], at)
+
+    async def test_buckets_cover_the_window_only(self, client, db):
+        await self._created(
+            db, "2024-12-31", "2025-01-06", "2025-01-08", "2025-01-13", "2025-02-03", "2025-03-01"
+        )
+
+        params = {"from": "2025-01-01", "to": "2025-02-28", "granularity": "day"}
+        response = await client.get("/api/v1/stats/sessions", params=params)
+
+        data = response.json()
+        assert (data["start"], data["end"], data["granularity"]) == ("2025-01-01", "2025-02-28", "day")
+        assert [(b["date"], b["count"]) for b in data["buckets"]] == [
+            ("2025-01-06", 1),
+            ("2025-01-08", 1),
+            ("2025-01-13", 1),
+            ("2025-02-03", 1),
+        ]
+
+    @requires_mongo
+    @pytest.mark.parametrize(
+        ("granularity", "buckets"),
+        [
+            # 2025-01-07 is a Tuesday: its week and month are dated by the window's first day
+            ("week", [("2025-01-07", 1), ("2025-01-13", 1), ("2025-02-03", 1)]),
+            ("month", [("2025-01-07", 2), ("2025-02-01", 1)]),
+        ],
+    )
+    async def test_weeks_and_months_are_bucketed_by_mongodb(self, mongo_db, granularity, buckets):
+        await ActivityRepository(mongo_db).ensure_collection()
+        await self._created(mongo_db, "2025-01-06", "2025-01-08", "2025-01-13", "2025-02-03", "2025-03-01")
+
+        series = await StatsRepository(mongo_db).sessions_created(
+            date(2025, 1, 7), date(2025, 2, 28), granularity
+        )
+
+        assert [(b.date, b.count) for b in series] == buckets
+
+    async def test_closed_windows_are_cached_indefinitely(self, client, db):
+        params = {"from": "2025-01-01", "to": "2025-01-31"}
+        await self._created(db, "2025-01-06")
+        first = await client.get("/api/v1/stats/sessions", params=params)
+        await self._created(db, "2025-01-07")  # cannot happen for a past window — shows the cache
+
+        second = await client.get("/api/v1/stats/sessions", params=params)
+
+        assert second.json() == first.json()
+        assert second.headers["cache-control"] == "public, max-age=31536000, immutable"
+
+    async def test_closed_windows_are_not_cached_while_the_backfill_runs(self, client, db):
+        params = {"from": "2025-01-01", "to": "2025-01-31"}
+        await db["migrations"].insert_one({"_id": "activity_backfill", "done": False})
+        await self._created(db, "2025-01-06")
+        first = await client.get("/api/v1/stats/sessions", params=params)
+        await self._created(db, "2025-01-07")  # backfilled meanwhile
+
+        second = await client.get("/api/v1/stats/sessions", params=params)
+
+        assert first.headers["cache-control"] == second.headers["cache-control"] == "no-cache"
+        assert [b["count"] for b in second.json()["buckets"]] == [1, 1]
+
+        await db["migrations"].update_one({"_id": "activity_backfill"}, {"$set": {"done": True}})
+        third = await client.get("/api/v1/stats/sessions", params=params)
+        assert third.headers["cache-control"] == "public, max-age=31536000, immutable"
+
+    async def test_the_current_window_is_not_cached(self, client, db):
+        await make_session(client)
+        await client.get("/api/v1/stats/sessions")
+        await make_session(client)
+
+        response = await client.get("/api/v1/stats/sessions")
+
+        assert response.headers["cache-control"] == "no-cache"
+        assert response.json()["buckets"] == [{"date": f"{datetime.now(UTC):%Y-%m-%d}", "count": 2}]
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"from": "2025-02-01", "to": "2025-01-01"},  # from after to
+            {"to": "9999-12-31"},  # no end of day to compute
+            {"from": "9999-12-31"},
+            {"from": "2023-01-01", "to": "2025-01-01"},  # longer than the cap
+            {"from": "2000-01-01"},  # through today
+        ],
+    )
+    async def test_out_of_range_windows_are_rejected(self, client, monkeypatch, params):
+        monkeypatch.setattr(settings, "stats_max_window_days", 366)
+        response = await client.get("/api/v1/stats/sessions", params=params)
+        assert response.status_code == 422
+
+    async def test_a_window_of_the_maximum_length_is_served(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "stats_max_window_days", 366)
+        params = {"from": "2024-01-01", "to": "2024-12-31"}
+        response = await client.get("/api/v1/stats/sessions", params=params)
+        assert response.status_code == 200
+
 # ---------------------------------------------------------------------------
 # Admin auth — POST /api/v1/stats/auth
 # ---------------------------------------------------------------------------
@@ -683,3 +967,220 @@ class TestAdminStatsSentryFrontend:
         assert data["sentry_frontend"]["unresolved_count"] == 0
         assert data["sentry_frontend"]["top_issues"] == []
         assert data["sentry_frontend"]["error"] == "Frontend Sentry down"
+
+
+# ---------------------------------------------------------------------------
+# Admin stats facets — independent, concurrent, cached queries
+# ---------------------------------------------------------------------------
+
+FACET_TOKEN = "facet-test-token"
+
+
+class TestAdminStatsFacets:
+    async def _get_admin(self, client, fake_redis) -> dict:
+        await fake_redis.set(f"admin_token:{FACET_TOKEN}", "1", ex=86400)
+        response = await client.get("/api/v1/stats/admin", headers={"X-Admin-Token": FACET_TOKEN})
+        assert response.status_code == 200
+        return response.json()
+
+    async def test_failed_facet_is_empty_and_named_while_the_rest_load(self, client, fake_redis, monkeypatch):
+        from pymongo.errors import ExecutionTimeout
+
+        async def timed_out(self, match):
+            raise ExecutionTimeout("operation exceeded time limit")
+
+        monkeypatch.setattr(StatsRepository, "_cards_per_column", timed_out)
+        session = await make_session(client)
+        await client.post(
+            f"/api/v1/sessions/{session.id}/cards",
+            json={"column": "Went Well", "text": "Card", "author_name": "Alice"},
+        )
+
+        data = await self._get_admin(client, fake_redis)
+
+        assert data["errors"] == {"cards_per_column": "timed out"}
+        assert data["cards_per_column"] == []
+        assert data["engagement_funnel"]["has_cards"] == 1
+
+    async def test_facets_are_cached_until_they_expire(self, client, fake_redis, monkeypatch):
+        first = await self._get_admin(client, fake_redis)
+        await make_session(client)
+        cached = await self._get_admin(client, fake_redis)
+        monkeypatch.setattr(settings, "admin_facet_cache_seconds", 0)
+        fresh = await self._get_admin(client, fake_redis)
+
+        assert cached["engagement_funnel"] == first["engagement_funnel"]
+        assert fresh["engagement_funnel"]["created"] == 1
+
+    async def test_failed_facets_are_not_cached(self, client, fake_redis, monkeypatch):
+        async def failing(self, match):
+            raise RuntimeError("mongo down")
+
+        with monkeypatch.context() as patched:
+            patched.setattr(StatsRepository, "_reaction_breakdown", failing)
+            assert "reaction_breakdown" in (await self._get_admin(client, fake_redis))["errors"]
+
+        assert (await self._get_admin(client, fake_redis))["errors"] == {}
+
+    async def test_every_facet_query_is_time_limited(self, db, monkeypatch):
+        monkeypatch.setattr(settings, "admin_facet_timeout_ms", 1234)
+        repo = StatsRepository(db)
+        limits = []
+        for collection in (repo.collection, repo.activity, repo.feedback):
+            for method in ("aggregate", "count_documents", "find"):
+                original = getattr(collection, method)
+
+                def spy(*args, _original=original, **kwargs):
+                    limits.append(kwargs.get("maxTimeMS", kwargs.get("max_time_ms")))
+                    return _original(*args, **kwargs)
+
+                monkeypatch.setattr(collection, method, spy)
+
+        stats = await repo.get_admin_stats()
+
+        assert stats.errors == {}
+        assert len(limits) == 15
+        assert set(limits) == {1234}
+
+    async def test_window_narrows_the_facets_to_sessions_created_in_it(
+        self, client, db, fake_redis, session_factory
+    ):
+        now = datetime.now(UTC)
+        recent = await session_factory(created_at=now - timedelta(days=1))
+        old = await session_factory(created_at=now - timedelta(days=40))
+        for doc in (recent, old):
+            card = {"id": doc["id"], "column": "Went Well", "votes": [], "reactions": {"🎉": ["Alice"]}}
+            await db["sessions"].update_one({"_id": doc["_id"]}, {"$set": {"cards": [card]}})
+        await self._created(db, now - timedelta(days=1), now - timedelta(days=40))
+
+        await fake_redis.set(f"admin_token:{FACET_TOKEN}", "1", ex=86400)
+        data = (
+            await client.get(
+                "/api/v1/stats/admin",
+                params={"from": f"{now - timedelta(days=7):%Y-%m-%d}"},
+                headers={"X-Admin-Token": FACET_TOKEN},
+            )
+        ).json()
+
+        assert data["cards_per_column"] == [{"column": "Went Well", "count": 1}]
+        assert data["reaction_breakdown"] == [{"emoji": "🎉", "count": 1}]
+        assert data["engagement_funnel"]["created"] == 1
+        assert sum(b["count"] for b in data["session_lifetime"]["lifetime_distribution"]) == 1
+
+    async def test_a_window_past_tomorrow_is_rejected(self, client, fake_redis):
+        await fake_redis.set(f"admin_token:{FACET_TOKEN}", "1", ex=86400)
+        response = await client.get(
+            "/api/v1/stats/admin", params={"to": "9999-12-31"}, headers={"X-Admin-Token": FACET_TOKEN}
+        )
+        assert response.status_code == 422
+
+    async def _created(self, db, *times: datetime) -> None:
+        for i, at in enumerate(times):
+            await ActivityRepository(db).record(f"s{i}", [ActivityEvent.CREATED], at)
+
+    async def test_sentry_is_queried_alongside_the_facets(self, client, fake_redis, monkeypatch):
+        import asyncio
+        from unittest.mock import patch
+
+        from src.repositories.stats_repo import SentryHealth
+
+        monkeypatch.setattr(settings, "sentry_auth_token", "tok")
+        monkeypatch.setattr(settings, "sentry_org_slug", "myorg")
+        monkeypatch.setattr(settings, "sentry_project_slug", "myproject")
+        sentry_started = asyncio.Event()
+
+        async def get_health(self):
+            sentry_started.set()
+            return SentryHealth(unresolved_count=0, top_issues=[], error_rate_7d=[], p95_latency_7d=[])
+
+        async def reaction_breakdown(self, match):
+            # Sequential lookups would run the facets first and time out here
+            await asyncio.wait_for(sentry_started.wait(), timeout=1)
+            return []
+
+        monkeypatch.setattr(StatsRepository, "_reaction_breakdown", reaction_breakdown)
+        with patch("src.routers.stats.SentryService.get_health", new=get_health):
+            data = await self._get_admin(client, fake_redis)
+
+        assert data["errors"] == {}
+        assert data["sentry"]["unresolved_count"] == 0
+
+
+# ---------------------------------------------------------------------------
+# Stats export — GET /api/v1/stats/admin/export
+# ---------------------------------------------------------------------------
+
+EXPORT_TOKEN = "export-test-token"
+
+
+class TestAdminStatsExport:
+    async def _export(self, client, fake_redis, fmt: str):
+        await fake_redis.set(f"admin_token:{EXPORT_TOKEN}", "1", ex=86400)
+        return await client.get(
+            "/api/v1/stats/admin/export", params={"format": fmt}, headers={"X-Admin-Token": EXPORT_TOKEN}
+        )
+
+    async def _sessions(self, db, session_factory) -> None:
+        now = datetime.now(UTC)
+        await session_factory(created_at=now - timedelta(hours=30), last_accessed_at=now - timedelta(hours=6))
+        old = await session_factory(phase="closed", created_at=now - timedelta(days=3))
+        cards = [  # compact layout, and the legacy one with reaction objects
+            {"id": "c1", "votes": ["Alice", "Bob"], "reactions": {"🎉": ["Alice", "Bob"], "👍": ["Carol"]}},
+            {"id": "c2", "votes": [{"participant_name": "Bob"}], "reactions": [{"emoji": "🎉"}]},
+        ]
+        await db["sessions"].update_one({"_id": old["_id"]}, {"$set": {"cards": cards}})
+
+    async def test_401_without_token(self, client):
+        response = await client.get("/api/v1/stats/admin/export")
+        assert response.status_code == 401
+
+    async def test_csv_has_one_row_per_session_oldest_first(self, client, db, fake_redis, session_factory):
+        import csv
+
+        await self._sessions(db, session_factory)
+
+        response = await self._export(client, fake_redis, "csv")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert "attachment" in response.headers["content-disposition"]
+        rows = list(csv.DictReader(response.text.splitlines()))
+        assert [(r["phase"], r["cards"], r["votes"], r["reactions"]) for r in rows] == [
+            ("closed", "2", "3", "4"),
+            ("collecting", "0", "0", "0"),
+        ]
+        assert rows[1]["lifetime_hours"] == "24.0"
+        assert rows[1]["created_at"].endswith("Z")
+
+    async def test_ndjson_rows_are_typed(self, client, db, fake_redis, session_factory):
+        import json
+
+        await self._sessions(db, session_factory)
+
+        response = await self._export(client, fake_redis, "ndjson")
+
+        assert response.headers["content-type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["reactions"] for row in rows] == [4, 0]
+        assert rows[1]["lifetime_hours"] == 24.0
+
+    async def test_rows_are_read_in_batches(self, db, session_factory):
+        for _ in range(5):
+            await session_factory()
+
+        batches = [len(batch) async for batch in StatsRepository(db).export_batches(2)]
+
+        assert batches == [2, 2, 1]
+
+    async def test_the_sort_may_spill_to_disk(self, db, monkeypatch):
+        seen = {}
+        aggregate = type(db.sessions).aggregate
+
+        def spy(self, pipeline, **kwargs):
+            seen.update(kwargs)
+            return aggregate(self, pipeline, **kwargs)
+
+        monkeypatch.setattr(type(db.sessions), "aggregate", spy)
+
+        assert [batch async for batch in StatsRepository(db).export_batches(2)] == []
+        assert seen["allowDiskUse"] is True
@@ -0,0 +1,139 @@
+"""Public stats cache specifications — stale-while-revalidate and single-flight loads."""
+
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+
+from src.config import settings
+from src.services import stats_cache
+from src.services.stats_cache import ClosedWindowCache, StatsCache
+from tests.conftest import make_session
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> _Clock:
+    clock = _Clock()
+    # The module's own clock only: asyncio's event loop reads time.monotonic too
+    monkeypatch.setattr(stats_cache, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def _counting_loader():
+    calls = []
+
+    async def load():
+        calls.append(None)
+        await asyncio.sleep(0)
+        return len(calls)
+
+    return load, calls
+
+
+# ── Cache ────────────────────────────────────────────────────────────────────
+
+
+async def test_concurrent_misses_share_one_load(clock: _Clock):
+    cache = StatsCache()
+    load, calls = _counting_loader()
+
+    results = await asyncio.gather(*(cache.get(load, 30, 300) for _ in range(5)))
+
+    assert [value for value, _ in results] == [1] * 5
+    assert len(calls) == 1
+
+
+async def test_fresh_value_is_served_without_loading(clock: _Clock):
+    cache = StatsCache()
+    load, calls = _counting_loader()
+    await cache.get(load, 30, 300)
+    clock.now += 10
+
+    assert await cache.get(load, 30, 300) == (1, 10)
+    assert len(calls) == 1
+
+
+async def test_stale_value_is_served_while_one_refresh_runs(clock: _Clock):
+    cache = StatsCache()
+    load, calls = _counting_loader()
+    await cache.get(load, 30, 300)
+    clock.now += 60
+
+    first = await cache.get(load, 30, 300)
+    second = await cache.get(load, 30, 300)
+    await asyncio.sleep(0.01)  # let the refresh finish
+
+    assert first[0] == second[0] == 1
+    assert len(calls) == 2
+    assert await cache.get(load, 30, 300) == (2, 0)
+
+
+async def test_value_past_the_stale_window_waits_for_the_load(clock: _Clock):
+    cache = StatsCache()
+    load, calls = _counting_loader()
+    await cache.get(load, 30, 300)
+    clock.now += 400
+
+    assert await cache.get(load, 30, 300) == (2, 0)
+
+
+async def test_failed_background_refresh_is_logged_and_keeps_the_stale_value(clock: _Clock, caplog):
+    cache = StatsCache()
+    load, _ = _counting_loader()
+    await cache.get(load, 30, 300)
+    clock.now += 60
+
+    async def failing():
+        raise RuntimeError("mongo down")
+
+    with caplog.at_level(logging.ERROR, logger=stats_cache.__name__):
+        assert (await cache.get(failing, 30, 300))[0] == 1
+        await asyncio.sleep(0.01)
+
+    assert "background refresh failed" in caplog.text
+    assert (await cache.get(load, 30, 300))[0] == 1  # still stale, refreshing again
+
+
+
+async def test_closed_window_cache_evicts_the_least_recently_used(clock: _Clock):
+    cache = ClosedWindowCache(max_entries=2)
+    load, calls = _counting_loader()
+    await cache.get("jan", load)
+    await cache.get("feb", load)
+    await cache.get("jan", load)  # feb is now the least recently used
+    await cache.get("mar", load)
+
+    assert await cache.get("jan", load) == 1
+    assert await cache.get("feb", load) == 4  # loaded again
+    assert len(calls) == 4
+
+# ── Endpoint ─────────────────────────────────────────────────────────────────
+
+
+async def test_public_stats_are_cached_and_say_so(client: AsyncClient):
+    first = await client.get("/api/v1/stats")
+    await make_session(client)
+    second = await client.get("/api/v1/stats")
+
+    assert second.json() == first.json()  # still the cached totals
+    assert second.headers["cache-control"].startswith("public, max-age=")
+    assert second.headers["cache-control"].endswith("stale-while-revalidate=300")
+
+
+async def test_disabled_cache_sends_no_cache(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(settings, "stats_cache_seconds", 0)
+
+    response = await client.get("/api/v1/stats")
+
+    assert response.headers["cache-control"] == "no-cache"
+
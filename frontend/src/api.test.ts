@@ -46,15 +46,6 @@ describe('createSession', () => {
   })
 })
 
-describe('getSession', () => {
-  it('GETs /api/v1/sessions/:id', async () => {
-    mockOk(mockSession)
-    await api.getSession('sess-1')
-
-    expect(mockFetch).toHaveBeenCalledWith('/api/v1/sessions/sess-1', expect.objectContaining({}))
-  })
-})
-
 describe('updateSession', () => {
   it('PATCHes /sessions/:id with updates and X-Facilitator-Token', async () => {
     mockOk(mockSession)
@@ -476,7 +467,7 @@ describe('createSession with custom columns', () => {
 describe('error handling', () => {
   it('throws with status and message on non-ok response', async () => {
     mockError(404, 'Not Found')
-    await expect(api.getSession('bad-id')).rejects.toThrow('API 404: Not Found')
+    await expect(api.joinSession('bad-id', 'Alice')).rejects.toThrow('API 404: Not Found')
   })
 
   it('returns undefined for 204 No Content', async () => {
@@ -488,8 +479,8 @@ describe('error handling', () => {
   it('truncates HTML error body to 200 chars', async () => {
     const html = '<!DOCTYPE html>' + 'x'.repeat(300)
     mockError(502, html)
-    await expect(api.getSession('sess-1')).rejects.toThrow(/^API 502: .{1,210}$/)
-    const err = await api.getSession('sess-1').catch((e: Error) => e)
+    await expect(api.joinSession('sess-1', 'Alice')).rejects.toThrow(/^API 502: .{1,210}$/)
+    const err = await api.joinSession('sess-1', 'Alice').catch((e: Error) => e)
     expect((err as Error).message.length).toBeLessThanOrEqual(210)
   })
 })
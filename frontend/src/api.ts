@@ -24,8 +24,6 @@ export function createApi(fetchFn: typeof fetch = fetch) {
         body: JSON.stringify({ name, participant_name: participantName, columns, reactions_enabled: reactionsEnabled, open_facilitator: openFacilitator, max_votes_per_participant: maxVotesPerParticipant }),
       }),
 
-    getSession: (id: string) => request<Session>(`/sessions/${id}`),
-
     updateSession: (id: string, updates: { name?: string; reactions_enabled?: boolean; open_facilitator?: boolean; max_votes_per_participant?: number | null }, facilitatorToken: string, participantName?: string) =>
       request<Session>(`/sessions/${id}`, {
         method: 'PATCH',
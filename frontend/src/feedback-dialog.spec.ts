@@ -33,14 +33,15 @@ async function mockApi(page: Page, session: ReturnType<typeof makeSession>) {
   const id = session.id
   await page.route(`/api/v1/sessions/${id}`, route =>
     route.fulfill({ status: 200, contentType: 'application/json', body: JSON.stringify(session) }))
-  await page.route(`/api/v1/sessions/${id}/stream`, route =>
+  await page.route(`/api/v1/sessions/${id}/**`, route =>
+    route.fulfill({ status: 200, contentType: 'application/json', body: JSON.stringify(session) }))
+  // Registered after the catch-all so it takes precedence; `*` also matches `?join=`
+  await page.route(`/api/v1/sessions/${id}/stream*`, route =>
     route.fulfill({
       status: 200,
       headers: { 'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache' },
       body: sse(session),
     }))
-  await page.route(`/api/v1/sessions/${id}/**`, route =>
-    route.fulfill({ status: 200, contentType: 'application/json', body: JSON.stringify(session) }))
   await page.route('/api/v1/feedback', route =>
     route.fulfill({ status: 201, contentType: 'application/json', body: JSON.stringify({
       id: 'fb-1', rating: 4, comment: '', session_id: null, app_version: '1.0.0', created_at: '2026-01-01T00:00:00Z',
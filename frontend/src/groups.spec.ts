@@ -48,14 +48,15 @@ async function mockApi(page: Page, session: Record<string, unknown>) {
   const id = session.id as string
   await page.route(`/api/v1/sessions/${id}`, route =>
     route.fulfill({ status: 200, contentType: 'application/json', body: JSON.stringify(session) }))
-  await page.route(`/api/v1/sessions/${id}/stream`, route =>
+  await page.route(`/api/v1/sessions/${id}/**`, route =>
+    route.fulfill({ status: 200, contentType: 'application/json', body: JSON.stringify(session) }))
+  // Registered after the catch-all so it takes precedence; `*` also matches `?join=`
+  await page.route(`/api/v1/sessions/${id}/stream*`, route =>
     route.fulfill({
       status: 200,
       headers: { 'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache' },
       body: sse(session),
     }))
-  await page.route(`/api/v1/sessions/${id}/**`, route =>
-    route.fulfill({ status: 200, contentType: 'application/json', body: JSON.stringify(session) }))
 }
 
 async function loadSession(
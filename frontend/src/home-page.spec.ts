@@ -20,13 +20,16 @@ async function mockCreateSession(
   await page.route('/api/v1/sessions', (route) =>
     route.fulfill({ status: 201, contentType: 'application/json', body: JSON.stringify(session) }),
   )
-  await page.route(`/api/v1/sessions/${session.id}/stream`, (route) => route.abort())
   await page.route(`/api/v1/sessions/${session.id}`, (route) =>
     route.fulfill({ status: 200, contentType: 'application/json', body: JSON.stringify(session) }),
   )
   await page.route(`/api/v1/sessions/${session.id}/**`, (route) =>
     route.fulfill({ status: 200, contentType: 'application/json', body: JSON.stringify(session) }),
   )
+  // The stream's first event loads session-page — registered last so it wins over the catch-all
+  await page.route(`/api/v1/sessions/${session.id}/stream*`, (route) =>
+    route.fulfill({ status: 200, contentType: 'text/event-stream', body: `data: ${JSON.stringify(session)}\n\n` }),
+  )
 }
 
 test.describe('home-page static content', () => {
@@ -182,13 +185,15 @@ test.describe('home-page create session', () => {
   })
 
   test('create button shows loading state while request is in flight', async ({ page }) => {
-    await page.route(`/api/v1/sessions/${MOCK_SESSION.id}/stream`, (route) => route.abort())
     await page.route(`/api/v1/sessions/${MOCK_SESSION.id}`, (route) =>
       route.fulfill({ status: 200, contentType: 'application/json', body: JSON.stringify(MOCK_SESSION) }),
     )
     await page.route(`/api/v1/sessions/${MOCK_SESSION.id}/**`, (route) =>
       route.fulfill({ status: 200, contentType: 'application/json', body: JSON.stringify(MOCK_SESSION) }),
     )
+    await page.route(`/api/v1/sessions/${MOCK_SESSION.id}/stream*`, (route) =>
+      route.fulfill({ status: 200, contentType: 'text/event-stream', body: `data: ${JSON.stringify(MOCK_SESSION)}\n\n` }),
+    )
     await page.goto('/')
     let resolveRequest!: () => void
     await page.route('/api/v1/sessions', (route) =>
@@ -451,9 +451,6 @@ export class SessionPage extends LitElement {
     this.loading = true
 
     try {
-      const session = await api.getSession(this.sessionId)
-      this.session = session
-
       const storedName = storage.getName(this.sessionId)
       if (storedName) {
         this.participantName = storedName
@@ -461,19 +458,19 @@ export class SessionPage extends LitElement {
         Sentry.setUser({ username: storedName })
         /* istanbul ignore next */
         Sentry.setTag('session_id', this.sessionId)
-        await api.joinSession(this.sessionId, storedName)
-        this.saveToHistory(session, storedName)
       } else {
         this.showNamePrompt = true
       }
 
+      // One request bootstraps the page: the stream joins us (if we have a name)
+      // and its first event is the session snapshot
       this.sseClient = new SSEClient(this.sessionId, (updated) => {
         this.session = updated
         if (this.participantName) {
           this.saveToHistory(updated, this.participantName)
         }
-      })
-      this.sseClient.connect()
+      }, storedName ?? undefined)
+      this.session = await this.sseClient.connect()
       this._checkWhatsNew()
     } catch {
       window.router.navigate('/?session_not_found')
@@ -1,16 +1,32 @@
-import { expect, fixture, html } from '@open-wc/testing'
+import { expect, fixture, html, waitUntil } from '@open-wc/testing'
 import type { Session } from '../types'
 import { api } from '../api'
 import { storage } from '../storage'
 import './session-page'
 import type { SessionPage } from './session-page'
 
-// Minimal EventSource mock — prevents real SSE connections in Chromium
+// Minimal EventSource mock — prevents real SSE connections in Chromium.
+// The stream's first event bootstraps the page, so the mock delivers `nextSession`
+// (or refuses the stream, like a 404) right after construction.
 class MockEventSource {
+  static nextSession: Session | null = null
+  static refuse = false
+  static lastUrl = ''
   onmessage: ((e: MessageEvent) => void) | null = null
   onerror: (() => void) | null = null
+  readyState = 0
   close() {}
-  constructor(_url: string) {}
+  constructor(url: string) {
+    MockEventSource.lastUrl = url
+    setTimeout(() => {
+      if (MockEventSource.nextSession) {
+        this.onmessage?.(new MessageEvent('message', { data: JSON.stringify(MockEventSource.nextSession) }))
+      } else if (MockEventSource.refuse) {
+        this.readyState = 2
+        this.onerror?.()
+      }
+    }, 0)
+  }
 }
 
 function makeSession(overrides: Partial<Session> = {}): Session {
@@ -33,8 +49,14 @@ function makeSession(overrides: Partial<Session> = {}): Session {
   }
 }
 
+// The stream opens once this tab wins the cross-tab election (an async Web Lock),
+// so wait for the spinner to go rather than for a fixed number of ticks
+async function loaded(el: SessionPage): Promise<void> {
+  await waitUntil(() => el.shadowRoot!.querySelector('.spinner') === null)
+  await el.updateComplete
+}
+
 // Save originals for restoration
-const origGetSession = api.getSession
 const origJoinSession = api.joinSession
 const origGetName = storage.getName.bind(storage)
 const origSetName = storage.setName.bind(storage)
@@ -45,7 +67,9 @@ beforeEach(() => {
 })
 
 afterEach(() => {
-  api.getSession = origGetSession
+  MockEventSource.nextSession = null
+  MockEventSource.refuse = false
+  MockEventSource.lastUrl = ''
   api.joinSession = origJoinSession
   storage.getName = origGetName
   storage.setName = origSetName
@@ -53,9 +77,8 @@ afterEach(() => {
 })
 
 describe('session-page', () => {
-  it('shows the .spinner while api.getSession() is in-flight', async () => {
-    // Return a promise that never resolves → loading stays true
-    api.getSession = () => new Promise<Session>(() => {})
+  it('shows the .spinner until the stream delivers the first snapshot', async () => {
+    // No snapshot and no refusal → loading stays true
 
     const el = await fixture<SessionPage>(
       html`<session-page session-id="test-session"></session-page>`,
@@ -63,8 +86,8 @@ describe('session-page', () => {
     expect(el.shadowRoot!.querySelector('.spinner')).to.not.be.null
   })
 
-  it('redirects to home when api.getSession() rejects', async () => {
-    api.getSession = () => Promise.reject(new Error('not found'))
+  it('redirects to home when the stream is refused', async () => {
+    MockEventSource.refuse = true
     let navigatedTo: string | null = null
     ;(window as { router?: unknown }).router = {
       navigate: (path: string) => { navigatedTo = path },
@@ -73,15 +96,15 @@ describe('session-page', () => {
     await fixture<SessionPage>(
       html`<session-page session-id="test-session"></session-page>`,
     )
-    // Wait for the rejection to propagate through loadSession
-    await new Promise((r) => setTimeout(r, 0))
+    // Wait for the refusal to propagate through loadSession
+    await waitUntil(() => navigatedTo !== null)
 
     expect(navigatedTo).to.equal('/?session_not_found')
   })
 
   it('shows the name-prompt overlay when no name is stored for the session', async () => {
     const mockSession = makeSession()
-    api.getSession = () => Promise.resolve(mockSession)
+    MockEventSource.nextSession = mockSession
     api.joinSession = () => Promise.resolve(mockSession)
     storage.getName = () => null
     ;(window as { router?: unknown }).router = { navigate: () => {} }
@@ -89,15 +112,14 @@ describe('session-page', () => {
     const el = await fixture<SessionPage>(
       html`<session-page session-id="test-session"></session-page>`,
     )
-    await new Promise((r) => setTimeout(r, 0))
-    await el.updateComplete
+    await loaded(el)
 
     expect(el.shadowRoot!.querySelector('.overlay')).to.not.be.null
   })
 
   it('submitting the name calls api.joinSession() and hides the overlay', async () => {
     const mockSession = makeSession()
-    api.getSession = () => Promise.resolve(mockSession)
+    MockEventSource.nextSession = mockSession
 
     let joinArgs: unknown[] | null = null
     api.joinSession = (...args: unknown[]) => {
@@ -111,8 +133,7 @@ describe('session-page', () => {
     const el = await fixture<SessionPage>(
       html`<session-page session-id="test-session"></session-page>`,
     )
-    await new Promise((r) => setTimeout(r, 0))
-    await el.updateComplete
+    await loaded(el)
 
     // Fill in the name input inside the overlay
     const nameInput = el.shadowRoot!.querySelector<HTMLInputElement>('.name-card input')!
@@ -130,9 +151,9 @@ describe('session-page', () => {
     expect(el.shadowRoot!.querySelector('.overlay')).to.be.null
   })
 
-  it('when stored name exists, skips the prompt and calls joinSession immediately', async () => {
+  it('when stored name exists, skips the prompt and joins through the stream', async () => {
     const mockSession = makeSession()
-    api.getSession = () => Promise.resolve(mockSession)
+    MockEventSource.nextSession = mockSession
 
     let joinCalled = false
     api.joinSession = () => {
@@ -145,10 +166,10 @@ describe('session-page', () => {
     const el = await fixture<SessionPage>(
       html`<session-page session-id="test-session"></session-page>`,
     )
-    await new Promise((r) => setTimeout(r, 0))
-    await el.updateComplete
+    await loaded(el)
 
     expect(el.shadowRoot!.querySelector('.overlay')).to.be.null
-    expect(joinCalled).to.be.true
+    expect(MockEventSource.lastUrl).to.equal('/api/v1/sessions/test-session/stream?join=Alice')
+    expect(joinCalled).to.be.false
   })
 })
@@ -666,6 +666,8 @@ export class StatsPage extends LitElement {
                   ${this._renderStatCard('Active Sessions', this.stats!.active_sessions)}
                   ${this._renderStatCard('Total Cards', this.stats!.total_cards)}
                   ${this._renderStatCard('Total Votes', this.stats!.total_votes)}
+                  ${this._renderStatCard('Participants (7 days)', this.stats!.unique_participants_7d)}
+                  ${this._renderStatCard('Participants (30 days)', this.stats!.unique_participants_30d)}
                 </section>
 
                 <section class="charts-row">
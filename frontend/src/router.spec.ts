@@ -10,13 +10,16 @@ async function stubSessionApi(page: Page, sessionId: string) {
     participants: [], cards: [], created_at: '2026-01-01T00:00:00Z',
     updated_at: '2026-01-01T00:00:00Z', facilitator_token: 'tok', timer: null,
   }
-  await page.route(`/api/v1/sessions/${sessionId}/stream`, (route) => route.abort())
   await page.route(`/api/v1/sessions/${sessionId}`, (route) =>
     route.fulfill({ status: 200, contentType: 'application/json', body: JSON.stringify(stub) }),
   )
   await page.route(`/api/v1/sessions/${sessionId}/**`, (route) =>
     route.fulfill({ status: 200, contentType: 'application/json', body: JSON.stringify(stub) }),
   )
+  // The stream's first event loads session-page — registered last so it wins over the catch-all
+  await page.route(`/api/v1/sessions/${sessionId}/stream*`, (route) =>
+    route.fulfill({ status: 200, contentType: 'text/event-stream', body: `data: ${JSON.stringify(stub)}\n\n` }),
+  )
 }
 
 test('renders home-page at /', async ({ page }) => {
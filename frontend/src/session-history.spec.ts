@@ -29,14 +29,15 @@ async function mockApi(page: Page, session: Record<string, unknown>) {
   const id = session.id as string
   await page.route(`/api/v1/sessions/${id}`, route =>
     route.fulfill({ status: 200, contentType: 'application/json', body: JSON.stringify(session) }))
-  await page.route(`/api/v1/sessions/${id}/stream`, route =>
+  await page.route(`/api/v1/sessions/${id}/**`, route =>
+    route.fulfill({ status: 200, contentType: 'application/json', body: JSON.stringify(session) }))
+  // Registered after the catch-all so it takes precedence; `*` also matches `?join=`
+  await page.route(`/api/v1/sessions/${id}/stream*`, route =>
     route.fulfill({
       status: 200,
       headers: { 'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache' },
       body: sse(session),
     }))
-  await page.route(`/api/v1/sessions/${id}/**`, route =>
-    route.fulfill({ status: 200, contentType: 'application/json', body: JSON.stringify(session) }))
 }
 
 async function withName(page: Page, name: string, token = '') {
@@ -190,15 +191,17 @@ test.describe('session-history on home-page', () => {
       },
     ])
     // Mock the session API so session-page loads without redirecting
-    await page.route('/api/v1/sessions/hist-8/stream', route => route.abort())
+    const histSession = {
+      id: 'hist-8', name: 'Navigate Session', columns: [], phase: 'closed',
+      participants: [], cards: [], created_at: '2026-01-15T10:00:00Z',
+      updated_at: '2026-01-15T10:00:00Z', facilitator_token: 'tok', timer: null,
+    }
     await page.route('/api/v1/sessions/hist-8', route =>
-      route.fulfill({ status: 200, contentType: 'application/json', body: JSON.stringify({
-        id: 'hist-8', name: 'Navigate Session', columns: [], phase: 'closed',
-        participants: [], cards: [], created_at: '2026-01-15T10:00:00Z',
-        updated_at: '2026-01-15T10:00:00Z', facilitator_token: 'tok', timer: null,
-      }) }))
+      route.fulfill({ status: 200, contentType: 'application/json', body: JSON.stringify(histSession) }))
     await page.route('/api/v1/sessions/hist-8/**', route =>
       route.fulfill({ status: 200, contentType: 'application/json', body: '{}' }))
+    await page.route('/api/v1/sessions/hist-8/stream*', route =>
+      route.fulfill({ status: 200, contentType: 'text/event-stream', body: sse(histSession) }))
 
     await page.goto('/')
     await page.locator('.history-toggle').click()
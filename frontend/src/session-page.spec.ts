@@ -25,24 +25,26 @@ function sse(data: object): string {
 }
 
 /**
- * Mock API routes for a session: GET session, SSE stream, and a catch-all
- * for all other sub-resources (join, phase, cards, etc.).
+ * Mock API routes for a session: GET session, SSE stream (whose first event
+ * loads the page), and a catch-all for all other sub-resources (join, phase, cards, etc.).
  */
 async function mockApi(page: Page, session: typeof BASE) {
   await page.route(`/api/v1/sessions/${session.id}`, (route) =>
     route.fulfill({ status: 200, contentType: 'application/json', body: JSON.stringify(session) }),
   )
-  await page.route(`/api/v1/sessions/${session.id}/stream`, (route) =>
+  // Catch-all: join, phase, cards, reactions, timer, etc.
+  await page.route(`/api/v1/sessions/${session.id}/**`, (route) =>
+    route.fulfill({ status: 200, contentType: 'application/json', body: JSON.stringify(session) }),
+  )
+  // The stream bootstraps the page. Registered after the catch-all so it takes
+  // precedence; `*` also matches the `?join=` query.
+  await page.route(`/api/v1/sessions/${session.id}/stream*`, (route) =>
     route.fulfill({
       status: 200,
       headers: { 'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache' },
       body: sse(session),
     }),
   )
-  // Catch-all: join, phase, cards, reactions, timer, etc.
-  await page.route(`/api/v1/sessions/${session.id}/**`, (route) =>
-    route.fulfill({ status: 200, contentType: 'application/json', body: JSON.stringify(session) }),
-  )
 }
 
 /**
@@ -62,23 +64,25 @@ async function withName(page: Page, name: string, token = '') {
 // ── Loading and error states ──────────────────────────────────────────────────
 
 test.describe('session-page loading and errors', () => {
-  test('shows spinner while initial GET is in-flight', async ({ page }) => {
+  test('shows spinner while the initial stream event is pending', async ({ page }) => {
     let resolveRequest!: () => void
-    await page.route(`/api/v1/sessions/${SESSION_ID}`, async (route) => {
+    await page.route(`/api/v1/sessions/${SESSION_ID}/stream*`, async (route) => {
       await new Promise<void>((r) => { resolveRequest = r })
-      await route.fulfill({ status: 200, contentType: 'application/json', body: JSON.stringify(BASE) })
+      await route.fulfill({
+        status: 200,
+        headers: { 'Content-Type': 'text/event-stream' },
+        body: sse(BASE),
+      })
     })
-    await page.route(`/api/v1/sessions/${SESSION_ID}/stream`, (route) => route.abort())
     void page.goto(`/session/${SESSION_ID}`)
     await expect(page.locator('.spinner')).toBeVisible()
     resolveRequest()
   })
 
   test('redirects to home when session is not found', async ({ page }) => {
-    await page.route(`/api/v1/sessions/${SESSION_ID}`, (route) =>
+    await page.route(`/api/v1/sessions/${SESSION_ID}/stream*`, (route) =>
       route.fulfill({ status: 404, body: 'Not Found' }),
     )
-    await page.route(`/api/v1/sessions/${SESSION_ID}/stream`, (route) => route.abort())
     await page.goto(`/session/${SESSION_ID}`)
     await expect(page).toHaveURL('/')
   })
@@ -453,10 +457,10 @@ test.describe('session-page SSE updates', () => {
   test('establishes the SSE stream connection on page load', async ({ page }) => {
     await withName(page, 'Alice')
     await mockApi(page, BASE)
-    const streamRequest = page.waitForRequest(/\/stream$/)
+    const streamRequest = page.waitForRequest(/\/stream\?join=/)
     await page.goto(`/session/${SESSION_ID}`)
     const req = await streamRequest
-    expect(req.url()).toContain(`/sessions/${SESSION_ID}/stream`)
+    expect(req.url()).toContain(`/sessions/${SESSION_ID}/stream?join=Alice`)
   })
 
   test('feedback dialog shown after session transitions to closed (line 589)', async ({ page }) => {
@@ -737,7 +741,7 @@ test.describe('session-page export', () => {
 
 test.describe('session-page SSE error handling', () => {
   test('SSE onmessage ignores invalid JSON without crashing (sse.ts line 26)', async ({ page }) => {
-    await page.addInitScript(() => {
+    await page.addInitScript((initial) => {
        
       const w = window as any
       w.__mockEventSources = []
@@ -749,9 +753,11 @@ test.describe('session-page SSE error handling', () => {
           close() {},
         }
         w.__mockEventSources.push(es)
+        // The first event bootstraps the page
+        setTimeout(() => es.onmessage?.({ data: JSON.stringify(initial) }), 0)
         return es
       }
-    })
+    }, BASE)
     await withName(page, 'Alice')
     await mockApi(page, BASE)
     await page.goto(`/session/${SESSION_ID}`)
@@ -776,7 +782,7 @@ test.describe('session-page SSE error handling', () => {
 test.describe('session-page SSE callback', () => {
   test('SSE update triggers saveToHistory when participant name is set', async ({ page }) => {
     // Intercept EventSource before page loads so we can trigger messages manually
-    await page.addInitScript(() => {
+    await page.addInitScript((initial) => {
        
       const w = window as any
       w.__mockEventSources = []
@@ -788,9 +794,11 @@ test.describe('session-page SSE callback', () => {
           close() {},
         }
         w.__mockEventSources.push(es)
+        // The first event bootstraps the page
+        setTimeout(() => es.onmessage?.({ data: JSON.stringify(initial) }), 0)
         return es
       }
-    })
+    }, BASE)
     await withName(page, 'Alice')
     await mockApi(page, BASE)
     await page.goto(`/session/${SESSION_ID}`)
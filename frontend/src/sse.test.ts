@@ -1,4 +1,4 @@
-import { vi, describe, it, expect, beforeEach, type Mock } from 'vitest'
+import { vi, describe, it, expect, beforeEach, afterEach, type Mock } from 'vitest'
 import type { Session } from './types'
 
 type SessionUpdatedCallback = (session: Session) => void
@@ -23,6 +23,7 @@ class MockEventSource {
   static instance: MockEventSource | null = null
   onmessage: ((e: MessageEvent) => void) | null = null
   onerror: (() => void) | null = null
+  readyState = 0
   close = vi.fn()
   constructor(public url: string) {
     MockEventSource.instance = this
@@ -47,6 +48,30 @@ describe('SSEClient', () => {
     expect(MockEventSource.instance!.url).toBe('/api/v1/sessions/session-abc/stream')
   })
 
+  it('passes the participant name as ?join= when given', () => {
+    const client = new SSEClient('session-abc', onUpdate, 'Bob & Co')
+    client.connect()
+    expect(MockEventSource.instance!.url).toBe('/api/v1/sessions/session-abc/stream?join=Bob%20%26%20Co')
+  })
+
+  it('connect() resolves with the first snapshot', async () => {
+    const client = new SSEClient('session-abc', onUpdate)
+    const ready = client.connect()
+    const session = { id: 'session-abc', name: 'Bootstrapped' }
+    MockEventSource.instance!.onmessage!(
+      new MessageEvent('message', { data: JSON.stringify(session) }),
+    )
+    await expect(ready).resolves.toEqual(session)
+  })
+
+  it('connect() rejects when the stream is refused before the first event', async () => {
+    const client = new SSEClient('session-abc', onUpdate)
+    const ready = client.connect()
+    MockEventSource.instance!.readyState = 2
+    MockEventSource.instance!.onerror!()
+    await expect(ready).rejects.toThrow('SSE stream refused')
+  })
+
   it('parses JSON message and calls onUpdate with the Session object', () => {
     const client = new SSEClient('session-abc', onUpdate)
     client.connect()
@@ -94,3 +119,155 @@ describe('SSEClient', () => {
     expect(() => MockEventSource.instance!.onerror?.()).not.toThrow()
   })
 })
+
+// ── Cross-tab sharing ─────────────────────────────────────────────────────────
+// jsdom has neither Web Locks nor a cross-context BroadcastChannel, so both are
+// faked in memory: every SSEClient below behaves like a separate tab.
+
+class FakeBroadcastChannel {
+  static channels: FakeBroadcastChannel[] = []
+  onmessage: ((e: MessageEvent) => void) | null = null
+  constructor(public name: string) {
+    FakeBroadcastChannel.channels.push(this)
+  }
+  postMessage(data: unknown) {
+    for (const other of FakeBroadcastChannel.channels) {
+      if (other !== this && other.name === this.name) other.onmessage?.(new MessageEvent('message', { data }))
+    }
+  }
+  close() {
+    FakeBroadcastChannel.channels = FakeBroadcastChannel.channels.filter((c) => c !== this)
+  }
+}
+
+type LockCallback = () => Promise<void>
+type Waiter = { callback: LockCallback; reject: (err: Error) => void }
+
+class FakeLockManager {
+  private held = false
+  private waiters: Waiter[] = []
+
+  request(_name: string, options: { signal: AbortSignal }, callback: LockCallback): Promise<void> {
+    return new Promise((resolve, reject) => {
+      const waiter: Waiter = {
+        callback: () => callback().then(resolve, reject),
+        reject,
+      }
+      options.signal.addEventListener('abort', () => {
+        this.waiters = this.waiters.filter((w) => w !== waiter)
+        reject(new DOMException('aborted', 'AbortError'))
+      })
+      this.waiters.push(waiter)
+      this.grant()
+    })
+  }
+
+  private grant() {
+    if (this.held) return
+    const next = this.waiters.shift()
+    if (!next) return
+    this.held = true
+    void next.callback().finally(() => {
+      this.held = false
+      this.grant()
+    })
+  }
+}
+
+const flush = () => new Promise((r) => setTimeout(r, 0))
+
+describe('SSEClient across tabs', () => {
+  const sessionJson = (name: string) => JSON.stringify({ id: 'session-abc', name })
+  let opened: MockEventSource[]
+
+  beforeEach(() => {
+    opened = []
+    FakeBroadcastChannel.channels = []
+    vi.stubGlobal('BroadcastChannel', FakeBroadcastChannel)
+    vi.stubGlobal('navigator', { locks: new FakeLockManager() })
+    vi.stubGlobal('EventSource', class extends MockEventSource {
+      constructor(url: string) {
+        super(url)
+        opened.push(this)
+      }
+    })
+  })
+
+  afterEach(() => {
+    vi.unstubAllGlobals()
+    vi.stubGlobal('EventSource', MockEventSource)
+  })
+
+  it('only the first tab opens a stream; the second receives relayed updates', async () => {
+    const leaderUpdate = vi.fn()
+    const followerUpdate = vi.fn()
+    const leader = new SSEClient('session-abc', leaderUpdate)
+    const leaderReady = leader.connect()
+    await flush()
+    opened[0].onmessage!(new MessageEvent('message', { data: sessionJson('First') }))
+
+    const follower = new SSEClient('session-abc', followerUpdate)
+    // The leader answers the follower's hello with its latest snapshot
+    await expect(follower.connect()).resolves.toEqual({ id: 'session-abc', name: 'First' })
+    await expect(leaderReady).resolves.toEqual({ id: 'session-abc', name: 'First' })
+    await flush()
+    expect(opened).toHaveLength(1)
+
+    opened[0].onmessage!(new MessageEvent('message', { data: sessionJson('Second') }))
+    expect(followerUpdate).toHaveBeenLastCalledWith({ id: 'session-abc', name: 'Second' })
+    expect(leaderUpdate).toHaveBeenLastCalledWith({ id: 'session-abc', name: 'Second' })
+  })
+
+  it('a waiting tab takes over the stream when the leader disconnects', async () => {
+    const leader = new SSEClient('session-abc', vi.fn())
+    void leader.connect()
+    await flush()
+    const follower = new SSEClient('session-abc', vi.fn(), 'Bob')
+    void follower.connect()
+    await flush()
+    expect(opened).toHaveLength(1)
+
+    leader.disconnect()
+    await flush()
+
+    expect(opened[0].close).toHaveBeenCalled()
+    expect(opened).toHaveLength(2)
+    expect(opened[1].url).toBe('/api/v1/sessions/session-abc/stream?join=Bob')
+  })
+
+  it('followers reject when the leader is refused', async () => {
+    const leader = new SSEClient('session-abc', vi.fn())
+    const leaderReady = leader.connect()
+    await flush()
+    const followerReady = new SSEClient('session-abc', vi.fn()).connect()
+
+    opened[0].readyState = 2
+    opened[0].onerror!()
+
+    await expect(leaderReady).rejects.toThrow('SSE stream refused')
+    await expect(followerReady).rejects.toThrow('SSE stream refused')
+  })
+
+  it('disconnecting while still waiting to lead never opens a stream', async () => {
+    const leader = new SSEClient('session-abc', vi.fn())
+    void leader.connect()
+    await flush()
+    const follower = new SSEClient('session-abc', vi.fn())
+    void follower.connect()
+    follower.disconnect()
+    leader.disconnect()
+    await flush()
+
+    expect(opened).toHaveLength(1)
+  })
+
+  it('falls back to one stream per tab without Web Locks', () => {
+    vi.stubGlobal('navigator', {})
+    new SSEClient('session-a', vi.fn()).connect()
+    new SSEClient('session-b', vi.fn()).connect()
+    expect(opened.map((es) => es.url)).toEqual([
+      '/api/v1/sessions/session-a/stream',
+      '/api/v1/sessions/session-b/stream',
+    ])
+  })
+})
@@ -2,38 +2,136 @@ import type { Session } from './types'
 
 type SessionUpdatedCallback = (session: Session) => void
 
+// EventSource.CLOSED — spelled out so test doubles without the static constants work too
+const CLOSED = 2
+
+/** Messages exchanged between tabs viewing the same session. */
+type TabMessage =
+  | { type: 'hello' }                 // follower → leader: send me the latest snapshot
+  | { type: 'session'; data: string } // leader → followers: raw JSON of a stream event
+  | { type: 'refused' }               // leader → followers: the server refused the stream
+
 /**
  * Thin wrapper around EventSource.
  * EventSource auto-reconnects on error — we only need to parse messages
  * and forward them to the callback.
+ *
+ * The first event on every stream is the full session snapshot, so connect()
+ * doubles as the page bootstrap. With `join` set, the server adds the
+ * participant (if needed) before sending that snapshot.
+ *
+ * Tabs showing the same session share one stream: the tab holding a Web Lock
+ * named after the session is the leader and relays every event to the other
+ * tabs over a BroadcastChannel. The browser releases the lock when the leader
+ * tab closes, so the next waiting tab takes over and opens its own stream.
+ * Without Web Locks / BroadcastChannel every tab simply opens its own stream.
  */
 export class SSEClient {
   private eventSource: EventSource | null = null
+  private channel: BroadcastChannel | null = null
+  private abortElection: AbortController | null = null
+  private releaseLeadership: (() => void) | null = null
+  private latest: string | null = null
+  private resolveReady: (session: Session) => void = () => {}
+  private rejectReady: (err: Error) => void = () => {}
 
   constructor(
     private readonly sessionId: string,
     private readonly onUpdate: SessionUpdatedCallback,
+    private readonly join?: string,
   ) {}
 
-  connect(): void {
-    this.eventSource = new EventSource(`/api/v1/sessions/${this.sessionId}/stream`)
+  /** Resolves with the initial snapshot; rejects if the server refuses the stream (e.g. 404). */
+  connect(): Promise<Session> {
+    const ready = new Promise<Session>((resolve, reject) => {
+      this.resolveReady = resolve
+      this.rejectReady = reject
+    })
 
-    this.eventSource.onmessage = (event: MessageEvent) => {
-      try {
-        const session = JSON.parse(event.data as string) as Session
-        this.onUpdate(session)
-      } catch (err) {
-        console.warn('[SSE] Failed to parse message', err)
-      }
+    const locks = typeof navigator !== 'undefined' ? navigator.locks : undefined
+    if (typeof BroadcastChannel === 'undefined' || !locks) {
+      this.openStream()
+      return ready
     }
 
-    this.eventSource.onerror = () => {
-      // EventSource handles reconnection automatically
-    }
+    const name = `retrospekt-sse:${this.sessionId}`
+    this.channel = new BroadcastChannel(name)
+    this.channel.onmessage = (event: MessageEvent<TabMessage>) => this.onTabMessage(event.data)
+    this.abortElection = new AbortController()
+    locks
+      .request(name, { signal: this.abortElection.signal }, () => {
+        // Leader from here until disconnect() (or the tab closing) settles this promise
+        this.openStream()
+        return new Promise<void>((release) => { this.releaseLeadership = release })
+      })
+      .catch(() => {
+        // AbortError — disconnect() while still waiting to become leader
+      })
+    // If a leader already exists it answers with its latest snapshot
+    this.post({ type: 'hello' })
+    return ready
   }
 
   disconnect(): void {
+    this.abortElection?.abort()
+    this.abortElection = null
+    this.releaseLeadership?.()
+    this.releaseLeadership = null
+    this.channel?.close()
+    this.channel = null
     this.eventSource?.close()
     this.eventSource = null
   }
+
+  private openStream(): void {
+    const query = this.join ? `?join=${encodeURIComponent(this.join)}` : ''
+    const eventSource = new EventSource(`/api/v1/sessions/${this.sessionId}/stream${query}`)
+    this.eventSource = eventSource
+
+    eventSource.onmessage = (event: MessageEvent) => {
+      const data = event.data as string
+      if (this.deliver(data)) {
+        this.latest = data
+        this.post({ type: 'session', data })
+      }
+    }
+
+    eventSource.onerror = () => {
+      // EventSource handles reconnection automatically — CLOSED means it gave up
+      // (non-200 response), which before the first event means the session is gone
+      if (eventSource.readyState === CLOSED) {
+        this.rejectReady(new Error('SSE stream refused'))
+        this.post({ type: 'refused' })
+      }
+    }
+  }
+
+  private onTabMessage(message: TabMessage): void {
+    if (message.type === 'hello') {
+      if (this.eventSource && this.latest) {
+        this.post({ type: 'session', data: this.latest })
+      }
+    } else if (message.type === 'session') {
+      if (!this.eventSource) this.deliver(message.data)
+    } else if (!this.eventSource) {
+      this.rejectReady(new Error('SSE stream refused'))
+    }
+  }
+
+  private post(message: TabMessage): void {
+    this.channel?.postMessage(message)
+  }
+
+  /** Parse one event and hand it to the page; returns false for malformed payloads. */
+  private deliver(data: string): boolean {
+    try {
+      const session = JSON.parse(data) as Session
+      this.resolveReady(session)
+      this.onUpdate(session)
+      return true
+    } catch (err) {
+      console.warn('[SSE] Failed to parse message', err)
+      return false
+    }
+  }
 }
@@ -23,6 +23,10 @@ const MOCK_PUBLIC_STATS = {
   total_votes: 89,
   total_reactions: 45,
   feedback_total: 3,
+  unique_participants_7d: 12,
+  unique_participants_30d: 31,
+  unique_participants_per_day: [{ date: '2026-02-27', count: 12 }],
+  unique_participants_per_week: [{ date: '2026-02-23', count: 12 }],
 }
 
 const MOCK_SENTRY_HEALTH = {
@@ -186,6 +190,11 @@ test.describe('stats-page stat cards', () => {
   test('renders total votes', async ({ page }) => {
     await expect(page.locator('stats-page').getByText('89')).toBeVisible()
   })
+
+  test('renders unique participants', async ({ page }) => {
+    await expect(page.locator('stats-page').getByText('Participants (7 days)')).toBeVisible()
+    await expect(page.locator('stats-page').getByText('31')).toBeVisible()
+  })
 })
 
 test.describe('stats-page charts', () => {
@@ -108,6 +108,10 @@ export interface PublicStats {
   total_votes: number
   total_reactions: number
   feedback_total: number
+  unique_participants_7d: number
+  unique_participants_30d: number
+  unique_participants_per_day: DailyCount[]
+  unique_participants_per_week: DailyCount[]
 }
 
 export interface LifetimeBucket {
@@ -64,6 +64,13 @@ def mypy(session: nox.Session) -> None:
         session.run("uv", "run", "mypy", "src", external=True)
 
 
+@nox.session
+def bench(session: nox.Session) -> None:
+    """Run the SSE fan-out benchmark (needs Redis; pass options after --)."""
+    with session.chdir(BACKEND):
+        session.run("uv", "run", "python", "-m", "benchmarks.sse_fanout", *session.posargs, external=True)
+
+
 # ── Frontend ──────────────────────────────────────────────────────────────────
 
 